@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Colaborador, ContaContabil, Salario, BemPatrimonio, LancamentoContabil
+from .models import (
+    Colaborador, ContaContabil, Salario, BemPatrimonio, DepreciacaoMensal, LancamentoContabil,
+    RegraLancamento, SaldoMensal,
+)
 
 @admin.register(Colaborador)
 class ColaboradorAdmin(admin.ModelAdmin):
@@ -26,6 +29,14 @@ class BemPatrimonioAdmin(admin.ModelAdmin):
     list_filter = ('categoria',)
     search_fields = ('descricao', 'localizacao')
 
+@admin.register(DepreciacaoMensal)
+class DepreciacaoMensalAdmin(admin.ModelAdmin):
+    list_display = ('bem', 'mes', 'depreciacao_mes', 'depreciacao_acumulada', 'valor_contabil_liquido')
+    list_filter = ('mes', 'bem__categoria')
+    search_fields = ('bem__descricao',)
+    raw_id_fields = ('bem',)
+    date_hierarchy = 'mes'
+
 @admin.register(ContaContabil)
 class ContaContabilAdmin(admin.ModelAdmin):
     list_display = ('codigo','nome', 'tipo', 'posicao')
@@ -46,4 +57,16 @@ class LancamentoContabilAdmin(admin.ModelAdmin):
 
     def get_conta_credito(self, obj):
         return obj.conta_credito.codigo + ' – ' + obj.conta_credito.nome
-    get_conta_credito.short_description = 'Conta Crédito'
\ No newline at end of file
+    get_conta_credito.short_description = 'Conta Crédito'
+
+@admin.register(SaldoMensal)
+class SaldoMensalAdmin(admin.ModelAdmin):
+    list_display = ('conta', 'mes', 'debito', 'credito', 'debito_acumulado', 'credito_acumulado')
+    list_filter = ('conta__tipo',)
+    date_hierarchy = 'mes'
+
+@admin.register(RegraLancamento)
+class RegraLancamentoAdmin(admin.ModelAdmin):
+    list_display = ('nome', 'origem', 'tipo', 'campo_valor', 'conta_debito', 'conta_credito', 'ativo')
+    list_filter = ('origem', 'ativo')
+    search_fields = ('nome',)
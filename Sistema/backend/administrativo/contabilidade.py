@@ -0,0 +1,188 @@
+# Sistema/backend/administrativo/contabilidade.py
+"""
+Saldos contabilísticos por conta e mês.
+
+Cada lançamento mexe em duas contas (débito e crédito). Em vez de somar o
+diário inteiro sempre que se quer um saldo, SaldoMensal guarda por conta e mês
+os movimentos e os totais acumulados; os sinais de LancamentoContabil aplicam
+a diferença de cada gravação/remoção com UPDATEs incrementais. O balancete e a
+DRE leem apenas esta tabela.
+"""
+
+from collections import defaultdict, namedtuple
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+from .models import ContaContabil, LancamentoContabil, SaldoMensal
+
+ZERO = Decimal('0')
+
+LinhaBalancete = namedtuple(
+    'LinhaBalancete',
+    'conta saldo_anterior debito credito saldo_final',
+)
+LinhaDRE = namedtuple('LinhaDRE', 'conta valor')
+DRE = namedtuple('DRE', 'receitas despesas total_receitas total_despesas resultado')
+
+
+def inicio_mes(dia):
+    return dia.replace(day=1)
+
+
+def movimentos(lancamento, sinal=1):
+    """{(conta_id, mês): [débito, crédito]} de um lançamento (sinal -1 para estornar)."""
+    valor = Decimal(lancamento.valor or 0) * sinal
+    mes = inicio_mes(lancamento.data_lancamento)
+    deltas = defaultdict(lambda: [ZERO, ZERO])
+    deltas[(lancamento.conta_debito_id, mes)][0] += valor
+    deltas[(lancamento.conta_credito_id, mes)][1] += valor
+    return deltas
+
+
+def juntar(*varios):
+    total = defaultdict(lambda: [ZERO, ZERO])
+    for deltas in varios:
+        for chave, (d, c) in deltas.items():
+            total[chave][0] += d
+            total[chave][1] += c
+    return total
+
+
+def aplicar_movimentos(deltas):
+    """
+    Soma `deltas` {(conta_id, mês): [débito, crédito]} aos saldos mensais: o mês
+    do movimento recebe débito/crédito e acumulados, os meses seguintes só os
+    acumulados. As contas envolvidas ficam bloqueadas até ao fim da transação.
+    """
+    deltas = {k: v for k, v in deltas.items() if v[0] or v[1]}
+    if not deltas:
+        return
+    with transaction.atomic():
+        list(ContaContabil.objects.select_for_update()
+             .filter(pk__in={conta for conta, _ in deltas}).values_list('pk', flat=True))
+        for (conta, mes), (d, c) in sorted(deltas.items()):
+            existe = SaldoMensal.objects.filter(conta_id=conta, mes=mes).update(
+                debito=F('debito') + d,
+                credito=F('credito') + c,
+                debito_acumulado=F('debito_acumulado') + d,
+                credito_acumulado=F('credito_acumulado') + c,
+            )
+            if not existe:
+                anterior = (
+                    SaldoMensal.objects.filter(conta_id=conta, mes__lt=mes)
+                    .order_by('-mes').values_list('debito_acumulado', 'credito_acumulado').first()
+                ) or (ZERO, ZERO)
+                SaldoMensal.objects.create(
+                    conta_id=conta, mes=mes, debito=d, credito=c,
+                    debito_acumulado=anterior[0] + d, credito_acumulado=anterior[1] + c,
+                )
+            SaldoMensal.objects.filter(conta_id=conta, mes__gt=mes).update(
+                debito_acumulado=F('debito_acumulado') + d,
+                credito_acumulado=F('credito_acumulado') + c,
+            )
+        # meses que ficaram sem movimento (lançamento mudado de mês ou apagado)
+        # deixam de ter linha; o acumulado continua no mês anterior
+        vazios = Q()
+        for conta, mes in deltas:
+            vazios |= Q(conta_id=conta, mes=mes)
+        SaldoMensal.objects.filter(vazios, debito=0, credito=0).delete()
+
+
+def _reconstruir(lancamento_modelo, saldo_modelo):
+    """Recalcula todos os saldos a partir do diário (duas consultas agrupadas)."""
+    deltas = defaultdict(lambda: [ZERO, ZERO])
+    base = lancamento_modelo.objects.annotate(m=TruncMonth('data_lancamento')).order_by()
+    for lado, campo in ((0, 'conta_debito_id'), (1, 'conta_credito_id')):
+        for conta, mes, total in base.values_list(campo, 'm').annotate(t=Sum('valor')):
+            mes = mes.date() if hasattr(mes, 'date') else mes
+            deltas[(conta, mes)][lado] += total
+
+    linhas = []
+    acumulado = {}
+    for (conta, mes), (d, c) in sorted(deltas.items()):
+        if not d and not c:
+            continue
+        ad, ac = acumulado.get(conta, (ZERO, ZERO))
+        acumulado[conta] = (ad + d, ac + c)
+        linhas.append(saldo_modelo(
+            conta_id=conta, mes=mes, debito=d, credito=c,
+            debito_acumulado=ad + d, credito_acumulado=ac + c,
+        ))
+    with transaction.atomic():
+        saldo_modelo.objects.all().delete()
+        saldo_modelo.objects.bulk_create(linhas, batch_size=1000)
+    return len(linhas)
+
+
+def reconstruir_saldos():
+    return _reconstruir(LancamentoContabil, SaldoMensal)
+
+
+# --------------------------------
+# Relatórios
+# --------------------------------
+
+def _acumulado_ate(mes, campo):
+    """Subconsulta: acumulado `campo` da conta no último mês com movimento <= `mes`."""
+    return Coalesce(
+        Subquery(
+            SaldoMensal.objects.filter(conta=OuterRef('pk'), mes__lte=mes)
+            .order_by('-mes').values(campo)[:1]
+        ),
+        Value(ZERO),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+
+
+def _natural(conta, debito, credito):
+    return credito - debito if conta.posicao == 'CREDITO' else debito - credito
+
+
+def balancete(inicio, fim, tipos=None):
+    """
+    Balancete de verificação de `inicio` a `fim` (datas; contam os meses
+    inteiros), numa só consulta ao plano de contas. Saldos no sentido natural
+    de cada conta. Contas sem saldo nem movimento ficam de fora.
+    """
+    inicio, fim = inicio_mes(inicio), inicio_mes(fim)
+    anterior = date(inicio.year - (inicio.month == 1), (inicio.month - 2) % 12 + 1, 1)
+    no_periodo = Q(saldos_mensais__mes__gte=inicio, saldos_mensais__mes__lte=fim)
+    contas = ContaContabil.objects.annotate(
+        ant_d=_acumulado_ate(anterior, 'debito_acumulado'),
+        ant_c=_acumulado_ate(anterior, 'credito_acumulado'),
+        fim_d=_acumulado_ate(fim, 'debito_acumulado'),
+        fim_c=_acumulado_ate(fim, 'credito_acumulado'),
+        mov_d=Coalesce(Sum('saldos_mensais__debito', filter=no_periodo), Value(ZERO)),
+        mov_c=Coalesce(Sum('saldos_mensais__credito', filter=no_periodo), Value(ZERO)),
+    ).order_by('codigo')
+    if tipos:
+        contas = contas.filter(tipo__in=tipos)
+    linhas = []
+    for conta in contas:
+        if not (conta.ant_d or conta.ant_c or conta.mov_d or conta.mov_c):
+            continue
+        linhas.append(LinhaBalancete(
+            conta=conta,
+            saldo_anterior=_natural(conta, conta.ant_d, conta.ant_c),
+            debito=conta.mov_d,
+            credito=conta.mov_c,
+            saldo_final=_natural(conta, conta.fim_d, conta.fim_c),
+        ))
+    return linhas
+
+
+def dre(inicio, fim):
+    """Demonstração de resultados: movimentos das contas de receita e despesa no período."""
+    receitas, despesas = [], []
+    for linha in balancete(inicio, fim, tipos=['RECEITA', 'DESPESA']):
+        if linha.conta.tipo == 'RECEITA':
+            receitas.append(LinhaDRE(linha.conta, linha.credito - linha.debito))
+        else:
+            despesas.append(LinhaDRE(linha.conta, linha.debito - linha.credito))
+    total_receitas = sum((l.valor for l in receitas), ZERO)
+    total_despesas = sum((l.valor for l in despesas), ZERO)
+    return DRE(receitas, despesas, total_receitas, total_despesas, total_receitas - total_despesas)
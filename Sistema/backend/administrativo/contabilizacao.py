@@ -0,0 +1,188 @@
+# Sistema/backend/administrativo/contabilizacao.py
+"""
+Contabilização automática de documentos (faturas, recibos, salários e
+depreciações mensais).
+
+Cada RegraLancamento ativa diz, para uma origem, que valor do documento lançar
+e em que contas. O lançamento gerado guarda a regra e o pk do documento, e a
+restrição única (regra, documento_id) garante que cada documento é lançado uma
+só vez por regra: voltar a correr um período só cria o que falta.
+
+Há três caminhos:
+- `contabilizar_periodo` cria em lote (bulk_create) os lançamentos em falta
+  de um intervalo de datas e atualiza os saldos mensais numa só passagem;
+- `contabilizar_documento` / `remover_documento`, chamados pelos sinais dos
+  documentos, mantêm os lançamentos de um documento em dia um a um;
+- `recontabilizar` faz o mesmo que `contabilizar_documento` para muitos
+  documentos alterados em lote (bulk_update, sem sinais).
+"""
+
+from collections import namedtuple
+
+from django.apps import apps
+from django.db import transaction
+from django.utils import timezone
+
+from . import contabilidade
+from .models import LancamentoContabil, RegraLancamento
+
+# modelo: 'app.Modelo'; data: campo da data do lançamento; filtro_tipo: caminho
+# comparado com RegraLancamento.tipo; rotulo: campos que identificam o documento
+Origem = namedtuple('Origem', 'modelo data filtro_tipo campos rotulo')
+
+ORIGENS = {
+    'FATURA': Origem('secretaria.Fatura', 'data_emissao', 'tipo',
+                     ('valor_atual', 'valor_original'), ('numero',)),
+    'RECIBO': Origem('secretaria.Recibo', 'data_pagamento', 'forma_pagamento',
+                     ('valor_pago',), ('numero_recibo',)),
+    'SALARIO': Origem('administrativo.Salario', 'data_referencia', 'colaborador__departamento',
+                      ('salario_bruto', 'inss', 'irt', 'salario_liquido'),
+                      ('colaborador__nome', 'mes_referencia')),
+    'DEPRECIACAO': Origem('administrativo.DepreciacaoMensal', 'mes', 'bem__categoria',
+                          ('depreciacao_mes',), ('bem__descricao', 'mes')),
+}
+
+ResultadoContabilizacao = namedtuple('ResultadoContabilizacao', 'criados por_regra')
+
+
+def _documentos(regra):
+    origem = ORIGENS[regra.origem]
+    qs = apps.get_model(origem.modelo).objects.filter(**{f'{regra.campo_valor}__gt': 0})
+    if regra.tipo:
+        qs = qs.filter(**{origem.filtro_tipo: regra.tipo})
+    return qs
+
+
+def _valores(regra, qs):
+    """(pk, data, valor, descrição) dos documentos de `qs`."""
+    origem = ORIGENS[regra.origem]
+    for pk, data, valor, *rotulo in qs.order_by().values_list(
+        'pk', origem.data, regra.campo_valor, *origem.rotulo
+    ):
+        descricao = f"{regra.nome} – {' '.join(str(r) for r in rotulo if r)}"
+        yield pk, data, valor, descricao
+
+
+def _lancamento(regra, data, valor, descricao, documento_id, lancado_por=None):
+    return LancamentoContabil(
+        data_lancamento=data,
+        conta_debito_id=regra.conta_debito_id,
+        conta_credito_id=regra.conta_credito_id,
+        valor=valor,
+        descricao=descricao,
+        lancado_por=lancado_por,
+        regra=regra,
+        documento_id=documento_id,
+    )
+
+
+def contabilizar_periodo(inicio, fim, origens=None, lancado_por=None):
+    """
+    Cria os lançamentos em falta dos documentos com data entre `inicio` e `fim`
+    (inclusive), para as regras ativas das `origens` (todas por omissão).
+    """
+    regras = RegraLancamento.objects.filter(ativo=True)
+    if origens:
+        regras = regras.filter(origem__in=origens)
+
+    novos, por_regra = [], {}
+    for regra in regras:
+        data = ORIGENS[regra.origem].data
+        qs = _documentos(regra).filter(**{f'{data}__range': (inicio, fim)}).exclude(
+            pk__in=LancamentoContabil.objects.filter(regra=regra).values('documento_id')
+        )
+        antes = len(novos)
+        for pk, dia, valor, descricao in _valores(regra, qs):
+            if dia is not None:
+                novos.append(_lancamento(regra, dia, valor, descricao, pk, lancado_por))
+        por_regra[regra] = len(novos) - antes
+
+    with transaction.atomic():
+        # bulk_create não dispara sinais: os saldos são atualizados de uma vez
+        LancamentoContabil.objects.bulk_create(novos, batch_size=1000)
+        contabilidade.aplicar_movimentos(
+            contabilidade.juntar(*(contabilidade.movimentos(l) for l in novos))
+        )
+    return ResultadoContabilizacao(len(novos), por_regra)
+
+
+def contabilizar_documento(origem, documento):
+    """Cria, atualiza ou remove os lançamentos automáticos de um documento."""
+    for regra in RegraLancamento.objects.filter(origem=origem, ativo=True):
+        atual = next(_valores(regra, _documentos(regra).filter(pk=documento.pk)), None)
+        existente = LancamentoContabil.objects.filter(regra=regra, documento_id=documento.pk).first()
+        if atual is None or atual[1] is None:
+            if existente:
+                existente.delete()
+            continue
+        _, dia, valor, descricao = atual
+        if existente is None:
+            _lancamento(regra, dia, valor, descricao, documento.pk).save()
+            continue
+        novo = {
+            'data_lancamento': dia,
+            'valor': valor,
+            'descricao': descricao,
+            'conta_debito_id': regra.conta_debito_id,
+            'conta_credito_id': regra.conta_credito_id,
+        }
+        if any(getattr(existente, campo) != v for campo, v in novo.items()):
+            for campo, v in novo.items():
+                setattr(existente, campo, v)
+            existente.save()
+
+
+def recontabilizar(origem, pks, lancado_por=None):
+    """
+    Põe em dia os lançamentos automáticos dos documentos `pks` de `origem`
+    depois de uma escrita em lote: cria os que faltam, corrige valor, data e
+    descrição dos que mudaram e apaga os que deixaram de se aplicar. Os saldos
+    mensais recebem só as diferenças. Retorna quantos lançamentos mudaram.
+    """
+    pks = list(pks)
+    if not pks:
+        return 0
+    agora = timezone.now()
+    novos, alterados, removidos, deltas = [], [], [], []
+    with transaction.atomic():
+        for regra in RegraLancamento.objects.filter(origem=origem, ativo=True):
+            atuais = {pk: (dia, valor, descricao) for pk, dia, valor, descricao in
+                      _valores(regra, _documentos(regra).filter(pk__in=pks)) if dia is not None}
+            existentes = {
+                l.documento_id: l for l in
+                LancamentoContabil.objects.select_for_update().filter(regra=regra, documento_id__in=pks)
+            }
+            for pk in pks:
+                atual, existente = atuais.get(pk), existentes.get(pk)
+                if atual is None:
+                    if existente:
+                        removidos.append(existente)
+                    continue
+                dia, valor, descricao = atual
+                if existente is None:
+                    novo = _lancamento(regra, dia, valor, descricao, pk, lancado_por)
+                    novos.append(novo)
+                    deltas.append(contabilidade.movimentos(novo))
+                elif (existente.data_lancamento, existente.valor, existente.descricao) != (dia, valor, descricao):
+                    deltas.append(contabilidade.movimentos(existente, -1))
+                    existente.data_lancamento, existente.valor, existente.descricao = dia, valor, descricao
+                    existente.updated_at = agora   # bulk_update não aplica auto_now
+                    alterados.append(existente)
+                    deltas.append(contabilidade.movimentos(existente))
+
+        # sem sinais: os saldos recebem as diferenças de uma vez
+        LancamentoContabil.objects.bulk_create(novos, batch_size=1000)
+        LancamentoContabil.objects.bulk_update(
+            alterados, ['data_lancamento', 'valor', 'descricao', 'updated_at'], batch_size=1000
+        )
+        contabilidade.aplicar_movimentos(contabilidade.juntar(*deltas))
+        # raros (documento que deixou de se aplicar); os sinais estornam os saldos
+        for lancamento in removidos:
+            lancamento.delete()
+    return len(novos) + len(alterados) + len(removidos)
+
+
+def remover_documento(origem, documento_id):
+    """Apaga os lançamentos automáticos de um documento removido (os sinais estornam os saldos)."""
+    for lancamento in LancamentoContabil.objects.filter(regra__origem=origem, documento_id=documento_id):
+        lancamento.delete()
@@ -0,0 +1,144 @@
+# Sistema/backend/administrativo/depreciacao.py
+"""
+Execução mensal da depreciação dos bens patrimoniais.
+
+O sinal pre_save de BemPatrimonio só recalcula a depreciação de um bem quando
+ele é gravado, por isso os valores dos bens que ninguém edita ficam parados no
+tempo. `depreciar(mes)` recalcula todos os bens de uma vez: os valores são lidos
+numa consulta, a depreciação linear é calculada em vetores NumPy (em cêntimos,
+com a mesma regra de meses de `BemPatrimonio.calcular_depreciacao`) e o
+resultado é gravado com um upsert em DepreciacaoMensal e, no mês corrente, com
+um bulk_update dos bens que mudaram.
+
+Com `lancar=True` as quotas do mês são contabilizadas pelas regras de origem
+DEPRECIACAO (ver administrativo/contabilizacao.py).
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from . import contabilizacao
+from .contabilidade import inicio_mes
+from .models import BemPatrimonio, DepreciacaoMensal, LancamentoContabil
+
+ResultadoDepreciacao = namedtuple('ResultadoDepreciacao', 'mes bens atualizados depreciacao lancamentos')
+
+
+def _fim_mes(mes):
+    seguinte = mes.replace(year=mes.year + mes.month // 12, month=mes.month % 12 + 1)
+    return seguinte - timedelta(days=1)
+
+
+def _acumulada(centimos, meses_aquisicao, vida_meses, indice):
+    """Depreciação acumulada (cêntimos) até ao mês `indice` (ano*12 + mês-1)."""
+    meses = np.clip(indice - meses_aquisicao, 0, vida_meses)
+    divisor = np.maximum(vida_meses, 1)
+    # arredondamento ao cêntimo: (2·v·m + d) // 2d
+    return np.where(vida_meses > 0, (2 * centimos * meses + divisor) // (2 * divisor), 0)
+
+
+def calcular(bens, mes):
+    """
+    Depreciação de `bens` [(pk, valor, data_aquisicao, vida_util_anos)] no mês
+    `mes`: arrays (pks, quota do mês, acumulada, valor líquido) em cêntimos.
+    """
+    pks = np.array([b[0] for b in bens], dtype=np.int64)
+    centimos = np.array([int(round(b[1] * 100)) for b in bens], dtype=np.int64)
+    meses_aquisicao = np.array([b[2].year * 12 + b[2].month - 1 for b in bens], dtype=np.int64)
+    vida_meses = np.array([b[3] * 12 for b in bens], dtype=np.int64)
+
+    indice = mes.year * 12 + mes.month - 1
+    acumulada = _acumulada(centimos, meses_aquisicao, vida_meses, indice)
+    anterior = _acumulada(centimos, meses_aquisicao, vida_meses, indice - 1)
+    liquido = np.maximum(centimos - acumulada, 0)
+    return pks, acumulada - anterior, acumulada, liquido
+
+
+def _decimal(centimos):
+    return Decimal(int(centimos)).scaleb(-2)
+
+
+def depreciar(mes=None, lancar=False, lancado_por=None):
+    """
+    Calcula a depreciação de todos os bens adquiridos até ao fim de `mes`
+    (mês corrente por omissão), grava as fotografias do mês e, se `mes` for o
+    mês corrente, atualiza os valores dos bens.
+    """
+    hoje = timezone.localdate()
+    mes = inicio_mes(mes or hoje)
+    agora = timezone.now()
+
+    bens = list(
+        BemPatrimonio.objects.filter(data_aquisicao__lte=_fim_mes(mes)).order_by('pk').values_list(
+            'pk', 'valor_aquisicao', 'data_aquisicao', 'vida_util_anos',
+            'depreciacao_acumulada', 'valor_contabil_liquido',
+        )
+    )
+    if not bens:
+        return ResultadoDepreciacao(mes, 0, 0, Decimal('0'), 0)
+    pks, quota, acumulada, liquido = calcular(bens, mes)
+
+    fotografias = [
+        DepreciacaoMensal(
+            bem_id=int(pks[i]), mes=mes,
+            depreciacao_mes=_decimal(quota[i]),
+            depreciacao_acumulada=_decimal(acumulada[i]),
+            valor_contabil_liquido=_decimal(liquido[i]),
+            calculado_em=agora,
+        )
+        for i in range(len(bens))
+    ]
+
+    alterados = []
+    if mes == inicio_mes(hoje):
+        for i, (pk, _, _, _, dep_atual, liq_atual) in enumerate(bens):
+            dep, liq = _decimal(acumulada[i]), _decimal(liquido[i])
+            if dep != dep_atual or liq != liq_atual:
+                alterados.append(BemPatrimonio(pk=pk, depreciacao_acumulada=dep, valor_contabil_liquido=liq))
+
+    with transaction.atomic():
+        DepreciacaoMensal.objects.bulk_create(
+            fotografias, batch_size=1000,
+            update_conflicts=True, unique_fields=['bem', 'mes'],
+            update_fields=['depreciacao_mes', 'depreciacao_acumulada', 'valor_contabil_liquido', 'calculado_em'],
+        )
+        # bulk_update não passa pelo pre_save, que voltaria a calcular bem a bem
+        BemPatrimonio.objects.bulk_update(
+            alterados, ['depreciacao_acumulada', 'valor_contabil_liquido'], batch_size=1000
+        )
+        lancamentos = _lancar(mes, lancado_por) if lancar else 0
+
+    return ResultadoDepreciacao(mes, len(bens), len(alterados), _decimal(quota.sum()), lancamentos)
+
+
+def _lancar(mes, lancado_por=None):
+    """Contabiliza as quotas do mês; lançamentos de quotas entretanto alteradas são refeitos."""
+    desatualizados = LancamentoContabil.objects.filter(
+        regra__origem='DEPRECIACAO', data_lancamento=mes
+    ).exclude(
+        valor=Subquery(DepreciacaoMensal.objects.filter(pk=OuterRef('documento_id')).values('depreciacao_mes')[:1])
+    )
+    # poucos na prática (só numa reexecução do mês); os sinais estornam os saldos
+    for lancamento in desatualizados:
+        lancamento.delete()
+    return contabilizacao.contabilizar_periodo(
+        mes, mes, origens=['DEPRECIACAO'], lancado_por=lancado_por
+    ).criados
+
+
+def ultimo_mes():
+    return DepreciacaoMensal.objects.order_by('-mes').values_list('mes', flat=True).first()
+
+
+def patrimonio_liquido():
+    """
+    Valor contábil líquido total dos bens, tal como gravado pela última
+    execução de `manage.py depreciar` (só leitura: uma agregação).
+    """
+    return BemPatrimonio.objects.aggregate(total=Sum('valor_contabil_liquido'))['total'] or 0
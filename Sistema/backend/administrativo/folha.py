@@ -0,0 +1,69 @@
+# Sistema/backend/administrativo/folha.py
+"""
+Situação da folha de pagamento de um mês.
+
+Cada colaborador ativo é anotado, na mesma consulta, com subconsultas Exists
+sobre Salario (índice data_referencia, colaborador): se o salário do mês já foi
+processado e se o do mês anterior ficou por processar. Os contadores do painel
+saem de um único aggregate sobre essas anotações, pelo que o custo não cresce
+com o número de colaboradores.
+
+- pendente: sem salário processado no mês;
+- atrasado: sem salário no mês anterior, já fechado (só para quem foi
+  admitido antes do mês em causa).
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db.models import BooleanField, Case, Count, Exists, OuterRef, Q, Subquery, Value, When
+from django.utils import timezone
+
+from .models import Colaborador, Salario
+
+ResumoFolha = namedtuple('ResumoFolha', 'mes anterior ativos processados pendentes atrasados')
+
+
+def meses(mes=None):
+    """(mês, mês anterior) como datas no dia 1; mês corrente por omissão."""
+    mes = (mes or timezone.localdate()).replace(day=1)
+    return mes, (mes - timedelta(days=1)).replace(day=1)
+
+
+def situacao(mes=None):
+    """
+    Colaboradores ativos anotados com `processado`, `atrasado` e `salario_liquido_mes`
+    (líquido do salário do mês, se houver).
+    """
+    mes, anterior = meses(mes)
+    do_mes = Salario.objects.filter(colaborador=OuterRef('pk'), data_referencia=mes)
+    return Colaborador.objects.filter(status='ATIVO').annotate(
+        processado=Exists(do_mes),
+        salario_liquido_mes=Subquery(do_mes.values('salario_liquido')[:1]),
+        atrasado=Case(
+            When(
+                ~Exists(Salario.objects.filter(colaborador=OuterRef('pk'), data_referencia=anterior))
+                & Q(data_admissao__lt=mes),
+                then=Value(True),
+            ),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+    )
+
+
+def pendencias(mes=None):
+    """Colaboradores com o salário do mês por processar ou com o mês anterior em atraso."""
+    return situacao(mes).filter(Q(processado=False) | Q(atrasado=True))
+
+
+def resumo(mes=None):
+    """Contadores da folha do mês numa só consulta."""
+    mes, anterior = meses(mes)
+    totais = situacao(mes).aggregate(
+        ativos=Count('pk'),
+        processados=Count('pk', filter=Q(processado=True)),
+        pendentes=Count('pk', filter=Q(processado=False)),
+        atrasados=Count('pk', filter=Q(atrasado=True)),
+    )
+    return ResumoFolha(mes, anterior, **totais)
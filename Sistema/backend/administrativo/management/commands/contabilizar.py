@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from administrativo.contabilizacao import ORIGENS, contabilizar_periodo
+
+
+class Command(BaseCommand):
+    help = 'Gera os lançamentos contábeis em falta das faturas, recibos e salários de um período, segundo as regras ativas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inicio', help='Data inicial (AAAA-MM-DD). Padrão: início do mês corrente.')
+        parser.add_argument('--fim', help='Data final (AAAA-MM-DD). Padrão: hoje.')
+        parser.add_argument('--origem', action='append', choices=list(ORIGENS),
+                            help='Restringe a uma origem (pode repetir). Padrão: todas.')
+
+    def handle(self, *args, **options):
+        hoje = timezone.localdate()
+        try:
+            inicio = date.fromisoformat(options['inicio']) if options['inicio'] else hoje.replace(day=1)
+            fim = date.fromisoformat(options['fim']) if options['fim'] else hoje
+        except ValueError as e:
+            raise CommandError(f'Data inválida: {e}')
+
+        resultado = contabilizar_periodo(inicio, fim, origens=options['origem'])
+        for regra, n in resultado.por_regra.items():
+            self.stdout.write(f'{regra}: {n} lançamento(s)')
+        self.stdout.write(self.style.SUCCESS(
+            f'{resultado.criados} lançamento(s) criado(s) de {inicio:%d/%m/%Y} a {fim:%d/%m/%Y}.'
+        ))
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from administrativo.depreciacao import depreciar
+
+
+class Command(BaseCommand):
+    help = 'Executa a depreciação mensal de todos os bens patrimoniais e grava as fotografias do mês.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mes', help='Mês de referência (AAAA-MM). Padrão: mês corrente.')
+        parser.add_argument('--lancar', action='store_true',
+                            help='Gera os lançamentos de depreciação pelas regras de origem DEPRECIACAO.')
+
+    def handle(self, *args, **options):
+        mes = None
+        if options['mes']:
+            try:
+                mes = datetime.strptime(options['mes'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('Mês inválido; use AAAA-MM.')
+
+        resultado = depreciar(mes, lancar=options['lancar'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{resultado.mes:%m/%Y}: {resultado.bens} bem(ns), {resultado.atualizados} atualizado(s), '
+            f'depreciação do mês {resultado.depreciacao} AOA, {resultado.lancamentos} lançamento(s).'
+        ))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from administrativo.contabilidade import reconstruir_saldos
+
+
+class Command(BaseCommand):
+    help = 'Recalcula a tabela de saldos mensais a partir de todos os lançamentos contábeis.'
+
+    def handle(self, *args, **options):
+        n = reconstruir_saldos()
+        self.stdout.write(self.style.SUCCESS(f'{n} saldo(s) mensal(is) recalculado(s).'))
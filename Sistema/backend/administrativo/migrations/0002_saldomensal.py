@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def preencher_saldos(apps, schema_editor):
+    from administrativo.contabilidade import _reconstruir
+    _reconstruir(
+        apps.get_model('administrativo', 'LancamentoContabil'),
+        apps.get_model('administrativo', 'SaldoMensal'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administrativo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaldoMensal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField(verbose_name='Mês')),
+                ('debito', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Débitos do mês')),
+                ('credito', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Créditos do mês')),
+                ('debito_acumulado', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Débitos acumulados')),
+                ('credito_acumulado', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Créditos acumulados')),
+                ('conta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saldos_mensais', to='administrativo.contacontabil', verbose_name='Conta')),
+            ],
+            options={
+                'verbose_name': 'Saldo Mensal',
+                'verbose_name_plural': 'Saldos Mensais',
+                'ordering': ['conta', 'mes'],
+                'indexes': [models.Index(fields=['mes', 'conta'], name='saldo_mes_conta_idx')],
+                'unique_together': {('conta', 'mes')},
+            },
+        ),
+        migrations.RunPython(preencher_saldos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administrativo', '0002_saldomensal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lancamentocontabil',
+            name='documento_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Documento de origem'),
+        ),
+        migrations.CreateModel(
+            name='RegraLancamento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=100, verbose_name='Nome')),
+                ('origem', models.CharField(choices=[('FATURA', 'Fatura emitida'), ('RECIBO', 'Recibo (pagamento)'), ('SALARIO', 'Salário processado')], max_length=10, verbose_name='Origem')),
+                ('tipo', models.CharField(blank=True, help_text='Tipo da fatura, forma de pagamento do recibo ou departamento do colaborador. Vazio = todos.', max_length=32, verbose_name='Tipo')),
+                ('campo_valor', models.CharField(choices=[('valor_atual', 'Fatura – valor atual'), ('valor_original', 'Fatura – valor original'), ('valor_pago', 'Recibo – valor pago'), ('salario_bruto', 'Salário – bruto'), ('inss', 'Salário – INSS'), ('irt', 'Salário – IRT'), ('salario_liquido', 'Salário – líquido')], max_length=20, verbose_name='Valor a lançar')),
+                ('ativo', models.BooleanField(default=True, verbose_name='Ativa')),
+                ('conta_credito', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='regras_credito', to='administrativo.contacontabil', verbose_name='Conta Crédito')),
+                ('conta_debito', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='regras_debito', to='administrativo.contacontabil', verbose_name='Conta Débito')),
+            ],
+            options={
+                'verbose_name': 'Regra de Lançamento',
+                'verbose_name_plural': 'Regras de Lançamento',
+                'ordering': ['origem', 'nome'],
+            },
+        ),
+        migrations.AddField(
+            model_name='lancamentocontabil',
+            name='regra',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='lancamentos', to='administrativo.regralancamento', verbose_name='Regra'),
+        ),
+        migrations.AddConstraint(
+            model_name='lancamentocontabil',
+            constraint=models.UniqueConstraint(fields=('regra', 'documento_id'), name='lancamento_documento_unico'),
+        ),
+    ]
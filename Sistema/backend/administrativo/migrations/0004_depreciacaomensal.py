@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administrativo', '0003_regralancamento'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='regralancamento',
+            name='campo_valor',
+            field=models.CharField(choices=[('valor_atual', 'Fatura – valor atual'), ('valor_original', 'Fatura – valor original'), ('valor_pago', 'Recibo – valor pago'), ('salario_bruto', 'Salário – bruto'), ('inss', 'Salário – INSS'), ('irt', 'Salário – IRT'), ('salario_liquido', 'Salário – líquido'), ('depreciacao_mes', 'Depreciação – quota do mês')], max_length=20, verbose_name='Valor a lançar'),
+        ),
+        migrations.AlterField(
+            model_name='regralancamento',
+            name='origem',
+            field=models.CharField(choices=[('FATURA', 'Fatura emitida'), ('RECIBO', 'Recibo (pagamento)'), ('SALARIO', 'Salário processado'), ('DEPRECIACAO', 'Depreciação mensal')], max_length=12, verbose_name='Origem'),
+        ),
+        migrations.AlterField(
+            model_name='regralancamento',
+            name='tipo',
+            field=models.CharField(blank=True, help_text='Tipo da fatura, forma de pagamento do recibo, departamento do colaborador ou categoria do bem. Vazio = todos.', max_length=32, verbose_name='Tipo'),
+        ),
+        migrations.CreateModel(
+            name='DepreciacaoMensal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField(verbose_name='Mês')),
+                ('depreciacao_mes', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Depreciação do mês')),
+                ('depreciacao_acumulada', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Depreciação acumulada')),
+                ('valor_contabil_liquido', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Valor contábil líquido')),
+                ('calculado_em', models.DateTimeField(verbose_name='Calculado em')),
+                ('bem', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='depreciacoes', to='administrativo.bempatrimonio', verbose_name='Bem')),
+            ],
+            options={
+                'verbose_name': 'Depreciação Mensal',
+                'verbose_name_plural': 'Depreciações Mensais',
+                'ordering': ['-mes', 'bem'],
+                'indexes': [models.Index(fields=['mes'], name='depreciacao_mes_idx')],
+                'unique_together': {('bem', 'mes')},
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+import re
+from datetime import date
+
+from django.db import migrations
+from django.utils import timezone
+
+RE_MES = re.compile(r'^\s*(\d{4})-(\d{1,2})\s*$')
+
+
+def _mes(salario):
+    """Dia 1 do mês de mes_referencia "AAAA-MM"; se inválido, o mês de data_processamento."""
+    m = RE_MES.match(salario.mes_referencia or '')
+    if m and 1 <= int(m.group(2)) <= 12:
+        return date(int(m.group(1)), int(m.group(2)), 1)
+    if salario.data_processamento:
+        return timezone.localtime(salario.data_processamento).date().replace(day=1)
+    raise RuntimeError(
+        f'Salário pk={salario.pk}: mes_referencia {salario.mes_referencia!r} não está no formato AAAA-MM '
+        f'e não há data de processamento; corrija-o antes de migrar.'
+    )
+
+
+def preencher_data_referencia(apps, schema_editor):
+    """data_referencia (dia 1 do mês) a partir de mes_referencia "AAAA-MM" nos salários antigos."""
+    Salario = apps.get_model('administrativo', 'Salario')
+    pendentes = []
+    for salario in Salario.objects.filter(data_referencia__isnull=True).only('pk', 'mes_referencia', 'data_processamento'):
+        salario.data_referencia = _mes(salario)
+        pendentes.append(salario)
+    Salario.objects.bulk_update(pendentes, ['data_referencia'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administrativo', '0004_depreciacaomensal'),
+    ]
+
+    operations = [
+        migrations.RunPython(preencher_data_referencia, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administrativo', '0005_preencher_data_referencia'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='salario',
+            name='data_referencia',
+            field=models.DateField(editable=False, verbose_name='Mês de referência'),
+        ),
+        migrations.AddIndex(
+            model_name='salario',
+            index=models.Index(fields=['data_referencia', 'colaborador'], name='salario_ref_colab_idx'),
+        ),
+    ]
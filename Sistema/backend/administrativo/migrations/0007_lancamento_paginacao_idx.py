@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administrativo', '0006_salario_data_referencia_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lancamentocontabil',
+            index=models.Index(fields=['data_lancamento', 'id'], name='lancamento_data_id_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from datetime import datetime
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 
 User = get_user_model()
@@ -45,9 +46,22 @@ class Colaborador(models.Model):
         return f'{self.nome} ({self.cargo})'
 
 
+class SalarioQuerySet(models.QuerySet):
+    """Filtros por período sobre `data_referencia` (dia 1 do mês), em intervalos indexados."""
+
+    def do_mes(self, dia):
+        return self.filter(data_referencia=dia.replace(day=1))
+
+    def entre(self, inicio, fim):
+        """Salários dos meses de `inicio` a `fim` (datas; contam os meses inteiros)."""
+        return self.filter(data_referencia__range=(inicio.replace(day=1), fim.replace(day=1)))
+
+
 class Salario(models.Model):
     """
-    Registro mensal de cálculo de salário de um colaborador.
+    Registro mensal de cálculo de salário de um colaborador. `mes_referencia`
+    ("AAAA-MM") é o valor do formulário; as consultas por período usam
+    `data_referencia`, preenchida a partir dele ao gravar.
     """
     colaborador = models.ForeignKey(
         Colaborador,
@@ -63,7 +77,7 @@ class Salario(models.Model):
             )
         ]
     )
-    data_referencia = models.DateField(null=True, blank=True)  # Novo campo
+    data_referencia = models.DateField('Mês de referência', editable=False)  # dia 1 do mês
     horas_extras = models.DecimalField('Horas Extras', max_digits=5, decimal_places=2, default=0)
     descontos = models.DecimalField('Descontos', max_digits=12, decimal_places=2, default=0)
     bonificacoes = models.DecimalField('Bonificações', max_digits=12, decimal_places=2, default=0)
@@ -86,6 +100,8 @@ class Salario(models.Model):
     )
     data_processamento = models.DateTimeField('Data de Processamento', auto_now_add=True)
 
+    objects = SalarioQuerySet.as_manager()
+
     def mes_formatado(self):
         meses = {
             "01": "Janeiro", "02": "Fevereiro", "03": "Março",
@@ -110,9 +126,10 @@ class Salario(models.Model):
         verbose_name = 'Salário'
         verbose_name_plural = 'Salários'
         unique_together = [['colaborador', 'mes_referencia']]
+        indexes = [models.Index(fields=['data_referencia', 'colaborador'], name='salario_ref_colab_idx')]
 
     def __str__(self):
-        return f'{self.colaborador.nome} – {self.mes_referencia:%b/%Y}'
+        return f'{self.colaborador.nome} – {self.mes_formatado()}'
 
 
 class BemPatrimonio(models.Model):
@@ -208,6 +225,36 @@ class BemPatrimonio(models.Model):
         
         return self.valor_contabil_liquido
 
+
+class DepreciacaoMensal(models.Model):
+    """
+    Fotografia da depreciação de um bem num mês, gravada pela execução mensal
+    (ver administrativo/depreciacao.py). Serve de histórico e de documento de
+    origem dos lançamentos de depreciação.
+    """
+    bem = models.ForeignKey(
+        BemPatrimonio,
+        on_delete=models.CASCADE,
+        related_name='depreciacoes',
+        verbose_name='Bem'
+    )
+    mes = models.DateField('Mês')  # sempre o dia 1
+    depreciacao_mes = models.DecimalField('Depreciação do mês', max_digits=12, decimal_places=2, default=0)
+    depreciacao_acumulada = models.DecimalField('Depreciação acumulada', max_digits=12, decimal_places=2, default=0)
+    valor_contabil_liquido = models.DecimalField('Valor contábil líquido', max_digits=12, decimal_places=2, default=0)
+    calculado_em = models.DateTimeField('Calculado em')
+
+    class Meta:
+        verbose_name = 'Depreciação Mensal'
+        verbose_name_plural = 'Depreciações Mensais'
+        unique_together = [['bem', 'mes']]
+        ordering = ['-mes', 'bem']
+        indexes = [models.Index(fields=['mes'], name='depreciacao_mes_idx')]
+
+    def __str__(self):
+        return f'{self.bem.descricao} | {self.mes:%m/%Y} | {self.depreciacao_mes}'
+
+
 class ContaContabil(models.Model):
     """
     Plano de Contas: código e descrição de cada conta contábil.
@@ -237,6 +284,66 @@ class ContaContabil(models.Model):
         return f'{self.codigo} – {self.nome} ({self.get_tipo_display()})'
 
 
+class RegraLancamento(models.Model):
+    """
+    Regra de contabilização automática: para cada documento de `origem` (e, se
+    indicado, só do `tipo` dado), lança o valor de `campo_valor` a débito de
+    `conta_debito` e a crédito de `conta_credito`. Ver administrativo/contabilizacao.py.
+    """
+    ORIGEM_CHOICES = [
+        ('FATURA', 'Fatura emitida'),
+        ('RECIBO', 'Recibo (pagamento)'),
+        ('SALARIO', 'Salário processado'),
+        ('DEPRECIACAO', 'Depreciação mensal'),
+    ]
+    CAMPO_CHOICES = [
+        ('valor_atual', 'Fatura – valor atual'),
+        ('valor_original', 'Fatura – valor original'),
+        ('valor_pago', 'Recibo – valor pago'),
+        ('salario_bruto', 'Salário – bruto'),
+        ('inss', 'Salário – INSS'),
+        ('irt', 'Salário – IRT'),
+        ('salario_liquido', 'Salário – líquido'),
+        ('depreciacao_mes', 'Depreciação – quota do mês'),
+    ]
+
+    nome = models.CharField('Nome', max_length=100)
+    origem = models.CharField('Origem', max_length=12, choices=ORIGEM_CHOICES)
+    tipo = models.CharField(
+        'Tipo',
+        max_length=32,
+        blank=True,
+        help_text='Tipo da fatura, forma de pagamento do recibo, departamento do colaborador ou categoria do bem. Vazio = todos.'
+    )
+    campo_valor = models.CharField('Valor a lançar', max_length=20, choices=CAMPO_CHOICES)
+    conta_debito = models.ForeignKey(
+        'ContaContabil',
+        on_delete=models.PROTECT,
+        related_name='regras_debito',
+        verbose_name='Conta Débito'
+    )
+    conta_credito = models.ForeignKey(
+        'ContaContabil',
+        on_delete=models.PROTECT,
+        related_name='regras_credito',
+        verbose_name='Conta Crédito'
+    )
+    ativo = models.BooleanField('Ativa', default=True)
+
+    class Meta:
+        verbose_name = 'Regra de Lançamento'
+        verbose_name_plural = 'Regras de Lançamento'
+        ordering = ['origem', 'nome']
+
+    def __str__(self):
+        return f'{self.nome} ({self.get_origem_display()})'
+
+    def clean(self):
+        from .contabilizacao import ORIGENS
+        if self.origem and self.campo_valor and self.campo_valor not in ORIGENS[self.origem].campos:
+            raise ValidationError({'campo_valor': 'Este valor não existe nos documentos desta origem.'})
+
+
 class LancamentoContabil(models.Model):
     """
     Lançamento contábil (partidas dobradas).
@@ -265,6 +372,16 @@ class LancamentoContabil(models.Model):
         null=True,
         verbose_name='Lançado por'
     )
+    # lançamentos automáticos: regra que os gerou e pk do documento de origem
+    regra = models.ForeignKey(
+        RegraLancamento,
+        on_delete=models.PROTECT,
+        related_name='lancamentos',
+        null=True,
+        blank=True,
+        verbose_name='Regra'
+    )
+    documento_id = models.PositiveBigIntegerField('Documento de origem', null=True, blank=True)
     created_at = models.DateTimeField('Criado em', auto_now_add=True)
     updated_at = models.DateTimeField('Atualizado em', auto_now=True)
 
@@ -272,6 +389,47 @@ class LancamentoContabil(models.Model):
         verbose_name = 'Lançamento Contábil'
         verbose_name_plural = 'Lançamentos Contábeis'
         ordering = ['-data_lancamento']
+        # paginação por chave da lista de lançamentos (core/paginacao.py)
+        indexes = [models.Index(fields=['data_lancamento', 'id'], name='lancamento_data_id_idx')]
+        constraints = [
+            models.UniqueConstraint(fields=['regra', 'documento_id'], name='lancamento_documento_unico'),
+        ]
 
     def __str__(self):
         return f'{self.data_lancamento:%d/%m/%Y} | {self.valor} AKZ'
+
+
+class SaldoMensal(models.Model):
+    """
+    Movimentos e saldo acumulado de uma conta num mês, mantidos pelos sinais de
+    LancamentoContabil (ver administrativo/contabilidade.py). Os acumulados vão
+    do início da escrituração até ao fim do mês; meses sem movimento não têm linha.
+    """
+    conta = models.ForeignKey(
+        ContaContabil,
+        on_delete=models.CASCADE,
+        related_name='saldos_mensais',
+        verbose_name='Conta'
+    )
+    mes = models.DateField('Mês')  # sempre o dia 1
+    debito = models.DecimalField('Débitos do mês', max_digits=14, decimal_places=2, default=0)
+    credito = models.DecimalField('Créditos do mês', max_digits=14, decimal_places=2, default=0)
+    debito_acumulado = models.DecimalField('Débitos acumulados', max_digits=14, decimal_places=2, default=0)
+    credito_acumulado = models.DecimalField('Créditos acumulados', max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = 'Saldo Mensal'
+        verbose_name_plural = 'Saldos Mensais'
+        unique_together = [['conta', 'mes']]
+        ordering = ['conta', 'mes']
+        indexes = [models.Index(fields=['mes', 'conta'], name='saldo_mes_conta_idx')]
+
+    def __str__(self):
+        return f'{self.conta.codigo} | {self.mes:%m/%Y} | {self.saldo}'
+
+    @property
+    def saldo(self):
+        """Saldo acumulado no sentido natural da conta."""
+        if self.conta.posicao == 'CREDITO':
+            return self.credito_acumulado - self.debito_acumulado
+        return self.debito_acumulado - self.credito_acumulado
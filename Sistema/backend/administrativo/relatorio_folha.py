@@ -0,0 +1,193 @@
+# Sistema/backend/administrativo/relatorio_folha.py
+"""
+Histórico da folha de pagamento: colaborador × mês, totais por departamento e
+comparação com o mesmo mês do ano anterior.
+
+Os totais de cada mês (por colaborador) vêm de uma consulta agrupada sobre
+Salario, por intervalo de data_referencia. Os meses já fechados raramente
+mudam, por isso ficam em cache (a cache partilhada da base de dados, ver
+CACHES em settings: a invalidação num worker vale para todos), um registo por
+mês, invalidado pelos sinais de Salario e Colaborador; numa consulta ao histórico só os meses em falta na cache (e o mês
+corrente) vão à base de dados, todos na mesma consulta. O pivô, os totais e a
+comparação anual são calculados com pandas sobre essas linhas.
+"""
+
+import csv
+from collections import namedtuple
+from datetime import date
+from io import BytesIO
+
+import pandas as pd
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Colaborador, Salario
+
+CAMPOS = {
+    'salario_bruto': 'Salário Bruto',
+    'inss': 'INSS',
+    'irt': 'IRT',
+    'salario_liquido': 'Salário Líquido',
+}
+COLUNAS = ['colaborador_id', 'nome', 'departamento', *CAMPOS]
+
+CACHE_TIMEOUT = 60 * 60 * 24 * 30
+
+Relatorio = namedtuple('Relatorio', 'inicio fim campo meses linhas departamentos totais comparacao')
+LinhaFolha = namedtuple('LinhaFolha', 'chave nome departamento valores total')
+Comparacao = namedtuple('Comparacao', 'mes atual anterior variacao')
+
+
+def _chave(mes):
+    return f'administrativo:folha:{mes:%Y-%m}'
+
+
+def invalidar(*meses):
+    cache.delete_many([_chave(m.replace(day=1)) for m in meses if m])
+
+
+def _somar_meses(mes, n):
+    total = mes.year * 12 + mes.month - 1 + n
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def meses_entre(inicio, fim):
+    meses, mes = [], inicio.replace(day=1)
+    while mes <= fim:
+        meses.append(mes)
+        mes = _somar_meses(mes, 1)
+    return meses
+
+
+def _consultar(meses):
+    """{mês: [linhas]} dos `meses` numa só consulta agrupada."""
+    por_mes = {m: [] for m in meses}
+    if not meses:
+        return por_mes
+    qs = (
+        Salario.objects.filter(data_referencia__in=meses)
+        .order_by()
+        .values_list('data_referencia', 'colaborador_id', 'colaborador__nome', 'colaborador__departamento')
+        .annotate(*[Sum(campo) for campo in CAMPOS])
+    )
+    for mes, *linha in qs:
+        por_mes[mes].append(tuple(linha))
+    return por_mes
+
+
+def linhas_mensais(meses):
+    """
+    Linhas (colaborador_id, nome, departamento, bruto, inss, irt, líquido) por
+    mês. Meses fechados vêm da cache sempre que possível.
+    """
+    corrente = timezone.localdate().replace(day=1)
+    chaves = {_chave(m): m for m in meses if m < corrente}
+    em_cache = cache.get_many(list(chaves))
+    resultado = {chaves[k]: v for k, v in em_cache.items()}
+
+    em_falta = [m for m in meses if m not in resultado]
+    consultados = _consultar(em_falta)
+    cache.set_many(
+        {_chave(m): v for m, v in consultados.items() if m < corrente}, CACHE_TIMEOUT
+    )
+    resultado.update(consultados)
+    return resultado
+
+
+def _dataframe(por_mes):
+    registos = [(m, *linha) for m, linhas in por_mes.items() for linha in linhas]
+    df = pd.DataFrame.from_records(registos, columns=['mes', *COLUNAS])
+    for campo in CAMPOS:
+        df[campo] = pd.to_numeric(df[campo], errors='coerce').fillna(0).astype(float)
+    return df
+
+
+def historico(inicio, fim, campo='salario_liquido'):
+    """Relatório da folha de `inicio` a `fim` (meses inteiros) para o valor `campo`."""
+    if campo not in CAMPOS:
+        campo = 'salario_liquido'
+    meses = meses_entre(inicio, fim)
+    # o ano anterior vem na mesma leitura, para a comparação homóloga
+    anteriores = [_somar_meses(m, -12) for m in meses]
+    df = _dataframe(linhas_mensais(sorted(set(anteriores) | set(meses))))
+    rotulos = dict(Colaborador.DEPARTAMENTO_CHOICES)
+
+    atual = df[df.mes.isin(meses)]
+    linhas, departamentos = [], []
+    if not atual.empty:
+        pivo = atual.pivot_table(
+            index=['colaborador_id', 'nome', 'departamento'], columns='mes',
+            values=campo, aggfunc='sum', fill_value=0,
+        ).reindex(columns=meses, fill_value=0).sort_index(level='nome')
+        for (pk, nome, dep), valores in pivo.iterrows():
+            linhas.append(LinhaFolha(pk, nome, rotulos.get(dep, dep), valores.tolist(), float(valores.sum())))
+
+        por_dep = atual.pivot_table(
+            index='departamento', columns='mes', values=campo, aggfunc='sum', fill_value=0,
+        ).reindex(columns=meses, fill_value=0)
+        for dep, valores in por_dep.iterrows():
+            departamentos.append(LinhaFolha(dep, rotulos.get(dep, dep), dep, valores.tolist(), float(valores.sum())))
+        departamentos.sort(key=lambda l: -l.total)
+
+    por_mes = df.groupby('mes')[campo].sum()
+    totais = [float(por_mes.get(m, 0)) for m in meses]
+    comparacao = []
+    for mes, anterior, valor in zip(meses, anteriores, totais):
+        base = float(por_mes.get(anterior, 0))
+        variacao = (valor - base) / base * 100 if base else None
+        comparacao.append(Comparacao(mes, valor, base, variacao))
+
+    return Relatorio(inicio.replace(day=1), fim.replace(day=1), campo, meses,
+                     linhas, departamentos, totais, comparacao)
+
+
+# --------------------------------
+# Exportação
+# --------------------------------
+
+def _cabecalho(relatorio):
+    return ['Colaborador', 'Departamento', *[f'{m:%m/%Y}' for m in relatorio.meses], 'Total']
+
+
+def _registos(relatorio):
+    """Linhas da exportação: colaboradores, totais por departamento e total geral."""
+    for l in relatorio.linhas:
+        yield [l.nome, l.departamento, *[round(v, 2) for v in l.valores], round(l.total, 2)]
+    yield []
+    for d in relatorio.departamentos:
+        yield [f'Total {d.nome}', '', *[round(v, 2) for v in d.valores], round(d.total, 2)]
+    yield ['Total geral', '', *[round(v, 2) for v in relatorio.totais], round(sum(relatorio.totais), 2)]
+    yield ['Ano anterior', '', *[round(c.anterior, 2) for c in relatorio.comparacao], '']
+    yield ['Variação (%)', '',
+           *[round(c.variacao, 1) if c.variacao is not None else '' for c in relatorio.comparacao], '']
+
+
+class _Eco:
+    """Destino do csv.writer que devolve a linha em vez de a guardar."""
+    def write(self, valor):
+        return valor
+
+
+def csv_linhas(relatorio):
+    """Gerador de linhas CSV, para StreamingHttpResponse."""
+    escritor = csv.writer(_Eco(), delimiter=';')
+    yield '\ufeff'  # BOM: acentos corretos ao abrir no Excel
+    yield escritor.writerow(_cabecalho(relatorio))
+    for registo in _registos(relatorio):
+        yield escritor.writerow(registo)
+
+
+def xlsx(relatorio):
+    """Livro XLSX em modo write_only: as linhas são escritas em sequência, sem manter as células em memória."""
+    from openpyxl import Workbook
+
+    livro = Workbook(write_only=True)
+    folha = livro.create_sheet(CAMPOS[relatorio.campo][:31])
+    folha.append(_cabecalho(relatorio))
+    for registo in _registos(relatorio):
+        folha.append(registo)
+    buf = BytesIO()
+    livro.save(buf)
+    buf.seek(0)
+    return buf
@@ -1,6 +1,8 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import BemPatrimonio
+from secretaria.models import Fatura, Recibo
+from .models import BemPatrimonio, Colaborador, DepreciacaoMensal, LancamentoContabil, Salario
+from . import contabilidade, contabilizacao, relatorio_folha
 from datetime import date
 
 @receiver(pre_save, sender=BemPatrimonio)
@@ -12,3 +14,78 @@ def atualizar_depreciacao_pre_save(sender, instance, **kwargs):
     # Precisamos salvar primeiro para garantir que data_aquisicao e vida_util_anos existam.
     # Então, calculamos usando a data de hoje:
     instance.calcular_depreciacao(data_referencia=date.today())
+
+
+@receiver(pre_save, sender=LancamentoContabil)
+def guardar_lancamento_anterior(sender, instance, **kwargs):
+    """
+    Numa edição, guarda os movimentos da versão gravada para os estornar no post_save.
+    """
+    instance._movimentos_anteriores = None
+    if instance.pk:
+        anterior = LancamentoContabil.objects.filter(pk=instance.pk).first()
+        if anterior:
+            instance._movimentos_anteriores = contabilidade.movimentos(anterior, sinal=-1)
+
+
+@receiver(post_save, sender=LancamentoContabil)
+def atualizar_saldos_no_lancamento(sender, instance, **kwargs):
+    """
+    Aplica aos saldos mensais a diferença entre a versão anterior e a nova.
+    """
+    anteriores = getattr(instance, '_movimentos_anteriores', None) or {}
+    contabilidade.aplicar_movimentos(contabilidade.juntar(anteriores, contabilidade.movimentos(instance)))
+
+
+@receiver(post_delete, sender=LancamentoContabil)
+def estornar_saldos_na_remocao(sender, instance, **kwargs):
+    contabilidade.aplicar_movimentos(contabilidade.movimentos(instance, sinal=-1))
+
+
+ORIGEM_DO_MODELO = {
+    Fatura: 'FATURA', Recibo: 'RECIBO', Salario: 'SALARIO', DepreciacaoMensal: 'DEPRECIACAO',
+}
+
+
+@receiver(post_save, sender=Fatura)
+@receiver(post_save, sender=Recibo)
+@receiver(post_save, sender=Salario)
+def contabilizar_documento(sender, instance, **kwargs):
+    """
+    Mantém os lançamentos automáticos (RegraLancamento) do documento em dia.
+    """
+    contabilizacao.contabilizar_documento(ORIGEM_DO_MODELO[sender], instance)
+
+
+@receiver(post_delete, sender=Fatura)
+@receiver(post_delete, sender=Recibo)
+@receiver(post_delete, sender=Salario)
+@receiver(post_delete, sender=DepreciacaoMensal)
+def remover_lancamentos_do_documento(sender, instance, **kwargs):
+    contabilizacao.remover_documento(ORIGEM_DO_MODELO[sender], instance.pk)
+
+
+@receiver(pre_save, sender=Salario)
+def guardar_mes_anterior(sender, instance, **kwargs):
+    instance._data_referencia_anterior = None
+    if instance.pk:
+        instance._data_referencia_anterior = (
+            Salario.objects.filter(pk=instance.pk).values_list('data_referencia', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Salario)
+@receiver(post_delete, sender=Salario)
+def invalidar_historico_folha(sender, instance, **kwargs):
+    """
+    O mês do salário (e o mês antigo, se mudou) deixa de estar válido na cache
+    do histórico da folha.
+    """
+    relatorio_folha.invalidar(instance.data_referencia, getattr(instance, '_data_referencia_anterior', None))
+
+
+@receiver(post_save, sender=Colaborador)
+def invalidar_historico_colaborador(sender, instance, created, **kwargs):
+    """Nome e departamento fazem parte das linhas em cache."""
+    if not created:
+        relatorio_folha.invalidar(*instance.salarios.values_list('data_referencia', flat=True))
@@ -20,6 +20,7 @@ urlpatterns = [
     path('salarios/edit/<int:pk>/', views.SalarioUpdateView.as_view(), name='salario-edit'),
     path('salarios/delete/<int:pk>/', views.SalarioDeleteView.as_view(), name='salario-delete'),
     path('salarios/report/', views.salario_report, name='salario-report'),
+    path('salarios/checklist/', views.folha_checklist, name='folha-checklist'),
 
     # Geração de holerite por PDF (opcional, se quisermos rota separada)
     # path('salarios/<int:pk>/holerite/', views.gerar_holerite, name='salario-holerite'),
@@ -29,6 +30,7 @@ urlpatterns = [
     path('patrimonios/new/', views.BemPatrimonioCreateView.as_view(), name='patrimonio-create'),
     path('patrimonios/edit/<int:pk>/', views.BemPatrimonioUpdateView.as_view(), name='patrimonio-edit'),
     path('patrimonios/delete/<int:pk>/', views.BemPatrimonioDeleteView.as_view(), name='patrimonio-delete'),
+    path('patrimonios/depreciar/', views.depreciar_patrimonio, name='patrimonio-depreciar'),
 
     # CRUD de Plano de Contas
     path('contas/', views.PlanoContasListView.as_view(), name='plano-contas-list'),
@@ -41,4 +43,9 @@ urlpatterns = [
     path('lancamentos/new/', views.LancamentoContabilCreateView.as_view(), name='lancamento-create'),
     path('lancamentos/edit/<int:pk>/', views.LancamentoContabilUpdateView.as_view(), name='lancamento-edit'),
     path('lancamentos/delete/<int:pk>/', views.LancamentoContabilDeleteView.as_view(), name='lancamento-delete'),
+    path('lancamentos/contabilizar/', views.contabilizar_lancamentos, name='lancamento-contabilizar'),
+
+    # Relatórios contábeis
+    path('contabilidade/balancete/', views.balancete, name='balancete'),
+    path('contabilidade/dre/', views.dre, name='dre'),
 ]
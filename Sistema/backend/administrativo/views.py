@@ -1,4 +1,4 @@
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, RedirectView
@@ -8,10 +8,13 @@ from django.core.exceptions import PermissionDenied
 from .models import Colaborador, ContaContabil, Salario, BemPatrimonio, LancamentoContabil
 from .forms import ColaboradorForm, ContaContabilForm, SalarioForm, BemPatrimonioForm, LancamentoContabilForm
 from accounts.decorators import role_required
+from core.paginacao import KeysetPaginationMixin
+from . import contabilidade, contabilizacao, depreciacao, folha, relatorio_folha
 from django.contrib import messages
 from django.template.loader import render_to_string
 from django.utils import timezone
 import os
+from datetime import date
 from decimal import Decimal, ROUND_HALF_UP
 from weasyprint import HTML
 from django.conf import settings
@@ -86,10 +89,20 @@ class SalarioListView(LoginRequiredMixin, ListView):
     template_name = 'administrativo/salario_list.html'
     context_object_name = 'salarios'
     paginate_by = 20
-    ordering = ['-mes_referencia']
+    ordering = ['-data_referencia', 'colaborador__nome']
 
     def get_queryset(self):
-        return super().get_queryset().select_related('colaborador')
+        qs = super().get_queryset().select_related('colaborador')
+        colaborador = self.request.GET.get('colaborador')
+        if colaborador:
+            qs = qs.filter(colaborador__nome__icontains=colaborador)
+        mes = self.request.GET.get('mes_referencia')
+        if mes:
+            try:
+                qs = qs.do_mes(date.fromisoformat(f'{mes}-01'))
+            except ValueError:
+                pass
+        return qs
 
 
 @method_decorator(role_required('Admin', 'Diretor'), name='dispatch')
@@ -211,6 +224,35 @@ class SalarioDeleteView(LoginRequiredMixin, DeleteView):
     success_url = reverse_lazy('administrativo:salario-list')
 
 
+@login_required
+@role_required('Admin', 'Diretor')
+def folha_checklist(request):
+    """
+    Checklist da folha de um mês: colaboradores ativos com o salário do mês
+    processado ou não e o mês anterior em atraso.
+    """
+    try:
+        mes = date.fromisoformat(f"{request.GET['mes']}-01")
+    except (KeyError, ValueError):
+        mes = None
+    resumo = folha.resumo(mes)
+
+    estado = request.GET.get('estado', '')
+    colaboradores = folha.situacao(resumo.mes)
+    if estado == 'pendente':
+        colaboradores = colaboradores.filter(processado=False)
+    elif estado == 'atrasado':
+        colaboradores = colaboradores.filter(atrasado=True)
+    elif estado == 'processado':
+        colaboradores = colaboradores.filter(processado=True)
+
+    return render(request, 'administrativo/folha_checklist.html', {
+        'resumo': resumo,
+        'estado': estado,
+        'colaboradores': colaboradores.order_by('processado', 'departamento', 'nome'),
+    })
+
+
 # ------------------------------
 # CRUD de BemPatrimonio
 # ------------------------------
@@ -226,6 +268,11 @@ class BemPatrimonioListView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         return super().get_queryset()
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['ultima_depreciacao'] = depreciacao.ultimo_mes()
+        return context
+
 
 @method_decorator(role_required('Admin', 'Diretor'), name='dispatch')
 class BemPatrimonioCreateView(LoginRequiredMixin, CreateView):
@@ -262,6 +309,32 @@ class BemPatrimonioDeleteView(LoginRequiredMixin, DeleteView):
     template_name = 'administrativo/patrimonio_confirm_delete.html'
     success_url = reverse_lazy('administrativo:patrimonio-list')
 
+@login_required
+@role_required('Admin', 'Diretor')
+def depreciar_patrimonio(request):
+    """
+    Executa a depreciação mensal de todos os bens (mês corrente por omissão) e,
+    se pedido, gera os lançamentos de depreciação.
+    """
+    if request.method != 'POST':
+        return redirect('administrativo:patrimonio-list')
+
+    mes = None
+    if request.POST.get('mes'):
+        try:
+            mes = date.fromisoformat(request.POST['mes'] + '-01')
+        except ValueError:
+            messages.error(request, "Mês inválido.")
+            return redirect('administrativo:patrimonio-list')
+
+    resultado = depreciacao.depreciar(mes, lancar=bool(request.POST.get('lancar')), lancado_por=request.user)
+    messages.success(
+        request,
+        f"Depreciação de {resultado.mes:%m/%Y}: {resultado.bens} bem(ns), "
+        f"{resultado.depreciacao} AOA, {resultado.lancamentos} lançamento(s)."
+    )
+    return redirect('administrativo:patrimonio-list')
+
 # ------------------------------
 # CRUD de Plano de Contas
 # ------------------------------
@@ -299,12 +372,12 @@ class PlanoContasDeleteView(LoginRequiredMixin, DeleteView):
 # ------------------------------
 
 @method_decorator(role_required('Admin', 'Diretor'), name='dispatch')
-class LancamentoContabilListView(LoginRequiredMixin, ListView):
+class LancamentoContabilListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = LancamentoContabil
     template_name = 'administrativo/lancamento_list.html'
     context_object_name = 'lancamentos'
     paginate_by = 20
-    ordering = ['-data_lancamento']
+    ordering = ['-data_lancamento', '-pk']
 
     def get_queryset(self):
         return super().get_queryset()
@@ -336,6 +409,73 @@ class LancamentoContabilDeleteView(LoginRequiredMixin, DeleteView):
     template_name = 'administrativo/lancamento_confirm_delete.html'
     success_url = reverse_lazy('administrativo:lancamento-list')
 
+@login_required
+@role_required('Admin', 'Diretor')
+def contabilizar_lancamentos(request):
+    """
+    Gera os lançamentos automáticos em falta (faturas, recibos e salários) do
+    período indicado, segundo as regras de lançamento ativas.
+    """
+    if request.method != 'POST':
+        return redirect('administrativo:lancamento-list')
+
+    hoje = timezone.localdate()
+    try:
+        inicio = date.fromisoformat(request.POST.get('inicio') or hoje.replace(day=1).isoformat())
+        fim = date.fromisoformat(request.POST.get('fim') or hoje.isoformat())
+    except ValueError:
+        messages.error(request, "Período inválido.")
+        return redirect('administrativo:lancamento-list')
+
+    resultado = contabilizacao.contabilizar_periodo(inicio, fim, lancado_por=request.user)
+    messages.success(
+        request,
+        f"{resultado.criados} lançamento(s) gerado(s) de {inicio:%d/%m/%Y} a {fim:%d/%m/%Y}."
+    )
+    return redirect('administrativo:lancamento-list')
+
+# ------------------------------
+# Balancete e DRE (saldos mensais)
+# ------------------------------
+
+def _periodo(request):
+    """Meses `inicio`/`fim` (AAAA-MM) do pedido; por omissão, de janeiro ao mês corrente."""
+    hoje = timezone.localdate()
+    def mes(valor, omissao):
+        try:
+            ano, m = map(int, (valor or '').split('-'))
+            return date(ano, m, 1)
+        except ValueError:
+            return omissao
+    inicio = mes(request.GET.get('inicio'), date(hoje.year, 1, 1))
+    fim = mes(request.GET.get('fim'), hoje.replace(day=1))
+    return (inicio, fim) if inicio <= fim else (fim, inicio)
+
+
+@login_required
+@role_required('Admin', 'Diretor')
+def balancete(request):
+    inicio, fim = _periodo(request)
+    linhas = contabilidade.balancete(inicio, fim)
+    return render(request, 'administrativo/balancete.html', {
+        'inicio': inicio,
+        'fim': fim,
+        'linhas': linhas,
+        'total_debito': sum(l.debito for l in linhas),
+        'total_credito': sum(l.credito for l in linhas),
+    })
+
+
+@login_required
+@role_required('Admin', 'Diretor')
+def dre(request):
+    inicio, fim = _periodo(request)
+    return render(request, 'administrativo/dre.html', {
+        'inicio': inicio,
+        'fim': fim,
+        'dre': contabilidade.dre(inicio, fim),
+    })
+
 # ------------------------------
 # Relatório de Salários (RF-XX)
 # ------------------------------
@@ -343,37 +483,36 @@ class LancamentoContabilDeleteView(LoginRequiredMixin, DeleteView):
 @login_required
 @role_required('Admin','Diretor')
 def salario_report(request):
-    ano = request.GET.get('ano')  # ou exercício atual via context processor
-    qs = Salario.objects.select_related('colaborador')
-    if ano:
-        qs = qs.filter(data_processamento__year=ano)
-    if request.GET.get('format') == 'excel':
-        import pandas as pd
-        data = []
-        for s in qs:
-            data.append({
-                'Colaborador': s.colaborador.nome,
-                'Mês Referência': s.mes_referencia.strftime('%m/%Y'),
-                'Salário Bruto': s.salario_bruto,
-                'INSS': s.inss,
-                'IRRF': s.irt,
-                'Salário Líquido': s.salario_liquido,
-            })
-        from io import BytesIO
-        buf = BytesIO()
-        with pd.ExcelWriter(buf, engine='openpyxl') as writer:
-            pd.DataFrame(data).to_excel(writer, index=False, sheet_name='Salários')
-        buf.seek(0)
-        resp = HttpResponse(
-            buf,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        resp['Content-Disposition'] = f'attachment; filename=salarios_{ano}.xlsx'
+    """
+    Histórico da folha: colaborador × mês, totais por departamento e comparação
+    com o ano anterior, no ecrã ou exportado (csv, excel, pdf).
+    """
+    inicio, fim = _periodo(request)
+    relatorio = relatorio_folha.historico(inicio, fim, request.GET.get('campo', 'salario_liquido'))
+    nome = f'folha_{inicio:%Y%m}_{fim:%Y%m}'
+    formato = request.GET.get('format')
+    if formato == 'csv':
+        resp = StreamingHttpResponse(relatorio_folha.csv_linhas(relatorio), content_type='text/csv; charset=utf-8')
+        resp['Content-Disposition'] = f'attachment; filename={nome}.csv'
         return resp
+    if formato == 'excel':
+        return FileResponse(
+            relatorio_folha.xlsx(relatorio),
+            as_attachment=True,
+            filename=f'{nome}.xlsx',
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+    contexto = {
+        'relatorio': relatorio,
+        'inicio': inicio,
+        'fim': fim,
+        'campos': relatorio_folha.CAMPOS.items(),
+        'rotulo_campo': relatorio_folha.CAMPOS[relatorio.campo],
+    }
     # PDF via WeasyPrint se formato pdf
-    if request.GET.get('format') == 'pdf':
-        html = render_to_string('administrativo/salario_report_pdf.html', {'salarios': qs, 'ano': ano})
+    if formato == 'pdf':
+        html = render_to_string('administrativo/salario_report_pdf.html', contexto)
         pdf = HTML(string=html, base_url=request.build_absolute_uri()).write_pdf()
         return HttpResponse(pdf, content_type='application/pdf')
-    return render(request, 'administrativo/salario_report.html', {'salarios': qs, 'ano': ano})
+    return render(request, 'administrativo/salario_report.html', contexto)
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ConfiguracaoInicial, BackupLog, ErrorLog, NotificationLog
+from .models import ConfiguracaoInicial, BackupLog, ErrorLog, NotificationLog, ResumoDiario
 
 @admin.register(ConfiguracaoInicial)
 class ConfiguracaoInicialAdmin(admin.ModelAdmin):
@@ -26,4 +26,11 @@ class NotificationLogAdmin(admin.ModelAdmin):
     list_display = ('destinatario', 'meio', 'status_envio', 'data_envio')
     list_filter = ('meio', 'status_envio')
     search_fields = ('destinatario', 'fatura_id')
-    date_hierarchy = 'data_envio'
\ No newline at end of file
+    date_hierarchy = 'data_envio'
+
+@admin.register(ResumoDiario)
+class ResumoDiarioAdmin(admin.ModelAdmin):
+    list_display = ('tabela', 'dia', 'chave', 'total')
+    list_filter = ('tabela',)
+    search_fields = ('chave',)
+    date_hierarchy = 'dia'
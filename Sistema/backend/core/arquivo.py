@@ -0,0 +1,207 @@
+# Sistema/backend/core/arquivo.py
+"""
+Arquivo de anos letivos encerrados.
+
+Cada modelo "quente" (Nota, Matricula, TurmaDisciplina, Fatura...) pode ter uma
+tabela gémea `<tabela>_arquivo`, com as mesmas colunas, para onde as linhas dos
+anos encerrados são movidas. Assim as consultas do dia a dia só percorrem os
+dados do ano corrente, e o histórico continua acessível pela mesma API do ORM
+(mesmos nomes de campos e relações), só que apenas para leitura.
+"""
+
+from django.core.exceptions import PermissionDenied
+from django.db import connection, models, transaction
+
+# modelo quente → modelo de arquivo
+ARQUIVOS = {}
+
+
+class ArquivoQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        raise PermissionDenied("Registos arquivados são apenas de leitura.")
+
+    def delete(self):
+        raise PermissionDenied("Registos arquivados são apenas de leitura.")
+
+
+class ModeloArquivo(models.Model):
+    """
+    Base dos modelos de arquivo: somente leitura pelo ORM.
+    As linhas só entram/saem através de `arquivar` / `desarquivar`.
+    """
+    objects = ArquivoQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        raise PermissionDenied("Registos arquivados são apenas de leitura.")
+
+    def delete(self, *args, **kwargs):
+        raise PermissionDenied("Registos arquivados são apenas de leitura.")
+
+
+def _campo_arquivo(field, alvos):
+    """Cópia de um campo concreto, sem unicidade, auto_now nem constraints de FK."""
+    if field.primary_key:
+        return models.BigIntegerField(primary_key=True)
+    if field.is_relation:
+        # FK montada à mão: `deconstruct()` de relações exige o registo de
+        # apps pronto, o que ainda não acontece ao importar models.py.
+        alvo = field.remote_field.model
+        return models.ForeignKey(
+            alvos.get(alvo, alvo),
+            on_delete=models.DO_NOTHING,
+            db_constraint=False,
+            related_name='+',
+            null=field.null,
+            blank=field.blank,
+            verbose_name=field.verbose_name,
+        )
+    if isinstance(field, models.FileField):
+        return models.CharField(max_length=field.max_length, blank=True, null=field.null)
+    _, _, args, kwargs = field.deconstruct()
+    for chave in ('unique', 'auto_now', 'auto_now_add', 'validators'):
+        kwargs.pop(chave, None)
+    return field.__class__(*args, **kwargs)
+
+
+def criar_modelo_arquivo(modelo, alvos=None):
+    """
+    Cria (em tempo de importação, para que as migrações o vejam) o modelo de
+    arquivo de `modelo`. `alvos` remapeia FKs para outros modelos de arquivo
+    (ex.: Recibo.fatura → FaturaArquivo).
+    """
+    alvos = alvos or {}
+    opts = modelo._meta
+    atributos = {
+        '__module__': modelo.__module__,
+        'Meta': type('Meta', (), {
+            'db_table': f'{opts.db_table}_arquivo',
+            'verbose_name': f'{opts.verbose_name} (arquivo)',
+            'verbose_name_plural': f'{opts.verbose_name_plural} (arquivo)',
+            'ordering': list(opts.ordering),
+        }),
+    }
+    for field in opts.concrete_fields:
+        atributos[field.name] = _campo_arquivo(field, alvos)
+    arquivo = type(f'{modelo.__name__}Arquivo', (ModeloArquivo,), atributos)
+    ARQUIVOS[modelo] = arquivo
+    return arquivo
+
+
+def modelo_arquivo(modelo):
+    return ARQUIVOS.get(modelo)
+
+
+def _mover(origem, destino, pks_sql, params):
+    """INSERT ... SELECT das linhas cujo pk está em `pks_sql`. Retorna quantas foram copiadas."""
+    qn = connection.ops.quote_name
+    colunas = ', '.join(qn(f.column) for f in origem._meta.concrete_fields)
+    pk = qn(origem._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {qn(destino._meta.db_table)} ({colunas}) '
+            f'SELECT {colunas} FROM {qn(origem._meta.db_table)} WHERE {pk} IN ({pks_sql})',
+            params,
+        )
+        return cursor.rowcount
+
+
+def _apagar(modelo, pks_sql, params):
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {qn(modelo._meta.db_table)} '
+            f'WHERE {qn(modelo._meta.pk.column)} IN ({pks_sql})',
+            params,
+        )
+
+
+def _sql_pks(queryset):
+    return queryset.order_by().values('pk').query.sql_with_params()
+
+
+def arquivar(queryset, dependentes=()):
+    """
+    Move as linhas de `queryset` (e das relações `dependentes`, dadas como
+    [(ModeloDependente, 'campo_fk')]) para as respetivas tabelas de arquivo,
+    numa só transação e sem carregar objetos em memória. Retorna {modelo: n}.
+    """
+    modelo = queryset.model
+    # A subconsulta dos pks é reavaliada em cada instrução: os dependentes
+    # são apagados antes das linhas principais, que saem por último.
+    pks_sql, params = _sql_pks(queryset)
+    resultado = {}
+    with transaction.atomic():
+        resultado[modelo] = _mover(modelo, ARQUIVOS[modelo], pks_sql, params)
+        for dependente, campo in dependentes:
+            dep_sql, dep_params = _sql_pks(
+                dependente.objects.filter(**{f'{campo}__in': queryset.order_by().values('pk')})
+            )
+            resultado[dependente] = _mover(dependente, ARQUIVOS[dependente], dep_sql, dep_params)
+            _apagar(dependente, dep_sql, dep_params)
+        _apagar(modelo, pks_sql, params)
+    return resultado
+
+
+def desarquivar(queryset_arquivo, dependentes=()):
+    """Operação inversa de `arquivar`: devolve as linhas às tabelas quentes."""
+    arquivo = queryset_arquivo.model
+    modelo = next(m for m, a in ARQUIVOS.items() if a is arquivo)
+    pks_sql, params = _sql_pks(queryset_arquivo)
+    resultado = {}
+    with transaction.atomic():
+        resultado[modelo] = _mover(arquivo, modelo, pks_sql, params)
+        for dependente, campo in dependentes:
+            dep_arquivo = ARQUIVOS[dependente]
+            dep_sql, dep_params = _sql_pks(
+                dep_arquivo.objects.filter(**{f'{campo}__in': queryset_arquivo.order_by().values('pk')})
+            )
+            resultado[dependente] = _mover(dep_arquivo, dependente, dep_sql, dep_params)
+            _apagar(dep_arquivo, dep_sql, dep_params)
+        _apagar(arquivo, pks_sql, params)
+    return resultado
+
+
+def _conjuntos_do_ano(ano):
+    """(modelo, filtro, dependentes) dos dados de `ano`, pela ordem de arquivo."""
+    from pedagogico.models import Aula, Frequencia, Matricula, Nota, TurmaDisciplina
+    from secretaria.models import EncargoFatura, Fatura, FaturaServico, Recibo
+
+    # Fatura não tem ano letivo: só as pagas, emitidas dentro do período do ano,
+    # saem da tabela quente (as pendentes continuam a pesar na conta corrente).
+    faturas = {'status': 'PAGO', 'data_emissao__range': (ano.data_inicio, ano.data_fim)}
+    return [
+        (Nota, {'ano_letivo': ano}, ()),
+        (Matricula, {'ano_letivo': ano}, ()),
+        # Frequencia aponta para TurmaDisciplina: sai antes dela (e volta depois)
+        (Frequencia, {'ano_letivo': ano}, ()),
+        (TurmaDisciplina, {'ano_letivo': ano}, [(Aula, 'turma_disciplina')]),
+        (Fatura, faturas, [(Recibo, 'fatura'), (FaturaServico, 'fatura'), (EncargoFatura, 'fatura')]),
+    ]
+
+
+def arquivar_ano(ano):
+    """Move para o arquivo os dados de um ano letivo encerrado. Retorna {modelo: n}."""
+    if ano.ativo:
+        raise ValueError(f"O ano letivo {ano} está ativo e não pode ser arquivado.")
+    resultado = {}
+    with transaction.atomic():
+        for modelo, filtro, dependentes in _conjuntos_do_ano(ano):
+            resultado.update(arquivar(modelo.objects.filter(**filtro), dependentes))
+        ano.arquivado = True
+        ano.save(update_fields=['arquivado'])
+    return resultado
+
+
+def desarquivar_ano(ano):
+    """Devolve às tabelas quentes os dados arquivados de `ano`. Retorna {modelo: n}."""
+    resultado = {}
+    with transaction.atomic():
+        for modelo, filtro, dependentes in reversed(_conjuntos_do_ano(ano)):
+            arquivo_qs = ARQUIVOS[modelo].objects.filter(**filtro)
+            resultado.update(desarquivar(arquivo_qs, dependentes))
+        ano.arquivado = False
+        ano.save(update_fields=['arquivado'])
+    return resultado
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import retencao
+
+
+class Command(BaseCommand):
+    help = ('Resume por dia e apaga, em lotes, as linhas de ErrorLog, AccessLog, NotificationLog '
+            'e Atividade mais antigas do que a política de retenção de cada tabela.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tabela',
+            action='append',
+            help=f"Só esta tabela (pode repetir): {', '.join(retencao.POLITICAS)}",
+        )
+        parser.add_argument('--lote', type=int, default=retencao.LOTE, help=f'Linhas por lote. Padrão: {retencao.LOTE}')
+        parser.add_argument('--max-lotes', type=int, help='Para ao fim deste número de lotes por tabela.')
+        parser.add_argument('--simular', action='store_true', help='Só mostra quantas linhas sairiam.')
+
+    def handle(self, *args, **options):
+        desconhecidas = set(options['tabela'] or []) - set(retencao.POLITICAS)
+        if desconhecidas:
+            raise CommandError(f"Tabela sem política de retenção: {', '.join(sorted(desconhecidas))}")
+        if options['lote'] < 1:
+            raise CommandError('--lote tem de ser positivo.')
+
+        resultados = retencao.aplicar_todas(
+            options['tabela'], lote=options['lote'], max_lotes=options['max_lotes'], simular=options['simular'],
+        )
+        for r in resultados:
+            if options['simular']:
+                self.stdout.write(f'{r.tabela}: {r.apagadas} linha(s) anteriores a {r.limite:%d/%m/%Y} a apagar.')
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'{r.tabela}: {r.apagadas} linha(s) anteriores a {r.limite:%d/%m/%Y} resumidas e apagadas '
+                    f'em {r.lotes} lote(s).'
+                ))
+        if not resultados:
+            self.stdout.write('Nenhuma tabela com retenção ativa.')
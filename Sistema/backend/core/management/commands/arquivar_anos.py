@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.arquivo import arquivar_ano, desarquivar_ano
+from pedagogico.models import AnoLetivo
+
+
+class Command(BaseCommand):
+    help = ('Move notas, matrículas, turma-disciplinas e faturas pagas dos anos letivos '
+            'encerrados para as tabelas de arquivo (somente leitura).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('ano_id', type=int, nargs='?', help='ID de um AnoLetivo específico')
+        parser.add_argument(
+            '--manter',
+            type=int,
+            default=1,
+            help='Quantos anos encerrados (os mais recentes) ficam nas tabelas quentes. Padrão: 1',
+        )
+        parser.add_argument(
+            '--desarquivar',
+            action='store_true',
+            help='Devolve os dados do ano indicado às tabelas quentes.',
+        )
+
+    def handle(self, *args, **options):
+        if options['ano_id']:
+            try:
+                anos = [AnoLetivo.objects.get(pk=options['ano_id'])]
+            except AnoLetivo.DoesNotExist:
+                raise CommandError(f"AnoLetivo {options['ano_id']} não encontrado.")
+        elif options['desarquivar']:
+            raise CommandError('Indique o ano a desarquivar.')
+        else:
+            # anos cujo exercício já foi encerrado, do mais recente para o mais antigo
+            encerrados = (
+                AnoLetivo.objects
+                .filter(ativo=False, exercicio__encerrado_em__isnull=False)
+                .distinct()
+                .order_by('-data_inicio')
+            )
+            anos = [a for a in encerrados[options['manter']:] if not a.arquivado]
+
+        for ano in anos:
+            try:
+                if options['desarquivar']:
+                    movidos = desarquivar_ano(ano)
+                    acao = 'desarquivado'
+                else:
+                    movidos = arquivar_ano(ano)
+                    acao = 'arquivado'
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            detalhe = ', '.join(f'{m._meta.verbose_name_plural}: {n}' for m, n in movidos.items())
+            self.stdout.write(self.style.SUCCESS(f'{ano.nome} {acao} ({detalhe}).'))
+
+        if not anos:
+            self.stdout.write('Nenhum ano letivo a arquivar.')
@@ -1,3 +1,4 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from core.models import Exercicio
 from pedagogico.models import AnoLetivo
@@ -9,6 +10,17 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('ano_id', type=int, help='ID do AnoLetivo a iniciar')
+        parser.add_argument(
+            '--rematricula',
+            choices=['MATRICULA', 'PRE_REMATRICULA'],
+            default=None,
+            help='Executa também a rematrícula em lote do ano encerrado para o novo ano.',
+        )
+        parser.add_argument(
+            '--arquivar',
+            action='store_true',
+            help='Arquiva os anos encerrados, mantendo só o mais recente nas tabelas quentes.',
+        )
 
     def handle(self, *args, **options):
         ano = AnoLetivo.objects.get(pk=options['ano_id'])
@@ -22,6 +34,15 @@ class Command(BaseCommand):
             atual.save()
             self.stdout.write(self.style.SUCCESS('Exercício anterior encerrado e backup feito.'))
 
+            # 1.1 Rematrícula em lote (opcional)
+            if options.get('rematricula') and atual.ano_id != ano.pk:
+                call_command('rematricula_lote', atual.ano_id, ano.pk,
+                             modo=options['rematricula'], stdout=self.stdout)
+
         # 2. Iniciar novo
         Exercicio.objects.create(ano=ano)
         self.stdout.write(self.style.SUCCESS(f'Novo exercício iniciado: {ano.nome}'))
+
+        # 3. Arquivo dos anos encerrados (opcional)
+        if options.get('arquivar'):
+            call_command('arquivar_anos', stdout=self.stdout)
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(fields=['timestamp', 'id'], name='accesslog_timestamp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='errorlog',
+            index=models.Index(fields=['data_ocorrencia', 'id'], name='errorlog_data_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationlog',
+            index=models.Index(fields=['data_envio', 'id'], name='notificationlog_data_id_idx'),
+        ),
+    ]
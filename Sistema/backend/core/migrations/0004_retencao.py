@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_logs_paginacao_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoDiario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tabela', models.CharField(max_length=50, verbose_name='Tabela')),
+                ('dia', models.DateField(verbose_name='Dia')),
+                ('chave', models.CharField(blank=True, max_length=200, verbose_name='Chave')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total')),
+            ],
+            options={
+                'verbose_name': 'Resumo Diário',
+                'verbose_name_plural': 'Resumos Diários',
+                'ordering': ['-dia', 'tabela', 'chave'],
+                'constraints': [models.UniqueConstraint(fields=('tabela', 'dia', 'chave'), name='resumo_diario_unico')],
+            },
+        ),
+    ]
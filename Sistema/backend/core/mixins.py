@@ -1,8 +1,16 @@
 from django.shortcuts import get_object_or_404
+from core.arquivo import modelo_arquivo
 from core.models import Exercicio
 from pedagogico.models import AnoLetivo
 
 class AnoContextMixin:
+    """
+    Listas e formulários do ano letivo em contexto (o selecionado na sessão ou
+    o do exercício aberto). O filtro por ano das listas é feito aqui, e nos
+    anos arquivados as linhas vêm das tabelas de arquivo, só de leitura: o
+    contexto leva `ano_arquivado` para as listas esconderem editar/excluir.
+    """
+
     def get_ano(self):
         ano_id = self.request.session.get('ano_selecionado')
         if ano_id:
@@ -13,7 +21,19 @@ class AnoContextMixin:
     def get_queryset(self):
         ano = self.get_ano()
         qs = super().get_queryset()
-        return qs.filter(ano_letivo=ano) if ano else qs.none()
+        if not ano:
+            return qs.none()
+        # anos arquivados são lidos das tabelas de arquivo (somente leitura)
+        arquivo = modelo_arquivo(qs.model) if ano.arquivado else None
+        if arquivo is not None:
+            qs = arquivo.objects.order_by(*qs.query.order_by)
+        return qs.filter(ano_letivo=ano)
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ano = self.get_ano()
+        ctx['ano_arquivado'] = bool(ano and ano.arquivado)
+        return ctx
 
     def form_valid(self, form):
         ano = self.get_ano()
@@ -93,6 +93,8 @@ class ErrorLog(models.Model):
         verbose_name = 'Error Log'
         verbose_name_plural = 'Logs de Erro'
         ordering = ['-data_ocorrencia']
+        # paginação por chave (core/paginacao.py)
+        indexes = [models.Index(fields=['data_ocorrencia', 'id'], name='errorlog_data_id_idx')]
 
     def __str__(self):
         return f'{self.data_ocorrencia:%d/%m/%Y %H:%M:%S} – {self.usuario}'
@@ -118,6 +120,7 @@ class NotificationLog(models.Model):
         verbose_name = 'Notification Log'
         verbose_name_plural = 'Logs de Notificações'
         ordering = ['-data_envio']
+        indexes = [models.Index(fields=['data_envio', 'id'], name='notificationlog_data_id_idx')]
 
     def __str__(self):
         return f'{self.data_envio:%d/%m/%Y %H:%M} → {self.destinatario} ({self.meio})'
@@ -134,8 +137,31 @@ class AccessLog(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [models.Index(fields=['timestamp', 'id'], name='accesslog_timestamp_id_idx')]
         verbose_name = 'Log de Acesso'
         verbose_name_plural = 'Logs de Acesso'
 
     def __str__(self):
         return f"{self.user.username} – {self.get_action_display()} em {self.timestamp:%d/%m/%Y %H:%M}"
+
+
+class ResumoDiario(models.Model):
+    """
+    Contagem, por dia, das linhas de log apagadas pela retenção (core/retencao.py).
+    `chave` junta os valores das colunas de agrupamento da política (ex.: 'EMAIL / FALHA').
+    """
+    tabela = models.CharField('Tabela', max_length=50)
+    dia = models.DateField('Dia')
+    chave = models.CharField('Chave', max_length=200, blank=True)
+    total = models.PositiveIntegerField('Total', default=0)
+
+    class Meta:
+        verbose_name = 'Resumo Diário'
+        verbose_name_plural = 'Resumos Diários'
+        ordering = ['-dia', 'tabela', 'chave']
+        constraints = [
+            models.UniqueConstraint(fields=['tabela', 'dia', 'chave'], name='resumo_diario_unico'),
+        ]
+
+    def __str__(self):
+        return f'{self.tabela} {self.dia:%d/%m/%Y} {self.chave}: {self.total}'
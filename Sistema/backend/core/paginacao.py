@@ -0,0 +1,179 @@
+# Sistema/backend/core/paginacao.py
+"""
+Paginação por chave (keyset / seek) para listas longas.
+
+Com OFFSET, a página N lê e descarta as N×20 linhas anteriores e cada página
+faz ainda um COUNT(*) da tabela inteira. Aqui a página seguinte começa depois
+da última linha mostrada: o cursor leva os valores das colunas de ordenação
+(uma data e o pk, que desempata) e a consulta é
+`WHERE (data, id) < (cursor) ORDER BY data DESC, id DESC LIMIT 21`, servida
+por um índice em (data, id) — a página 10 000 custa o mesmo que a primeira.
+
+Em troca não há salto para a página N, só Anterior/Próxima, e o total é
+aproximado: em PostgreSQL vem das estatísticas (pg_class.reltuples sem
+filtros, estimativa do EXPLAIN com filtros); nas outras bases é um COUNT.
+"""
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+
+PARAM_APOS = 'apos'
+PARAM_ANTES = 'antes'
+
+
+def _codificar(valores):
+    texto = json.dumps([None if v is None else str(v) for v in valores])
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+
+def _decodificar(cursor, campos):
+    """Valores Python das colunas de `campos` guardados no cursor, ou None se inválido."""
+    try:
+        texto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        valores = json.loads(texto)
+        if len(valores) != len(campos):
+            return None
+        return [campo.to_python(v) for campo, v in zip(campos, valores)]
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def _depois(ordem, valores):
+    """
+    Q das linhas que vêm depois de `valores` na ordenação `ordem`
+    ([(nome, descendente)]): (a < x) OR (a = x AND b < y) ...
+    """
+    condicao = Q()
+    iguais = {}
+    for (nome, descendente), valor in zip(ordem, valores):
+        condicao |= Q(**iguais, **{f'{nome}__{"lt" if descendente else "gt"}': valor})
+        iguais[nome] = valor
+    return condicao
+
+
+def contagem_aproximada(queryset):
+    """Número (aproximado em PostgreSQL) de linhas de `queryset`."""
+    conexao = connections[queryset.db]
+    if conexao.vendor != 'postgresql':
+        return queryset.count()
+    with conexao.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table]
+            )
+            linha = cursor.fetchone()
+            if linha and linha[0] >= 0:  # -1: tabela ainda sem ANALYZE
+                return linha[0]
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plano = cursor.fetchone()[0]
+        if isinstance(plano, str):
+            plano = json.loads(plano)
+        return int(plano[0]['Plan']['Plan Rows'])
+
+
+class PaginaKeyset:
+    """O que os templates precisam de uma página: objetos, vizinhas e total."""
+
+    def __init__(self, object_list, cursor_anterior, cursor_seguinte, parametros, total=None):
+        self.object_list = object_list
+        self.cursor_anterior = cursor_anterior
+        self.cursor_seguinte = cursor_seguinte
+        self.parametros = parametros
+        self.total = total
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_previous(self):
+        return self.cursor_anterior is not None
+
+    def has_next(self):
+        return self.cursor_seguinte is not None
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    def _query(self, nome, cursor):
+        parametros = self.parametros.copy()
+        parametros[nome] = cursor
+        return parametros.urlencode()
+
+    def query_anterior(self):
+        return self._query(PARAM_ANTES, self.cursor_anterior)
+
+    def query_seguinte(self):
+        return self._query(PARAM_APOS, self.cursor_seguinte)
+
+
+class KeysetPaginationMixin:
+    """
+    Para ListView: substitui ?page=N por ?apos=<cursor> / ?antes=<cursor>.
+
+    `ordering` tem de terminar numa coluna única (normalmente '-pk') e as
+    colunas não podem ser nulas; deve existir um índice com essas colunas.
+    Com `contagem_aproximada`, `page_obj.total` traz o total estimado.
+    """
+    paginate_by = 20
+    contagem_aproximada = True
+
+    def _ordem(self, queryset):
+        """[(campo, descendente)] da ordenação de `queryset`, acabada no pk para desempatar."""
+        ordem = []
+        for nome in queryset.query.order_by or queryset.model._meta.ordering:
+            descendente = nome.startswith('-')
+            nome = nome.lstrip('-')
+            ordem.append(('pk' if nome in ('pk', 'id') else nome, descendente))
+        if not ordem or ordem[-1][0] != 'pk':
+            ordem.append(('pk', ordem[-1][1] if ordem else True))
+        return ordem
+
+    def paginate_queryset(self, queryset, page_size):
+        ordem = self._ordem(queryset)
+        queryset = queryset.order_by(*[f'{"-" if d else ""}{n}' for n, d in ordem])
+        modelo = queryset.model._meta
+        campos = [modelo.pk if nome == 'pk' else modelo.get_field(nome) for nome, _ in ordem]
+        parametros = self.request.GET.copy()
+        parametros.pop('page', None)
+        apos, antes = parametros.pop(PARAM_APOS, [None])[-1], parametros.pop(PARAM_ANTES, [None])[-1]
+
+        total = contagem_aproximada(queryset) if self.contagem_aproximada else None
+        pagina = queryset
+        recuar = False
+        valores = _decodificar(antes, campos) if antes else None
+        if valores is not None:
+            recuar = True
+            inversa = [(nome, not descendente) for nome, descendente in ordem]
+            pagina = queryset.filter(_depois(inversa, valores)).order_by(
+                *[f'{"-" if d else ""}{n}' for n, d in inversa]
+            )
+        else:
+            valores = _decodificar(apos, campos) if apos else None
+            if valores is not None:
+                pagina = queryset.filter(_depois(ordem, valores))
+
+        linhas = list(pagina[:page_size + 1])
+        mais = len(linhas) > page_size
+        linhas = linhas[:page_size]
+        if recuar:
+            linhas.reverse()
+
+        def cursor(obj):
+            return _codificar([getattr(obj, nome) for nome, _ in ordem])
+
+        if recuar:
+            anterior = cursor(linhas[0]) if mais and linhas else None
+            seguinte = cursor(linhas[-1]) if linhas else None
+        else:
+            anterior = cursor(linhas[0]) if valores is not None and linhas else None
+            seguinte = cursor(linhas[-1]) if mais else None
+
+        pagina_obj = PaginaKeyset(linhas, anterior, seguinte, parametros, total)
+        return None, pagina_obj, linhas, pagina_obj.has_other_pages()
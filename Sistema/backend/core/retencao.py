@@ -0,0 +1,120 @@
+# Sistema/backend/core/retencao.py
+"""
+Retenção das tabelas de log.
+
+ErrorLog, AccessLog, NotificationLog e Atividade só crescem. Cada uma tem uma
+política: quantos dias as linhas ficam e por que colunas são contadas quando
+saem. As linhas mais antigas do que o limite são tratadas em lotes
+(por omissão 5000, das mais antigas para as mais recentes, pelo índice
+(data, id)): cada lote, numa transação curta, soma-se ao ResumoDiario
+(tabela, dia, chave) e é apagado. Os locks duram só um lote, e se o comando
+for interrompido o que ficou por fazer fica para a próxima execução, sem
+contar nada duas vezes.
+
+Os dias de cada tabela podem ser alterados em settings.RETENCAO_DIAS
+({'core.ErrorLog': 30, ...}; None desliga a tabela). Corre todos os dias por
+`manage.py aplicar_retencao`.
+"""
+
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ResumoDiario
+
+LOTE = 5000
+
+Politica = namedtuple('Politica', 'campo_data dimensoes dias')
+ResultadoRetencao = namedtuple('ResultadoRetencao', 'tabela limite apagadas lotes')
+
+POLITICAS = {
+    'core.ErrorLog': Politica('data_ocorrencia', ('url',), 90),
+    'core.AccessLog': Politica('timestamp', ('action',), 180),
+    'core.NotificationLog': Politica('data_envio', ('meio', 'status_envio'), 365),
+    'dashboard.Atividade': Politica('data', ('modulo',), 90),
+}
+
+
+def politicas():
+    """Políticas em vigor: as de POLITICAS com os dias de settings.RETENCAO_DIAS."""
+    dias = getattr(settings, 'RETENCAO_DIAS', {})
+    return {
+        tabela: politica._replace(dias=dias.get(tabela, politica.dias))
+        for tabela, politica in POLITICAS.items()
+    }
+
+
+def _chave(linha, dimensoes):
+    return ' / '.join(str(linha[d]) for d in dimensoes)[:200]
+
+
+def _resumir(tabela, modelo, politica, pks):
+    """Soma ao ResumoDiario as linhas `pks` de `modelo`, por dia e chave."""
+    linhas = (
+        modelo.objects.filter(pk__in=pks)
+        .annotate(dia=TruncDate(politica.campo_data))
+        .values('dia', *politica.dimensoes)
+        .annotate(total=Count('pk'))
+        .order_by()
+    )
+    contagens = defaultdict(int)
+    for linha in linhas:
+        contagens[(linha['dia'], _chave(linha, politica.dimensoes))] += linha['total']
+
+    existentes = {
+        (r.dia, r.chave): r
+        for r in ResumoDiario.objects.select_for_update().filter(
+            tabela=tabela,
+            dia__in={dia for dia, _ in contagens},
+            chave__in={chave for _, chave in contagens},
+        )
+    }
+    novos = []
+    for (dia, chave), total in contagens.items():
+        resumo = existentes.get((dia, chave))
+        if resumo:
+            resumo.total += total
+        else:
+            novos.append(ResumoDiario(tabela=tabela, dia=dia, chave=chave, total=total))
+    ResumoDiario.objects.bulk_update(existentes.values(), ['total'])
+    ResumoDiario.objects.bulk_create(novos)
+
+
+def aplicar(tabela, politica=None, lote=LOTE, max_lotes=None, agora=None, simular=False):
+    """
+    Resume e apaga as linhas de `tabela` ('core.ErrorLog') mais antigas do que
+    a política. Com `max_lotes` para ao fim desse número de lotes; com
+    `simular` só conta as linhas que sairiam.
+    """
+    politica = politica or politicas()[tabela]
+    limite = (agora or timezone.now()) - timedelta(days=politica.dias)
+    modelo = apps.get_model(tabela)
+    antigas = modelo.objects.filter(**{f'{politica.campo_data}__lt': limite})
+    if simular:
+        return ResultadoRetencao(tabela, limite, antigas.count(), 0)
+
+    apagadas = lotes = 0
+    while max_lotes is None or lotes < max_lotes:
+        pks = list(antigas.order_by(politica.campo_data, 'pk').values_list('pk', flat=True)[:lote])
+        if not pks:
+            break
+        with transaction.atomic():
+            _resumir(tabela, modelo, politica, pks)
+            apagadas += modelo.objects.filter(pk__in=pks).delete()[0]
+        lotes += 1
+    return ResultadoRetencao(tabela, limite, apagadas, lotes)
+
+
+def aplicar_todas(tabelas=None, **kwargs):
+    """aplicar() para cada tabela com política ativa (ou só as de `tabelas`)."""
+    return [
+        aplicar(tabela, politica, **kwargs)
+        for tabela, politica in politicas().items()
+        if politica.dias is not None and (not tabelas or tabela in tabelas)
+    ]
@@ -1,56 +1,64 @@
 # Sistema/backend/core/utils.py
 
 import smtplib
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from .models import NotificationLog, ConfiguracaoInicial
 import requests
 
-def send_email(to_email, subject, body):
+def send_email(to_email, subject, body, anexos=None):
     """
     Envia e-mail usando configurações de ConfiguracaoInicial.
+    `anexos`: lista opcional de (nome do ficheiro, bytes, subtipo MIME, ex. 'pdf').
     Registra em NotificationLog.
     """
     try:
         config = ConfiguracaoInicial.objects.get(pk=1)
     except ConfiguracaoInicial.DoesNotExist:
         NotificationLog.objects.create(
-            type='EMAIL',
-            to=to_email,
-            subject=subject,
-            body=body,
-            success=False,
-            error_message='Configuração de SMTP não encontrada.'
+            meio='EMAIL',
+            destinatario=to_email,
+            status_envio='FALHA',
+            mensagem=body,
+            detalhes='Configuração de SMTP não encontrada.'
         )
         return False
 
-    msg = MIMEText(body, 'plain', 'utf-8')
+    if anexos:
+        msg = MIMEMultipart()
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        for nome, conteudo, subtipo in anexos:
+            parte = MIMEApplication(conteudo, _subtype=subtipo)
+            parte.add_header('Content-Disposition', 'attachment', filename=nome)
+            msg.attach(parte)
+    else:
+        msg = MIMEText(body, 'plain', 'utf-8')
     msg['Subject'] = subject
     msg['From'] = config.smtp_user
     msg['To'] = to_email
 
     try:
         server = smtplib.SMTP(config.smtp_host, config.smtp_port, timeout=10)
-        if config.smtp_use_tls:
+        if config.smtp_port == 587:  # STARTTLS (não há campo próprio na configuração)
             server.starttls()
         server.login(config.smtp_user, config.smtp_password)
         server.sendmail(config.smtp_user, [to_email], msg.as_string())
         server.quit()
         NotificationLog.objects.create(
-            type='EMAIL',
-            to=to_email,
-            subject=subject,
-            body=body,
-            success=True
+            meio='EMAIL',
+            destinatario=to_email,
+            status_envio='SUCESSO',
+            mensagem=body
         )
         return True
     except Exception as e:
         NotificationLog.objects.create(
-            type='EMAIL',
-            to=to_email,
-            subject=subject,
-            body=body,
-            success=False,
-            error_message=str(e)
+            meio='EMAIL',
+            destinatario=to_email,
+            status_envio='FALHA',
+            mensagem=body,
+            detalhes=str(e)
         )
         return False
 
@@ -65,49 +73,45 @@ def send_whatsapp(phone_number, message):
         config = ConfiguracaoInicial.objects.get(pk=1)
     except ConfiguracaoInicial.DoesNotExist:
         NotificationLog.objects.create(
-            type='WHATSAPP',
-            to=phone_number,
-            subject=message[:50],
-            body=message,
-            success=False,
-            error_message='Configuração WhatsApp não encontrada.'
+            meio='WHATSAPP',
+            destinatario=phone_number,
+            status_envio='FALHA',
+            mensagem=message,
+            detalhes='Configuração WhatsApp não encontrada.'
         )
         return False
 
     payload = {
         'to': phone_number,
         'message': message,
-        'api_key': config.whatsapp_api_key
+        'api_key': config.whatsapp_api_token
     }
     try:
         resp = requests.post(config.whatsapp_api_url, json=payload, timeout=10)
         if resp.status_code == 200:
             NotificationLog.objects.create(
-                type='WHATSAPP',
-                to=phone_number,
-                subject=message[:50],
-                body=message,
-                success=True
+                meio='WHATSAPP',
+                destinatario=phone_number,
+                status_envio='SUCESSO',
+                mensagem=message
             )
             return True
         else:
             error_msg = f'API retornou {resp.status_code}: {resp.text}'
             NotificationLog.objects.create(
-                type='WHATSAPP',
-                to=phone_number,
-                subject=message[:50],
-                body=message,
-                success=False,
-                error_message=error_msg
+                meio='WHATSAPP',
+                destinatario=phone_number,
+                status_envio='FALHA',
+                mensagem=message,
+                detalhes=error_msg
             )
             return False
     except Exception as e:
         NotificationLog.objects.create(
-            type='WHATSAPP',
-            to=phone_number,
-            subject=message[:50],
-            body=message,
-            success=False,
-            error_message=str(e)
+            meio='WHATSAPP',
+            destinatario=phone_number,
+            status_envio='FALHA',
+            mensagem=message,
+            detalhes=str(e)
         )
         return False
@@ -8,6 +8,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from .models import AccessLog, ConfiguracaoInicial, BackupLog, ErrorLog, NotificationLog
 from .forms import ConfiguracaoInicialForm
+from .paginacao import KeysetPaginationMixin
 from .management.commands.backup_database import Command as BackupCommand
 from django.core.exceptions import PermissionDenied
 from accounts.decorators import role_required
@@ -84,21 +85,21 @@ def backup_list(request):
     return render(request, 'core/backup_list.html', {'logs': logs})
 
 @method_decorator(role_required('Admin'), name='dispatch')
-class ErrorLogListView(LoginRequiredMixin, ListView):
+class ErrorLogListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = ErrorLog
     template_name = 'core/errorlog_list.html'
     context_object_name = 'errors'
     paginate_by = 20
-    ordering = ['-data_ocorrencia']  # Campo correto: 'data_ocorrencia'
+    ordering = ['-data_ocorrencia', '-pk']  # Campo correto: 'data_ocorrencia'
 
 
 @method_decorator(role_required('Admin'), name='dispatch')
-class NotificationLogListView(LoginRequiredMixin, ListView):
+class NotificationLogListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = NotificationLog
     template_name = 'core/notificationlog_list.html'
     context_object_name = 'notifications'
     paginate_by = 20
-    ordering = ['-data_envio']
+    ordering = ['-data_envio', '-pk']
 
 
 # ------------------------------
@@ -112,7 +113,8 @@ def exercicio_list(request):
     anos = AnoLetivo.objects.all().order_by('-data_inicio')
     if request.method == 'POST':
         ano_id = request.POST.get('ano_id')
-        management.call_command('exercicio_switch', ano_id)
+        rematricula = request.POST.get('rematricula') or None
+        management.call_command('exercicio_switch', ano_id, rematricula=rematricula)
         messages.success(request, 'Fluxo de exercício trocado com sucesso.')
         return redirect('core:exercicio-list')
     return render(request, 'core/exercicio_list.html', {
@@ -125,7 +127,7 @@ def exercicio_list(request):
 # ------------------------------
 
 @method_decorator(role_required('Admin'), name='dispatch')
-class AccessLogListView(LoginRequiredMixin, ListView):
+class AccessLogListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = AccessLog
     template_name = 'core/accesslog_list.html'
     context_object_name = 'logs'
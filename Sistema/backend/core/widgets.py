@@ -0,0 +1,50 @@
+# Sistema/backend/core/widgets.py
+
+from urllib.parse import urlencode
+
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    <select> de um ModelChoiceField que só traz para o HTML a opção escolhida.
+
+    As restantes opções são pedidas ao endpoint JSON `url_name` à medida que
+    o utilizador escreve (static/js/autocomplete.js); o endpoint responde
+    {'resultados': [{'id': ..., 'texto': ...}]}. A validação continua a ser a
+    do campo (o queryset do ModelChoiceField), por isso `params` só servem
+    para o endpoint sugerir o mesmo subconjunto (ex.: {'status': 'ATIVO'}).
+    """
+
+    def __init__(self, url_name, params=None, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+        self.params = params or {}
+
+    def __deepcopy__(self, memo):
+        copia = super().__deepcopy__(memo)
+        copia.params = dict(self.params)
+        return copia
+
+    def get_context(self, name, value, attrs):
+        contexto = super().get_context(name, value, attrs)
+        url = reverse(self.url_name)
+        if self.params:
+            url = f'{url}?{urlencode(self.params)}'
+        contexto['widget']['attrs']['data-autocomplete-url'] = url
+        return contexto
+
+    def optgroups(self, name, value, attrs=None):
+        campo = getattr(self.choices, 'field', None)
+        if campo is None:
+            return super().optgroups(name, value, attrs)
+        escolhidos = [v for v in value if v not in (None, '')]
+        opcoes = [] if campo.empty_label is None else [('', campo.empty_label)]
+        if escolhidos:
+            opcoes += [(obj.pk, campo.label_from_instance(obj)) for obj in campo.queryset.filter(pk__in=escolhidos)]
+        todas, self.choices = self.choices, opcoes
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = todas
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='atividade',
+            index=models.Index(fields=['data', 'id'], name='atividade_data_id_idx'),
+        ),
+    ]
@@ -11,6 +11,7 @@ class Atividade(models.Model):
     
     class Meta:
         ordering = ['-data']
+        indexes = [models.Index(fields=['data', 'id'], name='atividade_data_id_idx')]
         verbose_name = 'Atividade'
         verbose_name_plural = 'Atividades'
     
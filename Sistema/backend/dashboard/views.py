@@ -5,9 +5,11 @@ from django.contrib.auth.decorators import login_required
 from accounts.decorators import role_required
 
 from administrativo.models import Colaborador, Salario, BemPatrimonio, LancamentoContabil
-from pedagogico.models import AnoLetivo, Turma, Matricula, Nota, PreRematricula, Calendario, Disciplina
+from administrativo import contabilidade, depreciacao, folha
+from pedagogico.models import AnoLetivo, Turma, Matricula, Nota, PreRematricula, RiscoAluno
+from pedagogico import analitica, calendario, risco
 from secretaria.models import Aluno, Fatura, PreMatricula
-from django.db.models import Sum, Count, Q, Avg
+from django.db.models import Sum, Count, Q
 from datetime import datetime, timedelta
 from django.utils import timezone
 import json
@@ -80,12 +82,8 @@ def admin_dashboard(request):
     ).count()
     
     # Salários pendentes (mês atual)
-    mes_referencia_atual = hoje.strftime('%Y-%m')
-    salarios_pendentes = Colaborador.objects.filter(
-        status='ATIVO'
-    ).exclude(
-        salarios__mes_referencia=mes_referencia_atual
-    ).count()
+    mes_referencia_atual = inicio_mes_atual.date()
+    salarios_pendentes = folha.resumo(mes_referencia_atual).pendentes
     
     # Receita mensal
     receita_mensal = Fatura.objects.filter(
@@ -136,9 +134,9 @@ def admin_dashboard(request):
         matriculas_data.append(total)
     
     # Dados para gráfico financeiro
-    despesas_mensal = Salario.objects.filter(
-        mes_referencia=mes_referencia_atual
-    ).aggregate(total=Sum('salario_liquido'))['total'] or 0
+    despesas_mensal = Salario.objects.do_mes(mes_referencia_atual).aggregate(
+        total=Sum('salario_liquido')
+    )['total'] or 0
     
     financeiro_data = [
         float(receita_mensal),
@@ -192,56 +190,28 @@ def diretor_dashboard(request):
         data_admissao__gte=inicio_mes
     ).count()
     
-    # 3. Salários pendentes (para o mês atual)
-    mes_referencia_atual = hoje.strftime('%Y-%m')
-    salarios_pendentes = Colaborador.objects.filter(
-        status='ATIVO'
-    ).exclude(
-        salarios__mes_referencia=mes_referencia_atual
-    ).count()
-    
-    # 4. Salários atrasados (meses anteriores)
-    mes_passado = (hoje.replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
-    salarios_atrasados = Colaborador.objects.filter(
-        status='ATIVO'
-    ).exclude(
-        salarios__mes_referencia=mes_passado
-    ).count()
+    # 3/4. Salários pendentes (mês atual) e atrasados (mês anterior)
+    folha_resumo = folha.resumo(inicio_mes.date())
+    mes_referencia_atual = folha_resumo.mes
+    salarios_pendentes = folha_resumo.pendentes
+    salarios_atrasados = folha_resumo.atrasados
     
-    # 5. Patrimônio total
-    patrimonio_total = BemPatrimonio.objects.aggregate(
-        total=Sum('valor_contabil_liquido')
-    )['total'] or 0
+    # 5. Patrimônio total (valores da última execução do comando depreciar)
+    patrimonio_total = depreciacao.patrimonio_liquido()
     total_bens = BemPatrimonio.objects.count()
     
-    # 6. Resultado financeiro mensal (simplificado)
-    receitas = LancamentoContabil.objects.filter(
-        data_lancamento__gte=inicio_mes,
-        conta_credito__tipo="RECEITA"
-    ).aggregate(Sum('valor'))['valor__sum'] or 0
-    
-    despesas = LancamentoContabil.objects.filter(
-        data_lancamento__gte=inicio_mes,
-        conta_debito__tipo="DESPESA"
-    ).aggregate(Sum('valor'))['valor__sum'] or 0
-    
-    resultado_mensal = receitas - despesas
+    # 6. Resultado financeiro mensal (DRE do mês, a partir dos saldos mensais)
+    resultado_mensal = contabilidade.dre(hoje.date(), hoje.date()).resultado
     
     # 7. Lista de salários pendentes com detalhes
-    lista_salarios_pendentes = []
-    for colab in Colaborador.objects.filter(status='ATIVO'):
-        if not Salario.objects.filter(colaborador=colab, mes_referencia=mes_referencia_atual).exists():
-            lista_salarios_pendentes.append({
-                'colaborador': colab,
-                'salario_liquido': colab.salario_base,
-                'esta_atrasado': False
-            })
-        elif not Salario.objects.filter(colaborador=colab, mes_referencia=mes_passado).exists():
-            lista_salarios_pendentes.append({
-                'colaborador': colab,
-                'salario_liquido': colab.salario_base,
-                'esta_atrasado': True
-            })
+    lista_salarios_pendentes = [
+        {
+            'colaborador': colab,
+            'salario_liquido': colab.salario_base,
+            'esta_atrasado': colab.atrasado,
+        }
+        for colab in folha.pendencias(mes_referencia_atual)
+    ]
     
     # 8. Dados para gráfico de departamentos
     departamentos = Colaborador.objects.filter(status='ATIVO').values(
@@ -255,24 +225,19 @@ def diretor_dashboard(request):
         'values': [d['total'] for d in departamentos]
     }
     
-    # 9. Dados para gráfico de folha de pagamento (últimos 6 meses)
-    meses = []
-    valores = []
-    for i in range(5, -1, -1):
-        mes_ref = (hoje - timedelta(days=30*i)).strftime('%Y-%m')
-        meses.append((hoje - timedelta(days=30*i)).strftime('%b/%Y'))
-        
-        total = Salario.objects.filter(
-            mes_referencia=mes_ref
-        ).aggregate(
-            total=Sum('salario_liquido')
-        )['total'] or 0
-        
-        valores.append(float(total))
+    # 9. Dados para gráfico de folha de pagamento (últimos 6 meses, uma consulta)
+    ultimos_meses = [mes_referencia_atual]
+    for _ in range(5):
+        ultimos_meses.insert(0, (ultimos_meses[0] - timedelta(days=1)).replace(day=1))
+    totais = dict(
+        Salario.objects.entre(ultimos_meses[0], mes_referencia_atual)
+        .order_by().values_list('data_referencia')
+        .annotate(total=Sum('salario_liquido'))
+    )
     
     folha_pagamento_data = {
-        'labels': meses,
-        'values': valores
+        'labels': [m.strftime('%b/%Y') for m in ultimos_meses],
+        'values': [float(totais.get(m) or 0) for m in ultimos_meses]
     }
     
     # 10. Últimos lançamentos contábeis
@@ -334,18 +299,9 @@ def pedagogico_dashboard(request):
     ).count()
     
     # 7. Taxa de aprovação (considerando notas com todas as avaliações preenchidas)
-    if ano_letivo:
-        aprovados = Nota.objects.filter(
-            ano_letivo=ano_letivo,
-            situacao='APROVADO'
-        ).count()
-        total_avaliados = Nota.objects.filter(
-            ano_letivo=ano_letivo,
-            nota1__gt=0,
-            nota2__gt=0,
-            nota3__gt=0
-        ).count()
-        taxa_aprovacao = (aprovados / total_avaliados * 100) if total_avaliados > 0 else 0
+    desempenho = analitica.analise(ano_letivo) if ano_letivo else None
+    if desempenho and desempenho.geral:
+        taxa_aprovacao = desempenho.geral['taxa_aprovacao'] or 0
     else:
         taxa_aprovacao = 0
     
@@ -379,23 +335,30 @@ def pedagogico_dashboard(request):
     
     # 10. Dados para gráfico de desempenho por disciplina
     desempenho_data = {'labels': [], 'values': []}
-    if ano_letivo:
-        disciplinas = Disciplina.objects.annotate(
-            media_geral=Avg('notas__media_parcial', filter=Q(notas__ano_letivo=ano_letivo))
-        ).order_by('nome')[:10]
-        
-        # Correção: converter Decimal para float
+    if desempenho:
+        disciplinas = desempenho.disciplinas[:10]
         desempenho_data = {
-            'labels': [d.nome for d in disciplinas],
-            'values': [float(d.media_geral) if d.media_geral is not None else 0.0 for d in disciplinas]
+            'labels': [d['nome'] for d in disciplinas],
+            'values': [d['media'] or 0.0 for d in disciplinas]
         }
     
     # 11. Próximos eventos acadêmicos (30 dias)
     data_inicio = timezone.now().date()
     data_fim = data_inicio + timedelta(days=30)
-    proximos_eventos = Calendario.objects.filter(
-        data__range=[data_inicio, data_fim]
-    ).order_by('data')[:5]
+    proximos_eventos = calendario.proximos_eventos(
+        ano_letivo, n=5, a_partir=data_inicio, ate=data_fim
+    ) if ano_letivo else []
+    
+    # 12. Alunos em risco (pontuações calculadas por `calcular_riscos`)
+    riscos = []
+    riscos_alto = riscos_medio = 0
+    if ano_letivo:
+        por_nivel = dict(
+            RiscoAluno.objects.filter(ano_letivo=ano_letivo)
+            .order_by().values_list('nivel').annotate(n=Count('id'))
+        )
+        riscos_alto, riscos_medio = por_nivel.get('ALTO', 0), por_nivel.get('MEDIO', 0)
+        riscos = risco.em_risco(ano_letivo)[:8]
     
     context = {
         'turmas_total': turmas_total,
@@ -409,6 +372,9 @@ def pedagogico_dashboard(request):
         'turmas_data': json.dumps(turmas_data),
         'desempenho_data': json.dumps(desempenho_data),
         'proximos_eventos': proximos_eventos,
+        'riscos': riscos,
+        'riscos_alto': riscos_alto,
+        'riscos_medio': riscos_medio,
     }
     
     return render(request, 'dashboard/pedagogico_dashboard.html', context)
@@ -427,26 +393,18 @@ def secretaria_dashboard(request):
         created_at__gte=inicio_mes
     ).count()
     
-    # 3. Faturas vencidas
-    faturas_vencidas = Fatura.objects.filter(
-        status='VENCIDO',
-    ).count()
-    
-    # 4. Valor total vencido
-    valor_vencido = Fatura.objects.filter(
-        status='VENCIDO'
-    ).aggregate(total=Sum('valor_atual'))['total'] or 0
-    
-    # 5. Faturas pendentes (não pagas e não vencidas)
-    faturas_pendentes = Fatura.objects.filter(
-        status='PENDENTE'
-    ).count()
-    
-    # 6. Valor total pendente
-    valor_pendente = Fatura.objects.filter(
-        status='PENDENTE'
-    ).aggregate(total=Sum('valor_atual'))['total'] or 0
-    
+    # 3–6. Faturas vencidas e pendentes (contagens e valores) num só aggregate
+    em_aberto = Fatura.objects.aggregate(
+        faturas_vencidas=Count('pk', filter=Q(status='VENCIDO')),
+        valor_vencido=Sum('valor_atual', filter=Q(status='VENCIDO')),
+        faturas_pendentes=Count('pk', filter=Q(status='PENDENTE')),
+        valor_pendente=Sum('valor_atual', filter=Q(status='PENDENTE')),
+    )
+    faturas_vencidas = em_aberto['faturas_vencidas']
+    valor_vencido = em_aberto['valor_vencido'] or 0
+    faturas_pendentes = em_aberto['faturas_pendentes']
+    valor_pendente = em_aberto['valor_pendente'] or 0
+
     # 7. Pré-matrículas pendentes
     pre_matriculas_pendentes = PreMatricula.objects.filter(
         status='PENDENTE'
@@ -457,9 +415,10 @@ def secretaria_dashboard(request):
         status='PENDENTE'
     ).count()
     
-    # 9. Lista de faturas vencidas (com dias de atraso)
+    # 9. Lista das faturas vencidas há mais tempo (com dias de atraso);
+    #    a visão completa por faixas está em secretaria:antiguidade-saldos
     faturas_vencidas_lista = []
-    for fatura in Fatura.objects.filter(status='VENCIDO').select_related('aluno')[:5]:
+    for fatura in Fatura.objects.filter(status='VENCIDO').select_related('aluno').order_by('data_vencimento')[:5]:
         dias_vencidos = (timezone.now().date() - fatura.data_vencimento).days
         faturas_vencidas_lista.append({
             'aluno': fatura.aluno,
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Turma, Disciplina, TurmaDisciplina, Matricula, Nota, Boletim, AnoLetivo, Calendario
+from .models import Turma, Disciplina, TurmaDisciplina, Matricula, Nota, Boletim, AnoLetivo, Calendario, Aula, IndisponibilidadeProfessor, Frequencia, RiscoAluno
 
 
 @admin.register(AnoLetivo)
@@ -17,7 +17,7 @@ class CalendarioAdmin(admin.ModelAdmin):
 
 @admin.register(Turma)
 class TurmaAdmin(admin.ModelAdmin):
-    list_display = ('nome', 'nivel', 'turno', 'professor_responsavel')
+    list_display = ('nome', 'nivel', 'turno', 'capacidade', 'professor_responsavel')
     list_filter = ('nivel', 'turno')
     search_fields = ('nome', 'professor_responsavel')
 
@@ -58,4 +58,31 @@ class BoletimAdmin(admin.ModelAdmin):
     list_filter = ('trimestre', 'turma__nivel')
     search_fields = ('turma__nome',)
     raw_id_fields = ('turma', 'gerado_por')
-    date_hierarchy = 'data_geracao'
\ No newline at end of file
+    date_hierarchy = 'data_geracao'
+
+@admin.register(Aula)
+class AulaAdmin(admin.ModelAdmin):
+    list_display = ('turma', 'dia_semana', 'tempo', 'turma_disciplina')
+    list_filter = ('dia_semana', 'turma__turno')
+    search_fields = ('turma__nome', 'turma_disciplina__disciplina__nome')
+
+@admin.register(IndisponibilidadeProfessor)
+class IndisponibilidadeProfessorAdmin(admin.ModelAdmin):
+    list_display = ('professor', 'dia_semana', 'turno', 'tempo')
+    list_filter = ('dia_semana', 'turno')
+    search_fields = ('professor',)
+
+@admin.register(Frequencia)
+class FrequenciaAdmin(admin.ModelAdmin):
+    list_display = ('aluno', 'turma_disciplina', 'total_aulas', 'total_faltas')
+    list_filter = ('ano_letivo', 'turma_disciplina__turma__turno')
+    search_fields = ('aluno__nome', 'aluno__matricula')
+    raw_id_fields = ('aluno', 'turma_disciplina')
+    exclude = ('dias', 'faltas')
+
+@admin.register(RiscoAluno)
+class RiscoAlunoAdmin(admin.ModelAdmin):
+    list_display = ('aluno', 'ano_letivo', 'pontuacao', 'nivel', 'calculado_em')
+    list_filter = ('ano_letivo', 'nivel')
+    search_fields = ('aluno__nome', 'aluno__matricula')
+    raw_id_fields = ('aluno',)
@@ -0,0 +1,200 @@
+# Sistema/backend/pedagogico/analitica.py
+"""
+Análise de desempenho académico por Ano Letivo.
+
+As notas do ano são lidas numa só consulta para um DataFrame e todas as
+estatísticas (distribuição, percentis, taxa de aprovação) são calculadas com
+groupby do pandas, por turma, disciplina, professor e turma × disciplina, junto
+com a lista de alunos em risco. O resultado fica em cache por ano letivo e é
+invalidado pelos sinais de Nota e TurmaDisciplina.
+
+Só entram nas estatísticas as notas avaliadas (N1, N2 e N3 lançadas); as
+restantes contam apenas como pendentes, tal como no painel pedagógico.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+
+from core.arquivo import modelo_arquivo
+from .models import AnoLetivo, Nota, TurmaDisciplina
+
+Analise = namedtuple(
+    'Analise', 'ano_id escala faixas geral turmas disciplinas professores turma_disciplina em_risco'
+)
+
+QUANTIS = [0.25, 0.5, 0.75, 0.9]
+N_FAIXAS = 10
+# aluno em risco: reprovado em alguma disciplina ou com média geral abaixo
+# deste percentil do ano
+PERCENTIL_RISCO = 0.1
+
+CACHE_TIMEOUT = 60 * 60
+
+
+def _chave(ano_id):
+    return f'pedagogico:analitica:{ano_id}'
+
+
+def _modelos(ano):
+    if ano.arquivado:
+        return modelo_arquivo(Nota), modelo_arquivo(TurmaDisciplina)
+    return Nota, TurmaDisciplina
+
+
+def _dataframe(ano):
+    nota_modelo, td_modelo = _modelos(ano)
+    colunas = [
+        'aluno_id', 'aluno__nome', 'aluno__matricula', 'turma_id', 'turma__nome',
+        'disciplina_id', 'disciplina__nome', 'disciplina__professor_responsavel',
+        'nota1', 'nota2', 'nota3', 'media_final', 'situacao',
+    ]
+    df = pd.DataFrame.from_records(
+        nota_modelo.objects.filter(ano_letivo=ano).order_by().values_list(*colunas),
+        columns=colunas,
+    )
+    # o professor da TurmaDisciplina prevalece sobre o da disciplina
+    professores = {
+        (t, d): (p or '').strip()
+        for t, d, p in td_modelo.objects.filter(ano_letivo=ano).values_list(
+            'turma_id', 'disciplina_id', 'professor_responsavel'
+        )
+    }
+    if df.empty:
+        return df
+    proprio = pd.Series(
+        [professores.get(k, '') for k in zip(df.turma_id, df.disciplina_id)], index=df.index
+    )
+    df['professor'] = proprio.where(
+        proprio != '', df.disciplina__professor_responsavel.fillna('').str.strip()
+    ).replace('', 'Sem professor')
+    for coluna in ('nota1', 'nota2', 'nota3', 'media_final'):
+        df[coluna] = pd.to_numeric(df[coluna], errors='coerce').astype(float)
+    df['avaliada'] = (df[['nota1', 'nota2', 'nota3']] > 0).all(axis=1) & df.media_final.notna()
+    df['aprovado'] = df.situacao == 'APROVADO'
+    df['turma_disciplina'] = df.turma__nome + ' – ' + df.disciplina__nome
+    return df
+
+
+def _escala(df):
+    """Notas de 0 a 20 ou de 0 a 100, conforme o máximo lançado."""
+    maximo = df.media_final.max() if not df.empty else 0
+    return 20 if maximo <= 20 else 100
+
+
+def _rotulos(faixas):
+    return [f'{a:g}–{b:g}' for a, b in zip(faixas[:-1], faixas[1:])]
+
+
+def _estatisticas(df, chave, nome, faixas):
+    """Uma linha (dict) por grupo de `chave`, ordenada por `nome`."""
+    todas = df.groupby(chave, sort=False)
+    base = todas.agg(nome=(nome, 'first'), total=('avaliada', 'size'), avaliadas=('avaliada', 'sum'))
+
+    av = df[df.avaliada]
+    g = av.groupby(chave, sort=False)
+    est = g.media_final.agg(media='mean', desvio='std', minimo='min', maximo='max')
+    est['aprovados'] = g.aprovado.sum()
+    if not av.empty:
+        quantis = g.media_final.quantile(QUANTIS).unstack()
+        quantis.columns = ['p25', 'mediana', 'p75', 'p90']
+        est = est.join(quantis)
+        dist = (
+            av.assign(faixa=pd.cut(av.media_final, faixas, labels=False, include_lowest=True))
+            .groupby([chave, 'faixa']).size()
+            .unstack(fill_value=0)
+            .reindex(columns=range(len(faixas) - 1), fill_value=0)
+        )
+    else:
+        dist = pd.DataFrame(columns=range(len(faixas) - 1))
+
+    rotulos = _rotulos(faixas)
+    contagens = {k: [int(x) for x in v] for k, v in zip(dist.index, dist.values)}
+    linhas = []
+    est = base.join(est).sort_values('nome')
+    for k, r in est.iterrows():
+        avaliadas = int(r.avaliadas)
+        linha = {
+            'chave': k,
+            'nome': r.nome,
+            'total': int(r.total),
+            'avaliadas': avaliadas,
+            'pendentes': int(r.total) - avaliadas,
+            'aprovados': int(r.aprovados) if avaliadas else 0,
+            'taxa_aprovacao': float(r.aprovados) / avaliadas * 100 if avaliadas else None,
+            'distribuicao': list(zip(rotulos, contagens.get(k, [0] * len(rotulos)))),
+        }
+        for campo in ('media', 'desvio', 'minimo', 'p25', 'mediana', 'p75', 'p90', 'maximo'):
+            valor = r.get(campo)
+            linha[campo] = None if valor is None or pd.isna(valor) else round(float(valor), 2)
+        linhas.append(linha)
+    return linhas
+
+
+def _em_risco(df):
+    av = df[df.avaliada]
+    if av.empty:
+        return []
+    por_aluno = av.groupby('aluno_id').agg(
+        nome=('aluno__nome', 'first'),
+        matricula=('aluno__matricula', 'first'),
+        turma=('turma__nome', 'first'),
+        media=('media_final', 'mean'),
+        disciplinas=('media_final', 'size'),
+        reprovacoes=('aprovado', lambda s: int((~s).sum())),
+    )
+    corte = por_aluno.media.quantile(PERCENTIL_RISCO)
+    risco = por_aluno[(por_aluno.reprovacoes > 0) | (por_aluno.media < corte)]
+    risco = risco.sort_values(['reprovacoes', 'media'], ascending=[False, True])
+    return [
+        {
+            'aluno_id': int(k),
+            'nome': r.nome,
+            'matricula': r.matricula,
+            'turma': r.turma,
+            'media': round(float(r.media), 2),
+            'disciplinas': int(r.disciplinas),
+            'reprovacoes': int(r.reprovacoes),
+        }
+        for k, r in risco.iterrows()
+    ]
+
+
+def _construir(ano):
+    df = _dataframe(ano)
+    if df.empty:
+        return Analise(ano.pk, 20, [], None, [], [], [], [], [])
+    escala = _escala(df)
+    faixas = np.linspace(0, escala, N_FAIXAS + 1)
+    df['geral'] = 0
+    df['nome_geral'] = str(ano)
+    geral = _estatisticas(df, 'geral', 'nome_geral', faixas)[0]
+    return Analise(
+        ano_id=ano.pk,
+        escala=escala,
+        faixas=_rotulos(faixas),
+        geral=geral,
+        turmas=_estatisticas(df, 'turma_id', 'turma__nome', faixas),
+        disciplinas=_estatisticas(df, 'disciplina_id', 'disciplina__nome', faixas),
+        professores=_estatisticas(df, 'professor', 'professor', faixas),
+        turma_disciplina=_estatisticas(df, 'turma_disciplina', 'turma_disciplina', faixas),
+        em_risco=_em_risco(df),
+    )
+
+
+def analise(ano):
+    """Análise do ano letivo (objeto ou pk), a partir da cache sempre que possível."""
+    ano_id = ano.pk if isinstance(ano, AnoLetivo) else ano
+    resultado = cache.get(_chave(ano_id))
+    if resultado is None:
+        if not isinstance(ano, AnoLetivo):
+            ano = AnoLetivo.objects.get(pk=ano_id)
+        resultado = _construir(ano)
+        cache.set(_chave(ano_id), resultado, CACHE_TIMEOUT)
+    return resultado
+
+
+def invalidar(ano_id):
+    cache.delete(_chave(ano_id))
@@ -0,0 +1,176 @@
+# Sistema/backend/pedagogico/calendario.py
+"""
+Serviço de calendário por Ano Letivo.
+
+Os eventos de cada ano letivo são lidos numa só consulta e guardados em cache
+como índices por data e por mês, junto com a lista ordenada dos dias letivos
+(dias úteis dentro do ano, sem feriados nem pausas). As operações de contagem
+de dias letivos usam pesquisa binária nessa lista, sem voltar à base de dados.
+O índice é invalidado pelos sinais de Calendario e AnoLetivo.
+"""
+
+import bisect
+import calendar
+from collections import defaultdict, namedtuple
+from datetime import date, timedelta
+
+from django.core.cache import cache
+
+from .models import AnoLetivo, Calendario
+
+Evento = namedtuple('Evento', 'pk data titulo tipo descricao')
+IndiceCalendario = namedtuple(
+    'IndiceCalendario', 'ano_id data_inicio data_fim por_data por_mes datas dias_letivos'
+)
+
+# com a cache local (por processo) padrão, limita o tempo que outro processo
+# pode servir um índice desatualizado; com Redis/Memcached a invalidação é imediata
+CACHE_TIMEOUT = 60 * 60
+
+
+def _chave(ano_id):
+    return f'pedagogico:calendario:{ano_id}'
+
+
+def _construir(ano):
+    por_data = defaultdict(list)
+    por_mes = defaultdict(list)
+    sem_aulas = set()
+    eventos = Calendario.objects.filter(ano_letivo=ano).order_by('data', 'titulo').values_list(
+        'pk', 'data', 'titulo', 'tipo', 'descricao'
+    )
+    for ev in map(Evento._make, eventos):
+        por_data[ev.data].append(ev)
+        por_mes[(ev.data.year, ev.data.month)].append(ev)
+        if ev.tipo in Calendario.TIPOS_SEM_AULAS:
+            sem_aulas.add(ev.data)
+
+    dias_letivos = []
+    dia = ano.data_inicio
+    while dia <= ano.data_fim:
+        if dia.weekday() < 5 and dia not in sem_aulas:
+            dias_letivos.append(dia.toordinal())
+        dia += timedelta(days=1)
+
+    return IndiceCalendario(ano.pk, ano.data_inicio, ano.data_fim,
+                            dict(por_data), dict(por_mes), sorted(por_data), dias_letivos)
+
+
+def indice(ano):
+    """Índice do ano letivo (objeto ou pk), a partir da cache sempre que possível."""
+    ano_id = ano.pk if isinstance(ano, AnoLetivo) else ano
+    idx = cache.get(_chave(ano_id))
+    if idx is None:
+        if not isinstance(ano, AnoLetivo):
+            ano = AnoLetivo.objects.get(pk=ano_id)
+        idx = _construir(ano)
+        cache.set(_chave(ano_id), idx, CACHE_TIMEOUT)
+    return idx
+
+
+def invalidar(ano_id):
+    cache.delete(_chave(ano_id))
+
+
+# --------------------------------
+# Consultas de eventos
+# --------------------------------
+
+def eventos_no_dia(ano, dia):
+    return indice(ano).por_data.get(dia, [])
+
+
+def eventos_do_mes(ano, ano_civil, mes):
+    return indice(ano).por_mes.get((ano_civil, mes), [])
+
+
+def meses(ano):
+    """Meses civis cobertos pelo ano letivo, como date(ano, mês, 1), por ordem."""
+    idx = indice(ano)
+    atual = idx.data_inicio.replace(day=1)
+    resultado = []
+    while atual <= idx.data_fim:
+        resultado.append(atual)
+        atual = (atual + timedelta(days=32)).replace(day=1)
+    return resultado
+
+
+def proximos_eventos(ano, n=5, a_partir=None, ate=None, incluir_feriados=True):
+    """Os próximos `n` eventos a partir de `a_partir` (hoje, por omissão), opcionalmente até `ate`."""
+    idx = indice(ano)
+    a_partir = a_partir or date.today()
+    resultado = []
+    for d in idx.datas[bisect.bisect_left(idx.datas, a_partir):]:
+        if ate is not None and d > ate:
+            break
+        for ev in idx.por_data[d]:
+            if incluir_feriados or ev.tipo not in Calendario.TIPOS_SEM_AULAS:
+                resultado.append(ev)
+                if len(resultado) == n:
+                    return resultado
+    return resultado
+
+
+# --------------------------------
+# Aritmética de dias letivos
+# --------------------------------
+
+def dias_letivos(ano):
+    """Lista ordenada dos dias letivos do ano."""
+    return [date.fromordinal(o) for o in indice(ano).dias_letivos]
+
+
+def e_dia_letivo(ano, dia):
+    return posicao_dia_letivo(ano, dia) is not None
+
+
+def posicao_dia_letivo(ano, dia):
+    """Posição (0, 1, 2...) de `dia` na lista de dias letivos, ou None se não for letivo."""
+    lista = indice(ano).dias_letivos
+    i = bisect.bisect_left(lista, dia.toordinal())
+    if i < len(lista) and lista[i] == dia.toordinal():
+        return i
+    return None
+
+
+def dias_letivos_entre(ano, inicio, fim):
+    """Número de dias letivos no intervalo fechado [inicio, fim]."""
+    lista = indice(ano).dias_letivos
+    return max(bisect.bisect_right(lista, fim.toordinal()) - bisect.bisect_left(lista, inicio.toordinal()), 0)
+
+
+def somar_dias_letivos(ano, dia, n):
+    """Data que fica `n` dias letivos depois de `dia` (None se sair do ano letivo)."""
+    lista = indice(ano).dias_letivos
+    i = bisect.bisect_right(lista, dia.toordinal()) + n - 1
+    if 0 <= i < len(lista):
+        return date.fromordinal(lista[i])
+    return None
+
+
+def trimestres(ano):
+    """
+    Os três trimestres do ano como [(inicio, fim)], repartindo os dias letivos
+    em três partes iguais.
+    """
+    lista = indice(ano).dias_letivos
+    if not lista:
+        return []
+    cortes = [round(k * len(lista) / 3) for k in range(4)]
+    return [
+        (date.fromordinal(lista[cortes[k]]), date.fromordinal(lista[cortes[k + 1] - 1]))
+        for k in range(3) if cortes[k] < cortes[k + 1]
+    ]
+
+
+def grelha_mes(ano, primeiro_dia):
+    """Semanas do mês (segunda a domingo) com (dia, no_mes, letivo, eventos) por célula."""
+    idx = indice(ano)
+    letivos = set(idx.dias_letivos)
+    semanas = []
+    for semana in calendar.Calendar().monthdatescalendar(primeiro_dia.year, primeiro_dia.month):
+        semanas.append([
+            (d, d.month == primeiro_dia.month, d.toordinal() in letivos, idx.por_data.get(d, []))
+            for d in semana
+        ])
+    return semanas
@@ -5,6 +5,7 @@ from django.forms import HiddenInput
 from django.core.exceptions import ValidationError
 from .models import PreRematricula, Turma, Disciplina, TurmaDisciplina, Matricula, Nota, AnoLetivo, Calendario, Curso
 from administrativo.models import Colaborador
+from core.widgets import AutocompleteSelect
 
 
 class TurmaForm(forms.ModelForm):
@@ -19,9 +20,10 @@ class TurmaForm(forms.ModelForm):
 
     class Meta:
         model = Turma
-        fields = ['nome', 'nivel', 'turno', 'professor_responsavel', 'curso', 'ano_letivo']
+        fields = ['nome', 'nivel', 'turno', 'capacidade', 'professor_responsavel', 'curso', 'ano_letivo']
         widgets = {
             'nome': forms.TextInput(attrs={'placeholder': 'Ex.: 10º Ano A'}),
+            'capacidade': forms.NumberInput(attrs={'min': 1}),
             'ano_letivo': HiddenInput(),
         }
 
@@ -58,10 +60,11 @@ class TurmaDisciplinaForm(forms.ModelForm):
 
     class Meta:
         model = TurmaDisciplina
-        fields = ['turma', 'disciplina', 'professor_responsavel', 'ano_letivo']
+        fields = ['turma', 'disciplina', 'professor_responsavel', 'aulas_semanais', 'ano_letivo']
         widgets = {
             'turma': forms.Select(),
             'disciplina': forms.Select(),
+            'aulas_semanais': forms.NumberInput(attrs={'min': 1}),
             'ano_letivo': HiddenInput(),
         }
 
@@ -93,6 +96,7 @@ class MatriculaForm(forms.ModelForm):
         model = Matricula
         fields = ['aluno', 'turma', 'data_matricula', 'status', 'ano_letivo']
         widgets = {
+            'aluno': AutocompleteSelect('secretaria:aluno-autocomplete'),
             'data_matricula': forms.DateInput(attrs={'type': 'date'}),
             'ano_letivo': HiddenInput(),
         }
@@ -141,8 +145,8 @@ class NotaForm(forms.ModelForm):
         model = Nota
         fields = ['aluno', 'turma', 'disciplina', 'nota1', 'nota2', 'nota3', 'ano_letivo']
         widgets = {
-            'aluno': forms.Select(),
-            'turma': forms.Select(),
+            'aluno': AutocompleteSelect('secretaria:aluno-autocomplete'),
+            'turma': AutocompleteSelect('pedagogico:turma-autocomplete'),
             'disciplina': forms.Select(),
             'nota1': forms.NumberInput(attrs={'step': '0.01', 'min': 0, 'max': 20}),
             'nota2': forms.NumberInput(attrs={'step': '0.01', 'min': 0, 'max': 20}),
@@ -203,9 +207,10 @@ class AnoLetivoForm(forms.ModelForm):
 class CalendarioForm(forms.ModelForm):
     class Meta:
         model = Calendario
-        fields = ['ano_letivo', 'titulo', 'data', 'descricao']
+        fields = ['ano_letivo', 'titulo', 'tipo', 'data', 'descricao']
         widgets = {
             'ano_letivo': forms.Select(),
+            'tipo': forms.Select(),
             'data': forms.DateInput(attrs={'type': 'date'}),
             'descricao': forms.Textarea(attrs={'rows': 2}),
         }
@@ -228,6 +233,7 @@ class PreRematriculaForm(forms.ModelForm):
         model = PreRematricula
         fields = ['aluno', 'turma_origem', 'curso_origem', 'ano_origem']
         widgets = {
+            'aluno': AutocompleteSelect('secretaria:aluno-autocomplete', {'status': 'ATIVO'}),
             'ano_origem': forms.HiddenInput(),
             'curso_origem': forms.HiddenInput(),
             'turma_origem': forms.HiddenInput(),
@@ -0,0 +1,176 @@
+# Sistema/backend/pedagogico/frequencia.py
+"""
+Registo de assiduidade (chamadas) e agregações de faltas.
+
+Cada Frequencia guarda, por aluno e TurmaDisciplina, os bitmaps dos dias com
+chamada e com falta (ver models.Frequencia). Uma chamada de turma inteira é
+uma leitura + um bulk_update; as taxas de faltas por aluno, turma ou disciplina
+são SUMs sobre os totais desnormalizados, e os recortes por trimestre aplicam
+máscaras de bits aos mesmos bitmaps.
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, FloatField, Sum, ExpressionWrapper
+from django.db.models.functions import NullIf
+from django.utils import timezone
+
+from . import calendario
+from .models import Frequencia, Matricula
+
+LinhaChamada = namedtuple('LinhaChamada', 'aluno presente registada')
+ResumoFaltas = namedtuple('ResumoFaltas', 'aluno_id total_aulas total_faltas taxa')
+
+
+def indice_do_dia(ano, dia):
+    """Bit correspondente a `dia` nos bitmaps de Frequencia."""
+    return (dia - ano.data_inicio).days
+
+
+def _alunos_da_turma(turma):
+    return [
+        m.aluno for m in
+        Matricula.objects.filter(turma=turma, status='ATIVO').select_related('aluno').order_by('aluno__nome')
+    ]
+
+
+def chamada_do_dia(turma_disciplina, dia):
+    """
+    Lista de LinhaChamada dos alunos ativos da turma para `dia` (presente por
+    omissão). Fora do ano letivo não há bit para `dia`: todos presentes e por registar.
+    """
+    ano = turma_disciplina.ano_letivo
+    if not ano.data_inicio <= dia <= ano.data_fim:
+        return [LinhaChamada(aluno, True, False) for aluno in _alunos_da_turma(turma_disciplina.turma)]
+    bit = 1 << indice_do_dia(ano, dia)
+    registos = {
+        f.aluno_id: f for f in
+        Frequencia.objects.filter(turma_disciplina=turma_disciplina).only('aluno_id', 'dias', 'faltas')
+    }
+    linhas = []
+    for aluno in _alunos_da_turma(turma_disciplina.turma):
+        f = registos.get(aluno.pk)
+        registada = bool(f and Frequencia.para_int(f.dias) & bit)
+        presente = not (registada and Frequencia.para_int(f.faltas) & bit)
+        linhas.append(LinhaChamada(aluno, presente, registada))
+    return linhas
+
+
+def registar_chamada(turma_disciplina, dia, ausentes):
+    """
+    Regista a chamada de toda a turma em `dia`: os alunos com matrícula ativa
+    cujo pk está em `ausentes` ficam com falta, os restantes presentes.
+    Corrigir uma chamada é simplesmente registá-la de novo.
+    Retorna (presentes, faltas).
+    """
+    ano = turma_disciplina.ano_letivo
+    if not calendario.e_dia_letivo(ano, dia):
+        raise ValueError(f"{dia:%d/%m/%Y} não é um dia letivo de {ano}.")
+    ausentes = set(ausentes)
+    indice = indice_do_dia(ano, dia)
+    alunos = _alunos_da_turma(turma_disciplina.turma)
+
+    with transaction.atomic():
+        existentes = {
+            f.aluno_id: f for f in
+            Frequencia.objects.select_for_update().filter(turma_disciplina=turma_disciplina)
+        }
+        novos = [
+            Frequencia(aluno=a, turma_disciplina=turma_disciplina, ano_letivo=ano)
+            for a in alunos if a.pk not in existentes
+        ]
+        for f in novos:
+            f.marcar(indice, f.aluno_id in ausentes)
+        agora = timezone.now()
+        for a in alunos:
+            if a.pk in existentes:
+                existentes[a.pk].marcar(indice, a.pk in ausentes)
+                existentes[a.pk].updated_at = agora   # bulk_update não aplica auto_now
+        Frequencia.objects.bulk_create(novos)
+        Frequencia.objects.bulk_update(
+            [existentes[a.pk] for a in alunos if a.pk in existentes],
+            ['dias', 'faltas', 'total_aulas', 'total_faltas', 'updated_at'],
+        )
+    faltas = sum(1 for a in alunos if a.pk in ausentes)
+    return len(alunos) - faltas, faltas
+
+
+# --------------------------------
+# Agregações
+# --------------------------------
+
+def _taxa():
+    return ExpressionWrapper(
+        F('faltas_soma') * 1.0 / NullIf(F('aulas_soma'), 0),
+        output_field=FloatField(),
+    )
+
+
+def taxas_de_faltas(queryset, *agrupar_por):
+    """
+    Agrega faltas/aulas de um queryset de Frequencia pelos campos dados
+    (ex.: 'aluno', 'turma_disciplina__turma', 'turma_disciplina__disciplina').
+    Uma só consulta; devolve dicts com aulas_soma, faltas_soma e taxa.
+    """
+    return (
+        queryset.values(*agrupar_por)
+        .annotate(aulas_soma=Sum('total_aulas'), faltas_soma=Sum('total_faltas'))
+        .annotate(taxa=_taxa())
+        .order_by(*agrupar_por)
+    )
+
+
+def resumo_turma(turma, trimestre=None):
+    """
+    ResumoFaltas por aluno da turma (todas as disciplinas). Com `trimestre`
+    (1 a 3), conta apenas os dias desse trimestre, aplicando a máscara do
+    período aos bitmaps.
+    """
+    qs = Frequencia.objects.filter(turma_disciplina__turma=turma)
+    if trimestre is None:
+        return [
+            ResumoFaltas(r['aluno'], r['aulas_soma'], r['faltas_soma'], r['taxa'] or 0)
+            for r in taxas_de_faltas(qs, 'aluno')
+        ]
+
+    ano = turma.ano_letivo
+    periodos = calendario.trimestres(ano)
+    if trimestre > len(periodos):
+        # menos de três dias letivos no calendário: o trimestre não existe
+        return []
+    inicio, fim = periodos[trimestre - 1]
+    primeiro, ultimo = indice_do_dia(ano, inicio), indice_do_dia(ano, fim)
+    mascara = ((1 << (ultimo - primeiro + 1)) - 1) << primeiro
+    totais = {}
+    for aluno_id, dias, faltas in qs.values_list('aluno_id', 'dias', 'faltas').iterator():
+        aulas, nfaltas = totais.get(aluno_id, (0, 0))
+        totais[aluno_id] = (
+            aulas + (Frequencia.para_int(dias) & mascara).bit_count(),
+            nfaltas + (Frequencia.para_int(faltas) & mascara).bit_count(),
+        )
+    return [
+        ResumoFaltas(aluno_id, aulas, nfaltas, nfaltas / aulas if aulas else 0)
+        for aluno_id, (aulas, nfaltas) in sorted(totais.items())
+    ]
+
+
+def alunos_com_excesso_de_faltas(ano, limite=0.25):
+    """Alunos do ano cuja taxa global de faltas ultrapassa `limite` (fração)."""
+    return [
+        r for r in taxas_de_faltas(Frequencia.objects.filter(ano_letivo=ano), 'aluno', 'aluno__nome')
+        if r['taxa'] is not None and r['taxa'] > limite
+    ]
+
+
+def dias_com_falta(frequencia):
+    """Datas em que o aluno faltou (para detalhe/justificação)."""
+    ano = frequencia.ano_letivo
+    faltas = Frequencia.para_int(frequencia.faltas)
+    dias = []
+    while faltas:
+        menor = faltas & -faltas
+        dias.append(ano.data_inicio + timedelta(days=menor.bit_length() - 1))
+        faltas ^= menor
+    return dias
@@ -0,0 +1,248 @@
+# Sistema/backend/pedagogico/horario.py
+"""
+Gerador de horários semanais.
+
+A grelha semanal é numerada como uma sequência de "slots" (turno × dia × tempo),
+e a ocupação de cada turma e de cada professor é guardada num inteiro usado como
+bitset: o bit `s` ligado significa "slot s ocupado". Assim, saber onde uma aula
+pode ser colocada é uma expressão de bits:
+
+    livres = permitido & ~ocupacao_turma & ~ocupacao_professor
+
+O resolvedor é uma heurística de construção com reparação: escolhe sempre a
+disciplina com menos slots livres por aula em falta (MRV) e, quando já não há
+slot livre, ejeta as aulas que bloqueiam o slot menos disputado e volta a
+colocá-las depois. Não depende do Django — `pedagogico.services.gerar_horario`
+faz a ponte com os modelos.
+"""
+
+import random
+import time
+from collections import defaultdict, namedtuple
+
+TURNOS = ['MANHÃ', 'TARDE', 'NOITE']
+DIAS_SEMANA = [
+    (1, 'Segunda-feira'),
+    (2, 'Terça-feira'),
+    (3, 'Quarta-feira'),
+    (4, 'Quinta-feira'),
+    (5, 'Sexta-feira'),
+]
+N_DIAS = len(DIAS_SEMANA)
+TEMPOS_POR_TURNO = 6
+SLOTS_POR_TURNO = N_DIAS * TEMPOS_POR_TURNO
+
+# chave: identificador da TurmaDisciplina; permitido: bitset dos slots aceitáveis
+Pedido = namedtuple('Pedido', 'chave turma professor aulas permitido')
+ResultadoHorario = namedtuple('ResultadoHorario', 'alocacao sem_horario iteracoes segundos')
+
+
+def slot(turno, dia, tempo):
+    """Índice do slot. `dia` e `tempo` começam em 1."""
+    return TURNOS.index(turno) * SLOTS_POR_TURNO + (dia - 1) * TEMPOS_POR_TURNO + (tempo - 1)
+
+
+def decompor(s):
+    """Inverso de `slot`: (turno, dia, tempo)."""
+    t, resto = divmod(s, SLOTS_POR_TURNO)
+    dia, tempo = divmod(resto, TEMPOS_POR_TURNO)
+    return TURNOS[t], dia + 1, tempo + 1
+
+
+def mascara_turno(turno):
+    inicio = TURNOS.index(turno) * SLOTS_POR_TURNO
+    return ((1 << SLOTS_POR_TURNO) - 1) << inicio
+
+
+def mascara_dia(turno, dia):
+    return ((1 << TEMPOS_POR_TURNO) - 1) << slot(turno, dia, 1)
+
+
+def bits(mascara):
+    """Itera os índices dos bits ligados, do menor para o maior."""
+    while mascara:
+        menor = mascara & -mascara
+        yield menor.bit_length() - 1
+        mascara ^= menor
+
+
+def resolver(pedidos, max_iteracoes=None, limite_segundos=30, max_reparos=200, semente=0):
+    """
+    Distribui `aulas` slots por pedido, sem sobrepor aulas da mesma turma nem do
+    mesmo professor e só dentro de `permitido`. Retorna ResultadoHorario com
+    alocacao {chave: [slots]} e sem_horario {chave: aulas que ficaram por colocar},
+    correspondente à melhor solução encontrada dentro dos limites. Um pedido que
+    precisa de mais de `max_reparos` reparações é dado como impossível.
+    """
+    inicio = time.perf_counter()
+    rnd = random.Random(semente)
+    pedidos = {p.chave: p for p in pedidos}
+    total = sum(p.aulas for p in pedidos.values())
+    max_iteracoes = max_iteracoes or 20 * total + 1000
+
+    ocup_turma = defaultdict(int)
+    ocup_prof = defaultdict(int)
+    dono_turma = {}   # (turma, slot) → chave
+    dono_prof = {}    # (professor, slot) → chave
+    alocacao = {chave: [] for chave in pedidos}
+    ejecoes = defaultdict(int)
+    reparos = defaultdict(int)
+    tabu = {}         # (chave, slot) → iteração até à qual não pode voltar ao slot
+    pendentes = {c: p.aulas for c, p in pedidos.items() if p.aulas and p.permitido}
+    impossiveis = {c: p.aulas for c, p in pedidos.items() if p.aulas and not p.permitido}
+
+    def livres(p):
+        return p.permitido & ~ocup_turma[p.turma] & ~(ocup_prof[p.professor] if p.professor else 0)
+
+    def colocar(p, s):
+        b = 1 << s
+        ocup_turma[p.turma] |= b
+        dono_turma[(p.turma, s)] = p.chave
+        if p.professor:
+            ocup_prof[p.professor] |= b
+            dono_prof[(p.professor, s)] = p.chave
+        alocacao[p.chave].append(s)
+        pendentes[p.chave] -= 1
+        if not pendentes[p.chave]:
+            del pendentes[p.chave]
+
+    def retirar(chave, s):
+        p = pedidos[chave]
+        b = ~(1 << s)
+        ocup_turma[p.turma] &= b
+        del dono_turma[(p.turma, s)]
+        if p.professor:
+            ocup_prof[p.professor] &= b
+            del dono_prof[(p.professor, s)]
+        alocacao[chave].remove(s)
+        pendentes[chave] = pendentes.get(chave, 0) + 1
+        ejecoes[chave] += 1
+
+    def custo_slot(p, s):
+        # prefere dias ainda sem aula desta disciplina, dias menos carregados
+        # da turma e os primeiros tempos (horários compactos)
+        turno, dia, tempo = decompor(s)
+        mesmo_dia = sum(1 for x in alocacao[p.chave] if decompor(x)[1] == dia)
+        carga_dia = (ocup_turma[p.turma] & mascara_dia(turno, dia)).bit_count()
+        return (mesmo_dia, carga_dia, tempo)
+
+    melhor_alocacao, melhor_pendentes = None, total + 1
+    iteracoes = 0
+    while pendentes and iteracoes < max_iteracoes:
+        iteracoes += 1
+        if iteracoes % 1000 == 0 and time.perf_counter() - inicio > limite_segundos:
+            break
+        # MRV: pedido com menos slots livres por aula em falta
+        chave = min(
+            pendentes,
+            key=lambda c: (livres(pedidos[c]).bit_count() / pendentes[c], pedidos[c].permitido.bit_count()),
+        )
+        p = pedidos[chave]
+        candidatos = livres(p)
+        if candidatos:
+            colocar(p, min(bits(candidatos), key=lambda s: custo_slot(p, s)))
+            continue
+
+        # Reparação. Antes de desfazer aulas, guarda a melhor solução até aqui.
+        em_falta = sum(pendentes.values()) + sum(impossiveis.values())
+        if em_falta < melhor_pendentes:
+            melhor_alocacao, melhor_pendentes = {c: list(x) for c, x in alocacao.items()}, em_falta
+        reparos[chave] += 1
+        if reparos[chave] > max_reparos:
+            # o pedido não cabe (ex.: professor com mais aulas do que slots livres)
+            impossiveis[chave] = pendentes.pop(chave)
+            continue
+
+        # Escolhe o slot permitido cujos ocupantes custam menos a ejetar
+        # (ocupantes muito ejetados pesam mais, para não entrar em ciclo)
+        melhor, melhor_custo = None, None
+        for s in bits(p.permitido & ~_proprios(alocacao[chave])):
+            if tabu.get((chave, s), 0) > iteracoes:
+                continue
+            conflitos = {dono_turma.get((p.turma, s))}
+            if p.professor:
+                conflitos.add(dono_prof.get((p.professor, s)))
+            conflitos.discard(None)
+            custo = sum(1 + ejecoes[c] for c in conflitos) + rnd.random()
+            if melhor_custo is None or custo < melhor_custo:
+                melhor, melhor_custo = (s, conflitos), custo
+        if melhor is None:
+            if not p.permitido & ~_proprios(alocacao[chave]):
+                # todos os slots permitidos já são deste pedido
+                impossiveis[chave] = pendentes.pop(chave)
+            continue
+        s, conflitos = melhor
+        for c in conflitos:
+            retirar(c, s)
+            tabu[(c, s)] = iteracoes + 10
+        colocar(p, s)
+
+    em_falta = sum(pendentes.values()) + sum(impossiveis.values())
+    if melhor_alocacao is not None and em_falta > melhor_pendentes:
+        alocacao = melhor_alocacao
+    sem_horario = {}
+    for c, p in pedidos.items():
+        falta = p.aulas - len(alocacao[c])
+        if falta:
+            sem_horario[c] = falta
+    return ResultadoHorario(
+        {c: sorted(s) for c, s in alocacao.items()},
+        sem_horario,
+        iteracoes,
+        time.perf_counter() - inicio,
+    )
+
+
+def _proprios(slots):
+    m = 0
+    for s in slots:
+        m |= 1 << s
+    return m
+
+
+def validar(pedidos, alocacao):
+    """Lista de violações (sobreposições ou slots não permitidos). Vazia se o horário é válido."""
+    erros = []
+    usados_turma, usados_prof = {}, {}
+    for p in pedidos:
+        for s in alocacao.get(p.chave, []):
+            if not p.permitido >> s & 1:
+                erros.append(f'{p.chave}: slot {decompor(s)} não permitido')
+            if (p.turma, s) in usados_turma:
+                erros.append(f'turma {p.turma}: slot {decompor(s)} duplicado')
+            usados_turma[(p.turma, s)] = p.chave
+            if p.professor:
+                if (p.professor, s) in usados_prof:
+                    erros.append(f'professor {p.professor}: slot {decompor(s)} duplicado')
+                usados_prof[(p.professor, s)] = p.chave
+    return erros
+
+
+def escola_sintetica(n_turmas=60, disciplinas=None, turmas_por_professor=5,
+                     indisponibilidade=0.1, semente=0):
+    """
+    Pedidos de uma escola fictícia para medir o resolvedor: `n_turmas` turmas
+    repartidas pelos três turnos, cada uma com as mesmas disciplinas, e cada
+    professor a lecionar uma disciplina em até `turmas_por_professor` turmas
+    (de turnos diferentes), com uma fração de slots indisponíveis.
+    """
+    rnd = random.Random(semente)
+    disciplinas = disciplinas or [4, 4, 4, 3, 3, 3, 3, 2, 2, 2]
+    todos = (1 << (len(TURNOS) * SLOTS_POR_TURNO)) - 1
+    pedidos = []
+    for d, aulas in enumerate(disciplinas):
+        turmas = list(range(n_turmas))
+        rnd.shuffle(turmas)
+        for inicio in range(0, n_turmas, turmas_por_professor):
+            professor = f'prof-{d}-{inicio // turmas_por_professor}'
+            bloqueados = sum(1 << s for s in range(todos.bit_length()) if rnd.random() < indisponibilidade)
+            for turma in turmas[inicio:inicio + turmas_por_professor]:
+                turno = TURNOS[turma % len(TURNOS)]
+                pedidos.append(Pedido(
+                    chave=(turma, d),
+                    turma=turma,
+                    professor=professor,
+                    aulas=aulas,
+                    permitido=mascara_turno(turno) & ~bloqueados,
+                ))
+    return pedidos
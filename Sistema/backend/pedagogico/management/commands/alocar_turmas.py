@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from pedagogico.models import AnoLetivo, Curso
+from pedagogico.services import alocar_prematriculas
+
+
+class Command(BaseCommand):
+    help = 'Aloca automaticamente as pré-matrículas pendentes nas turmas do ano letivo ativo, respeitando a capacidade.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--curso', action='append', help='Código do curso (pode repetir). Padrão: todos os cursos ativos.')
+        parser.add_argument('--turno', default=None, help='Restringe às turmas de um turno (MANHÃ, TARDE, NOITE).')
+        parser.add_argument('--nivel', default=None, help="Restringe às turmas de um nível (ex.: '10º Ano').")
+        parser.add_argument('--dry-run', action='store_true', help='Apenas simula a distribuição, sem gravar.')
+
+    def handle(self, *args, **options):
+        ano = AnoLetivo.objects.filter(ativo=True).first()
+        if not ano:
+            raise CommandError('Não há ano letivo ativo.')
+
+        cursos = Curso.objects.filter(ativo=True)
+        if options['curso']:
+            cursos = cursos.filter(codigo__in=options['curso'])
+
+        for curso in cursos:
+            resultado = alocar_prematriculas(
+                curso,
+                ano=ano,
+                turno=options['turno'],
+                nivel=options['nivel'],
+                commit=not options['dry_run'],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'{curso.codigo}: {len(resultado.alocadas)} alocada(s), '
+                f'{len(resultado.sem_vaga)} sem vaga, '
+                f'{len(resultado.ja_matriculados)} já matriculado(s).'
+            ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from pedagogico.models import AnoLetivo
+from pedagogico.risco import atualizar_riscos
+
+
+class Command(BaseCommand):
+    help = 'Recalcula a pontuação de risco dos alunos cujas notas, frequência, faturas ou status mudaram.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ano', type=int, default=None, help='Id do ano letivo. Padrão: o ano ativo.')
+        parser.add_argument('--completo', action='store_true', help='Recalcula todos os alunos, não só os alterados.')
+
+    def handle(self, *args, **options):
+        if options['ano']:
+            ano = AnoLetivo.objects.filter(pk=options['ano']).first()
+        else:
+            ano = AnoLetivo.objects.filter(ativo=True).first()
+        if not ano:
+            raise CommandError('Ano letivo não encontrado.')
+
+        resultado = atualizar_riscos(ano, completo=options['completo'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{ano}: {resultado.calculados} aluno(s) recalculado(s), {resultado.removidos} removido(s).'
+        ))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from pedagogico import horario
+from pedagogico.models import AnoLetivo, TurmaDisciplina
+from pedagogico.services import gerar_horario
+
+
+class Command(BaseCommand):
+    help = 'Gera o horário semanal das turmas do ano letivo ativo (ou mede o gerador numa escola sintética).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--turno', default=None, help='Gera apenas as turmas de um turno (MANHÃ, TARDE, NOITE).')
+        parser.add_argument('--limite', type=int, default=30, help='Tempo máximo de procura, em segundos. Padrão: 30')
+        parser.add_argument('--dry-run', action='store_true', help='Apenas calcula o horário, sem gravar.')
+        parser.add_argument('--benchmark', action='store_true',
+                            help='Não usa a base de dados: resolve uma escola sintética e mostra os tempos.')
+        parser.add_argument('--turmas', type=int, default=60, help='Número de turmas da escola sintética. Padrão: 60')
+
+    def handle(self, *args, **options):
+        if options['benchmark']:
+            return self.benchmark(options)
+
+        ano = AnoLetivo.objects.filter(ativo=True).first()
+        if not ano:
+            raise CommandError('Não há ano letivo ativo.')
+        resultado = gerar_horario(
+            ano,
+            turno=options['turno'],
+            commit=not options['dry_run'],
+            limite_segundos=options['limite'],
+        )
+        colocadas = sum(len(s) for s in resultado.alocacao.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'{colocadas} aula(s) colocada(s) em {resultado.segundos:.2f}s '
+            f'({resultado.iteracoes} iterações).'
+        ))
+        for td in TurmaDisciplina.objects.filter(pk__in=resultado.sem_horario).select_related('turma', 'disciplina'):
+            self.stdout.write(self.style.WARNING(
+                f'  Sem horário: {td} — faltam {resultado.sem_horario[td.pk]} aula(s).'
+            ))
+
+    def benchmark(self, options):
+        for semente in range(3):
+            pedidos = horario.escola_sintetica(options['turmas'], semente=semente)
+            resultado = horario.resolver(pedidos, limite_segundos=options['limite'], semente=semente)
+            erros = horario.validar(pedidos, resultado.alocacao)
+            total = sum(p.aulas for p in pedidos)
+            self.stdout.write(
+                f"{options['turmas']} turmas, {len(pedidos)} disciplinas-turma, {total} aulas: "
+                f'{resultado.segundos:.2f}s, {resultado.iteracoes} iterações, '
+                f'{sum(resultado.sem_horario.values())} sem horário, {len(erros)} conflito(s).'
+            )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from pedagogico.models import AnoLetivo
+from pedagogico.services import rematricula_em_lote
+
+
+class Command(BaseCommand):
+    help = 'Rematrícula em lote: promove/retém os alunos do ano de origem e os matricula (ou pré-rematricula) no ano de destino.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('ano_origem', type=int, help='ID do AnoLetivo que está a encerrar')
+        parser.add_argument('ano_destino', type=int, help='ID do AnoLetivo seguinte')
+        parser.add_argument(
+            '--modo',
+            choices=['MATRICULA', 'PRE_REMATRICULA'],
+            default='MATRICULA',
+            help='MATRICULA cria as matrículas diretamente; PRE_REMATRICULA gera pedidos pendentes.',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Simula a virada sem gravar nada.')
+
+    def handle(self, *args, **options):
+        try:
+            origem = AnoLetivo.objects.get(pk=options['ano_origem'])
+            destino = AnoLetivo.objects.get(pk=options['ano_destino'])
+        except AnoLetivo.DoesNotExist:
+            raise CommandError('Ano letivo não encontrado.')
+        if origem.pk == destino.pk:
+            raise CommandError('O ano de origem e o de destino devem ser diferentes.')
+
+        r = rematricula_em_lote(origem, destino, modo=options['modo'], commit=not options['dry_run'])
+
+        prefixo = '[simulação] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefixo}{origem.nome} → {destino.nome}: '
+            f'{r.turmas_clonadas} turma(s) e {r.disciplinas_clonadas} disciplina(s) clonadas; '
+            f'{r.promovidos} promovido(s), {r.retidos} retido(s), {r.formados} formado(s); '
+            f'{r.matriculas} matrícula(s) e {r.pre_rematriculas} pré-rematrícula(s) criadas '
+            f'({r.sem_avaliacao} sem notas, {r.sem_vaga} sem vaga).'
+        ))
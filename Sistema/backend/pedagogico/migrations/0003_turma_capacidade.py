@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedagogico', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='turma',
+            name='capacidade',
+            field=models.PositiveIntegerField(default=40, help_text='Número máximo de alunos com matrícula ativa na turma', verbose_name='Capacidade (vagas)'),
+        ),
+    ]
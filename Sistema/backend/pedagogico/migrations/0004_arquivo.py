@@ -0,0 +1,82 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedagogico', '0003_turma_capacidade'),
+        ('secretaria', '0002_arquivo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='anoletivo',
+            name='arquivado',
+            field=models.BooleanField(default=False, help_text='Notas, matrículas e faturas pagas deste ano estão nas tabelas de arquivo'),
+        ),
+        migrations.CreateModel(
+            name='MatriculaArquivo',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('data_matricula', models.DateField(verbose_name='Data de Matrícula')),
+                ('status', models.CharField(choices=[('ATIVO', 'ATIVO'), ('TRANSFERIDO', 'TRANSFERIDO'), ('DESLIGADO', 'DESLIGADO')], default='ATIVO', max_length=12, verbose_name='Status')),
+                ('created_at', models.DateTimeField(verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('aluno', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='secretaria.aluno', verbose_name='aluno')),
+                ('ano_letivo', models.ForeignKey(blank=True, db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.anoletivo', verbose_name='ano letivo')),
+                ('curso', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.curso', verbose_name='curso')),
+                ('turma', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.turma', verbose_name='turma')),
+            ],
+            options={
+                'verbose_name': 'Matrícula (arquivo)',
+                'verbose_name_plural': 'Matrículas (arquivo)',
+                'db_table': 'pedagogico_matricula_arquivo',
+                'ordering': [],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotaArquivo',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('nota1', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='N1')),
+                ('nota2', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='N2')),
+                ('nota3', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='N3')),
+                ('media_parcial', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='Média Parcial')),
+                ('media_final', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='Média Final')),
+                ('situacao', models.CharField(blank=True, choices=[('APROVADO', 'APROVADO'), ('REPROVADO', 'REPROVADO')], max_length=10, verbose_name='Situação')),
+                ('observacao', models.TextField(blank=True, verbose_name='Observação')),
+                ('created_at', models.DateTimeField(verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('aluno', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='secretaria.aluno', verbose_name='aluno')),
+                ('ano_letivo', models.ForeignKey(blank=True, db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.anoletivo', verbose_name='ano letivo')),
+                ('disciplina', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.disciplina', verbose_name='disciplina')),
+                ('turma', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.turma', verbose_name='turma')),
+            ],
+            options={
+                'verbose_name': 'Nota (arquivo)',
+                'verbose_name_plural': 'Notas (arquivo)',
+                'db_table': 'pedagogico_nota_arquivo',
+                'ordering': [],
+            },
+        ),
+        migrations.CreateModel(
+            name='TurmaDisciplinaArquivo',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('professor_responsavel', models.CharField(blank=True, help_text='Nome ou FK para Colaborador (futuro)', max_length=150, verbose_name='Professor Responsável')),
+                ('created_at', models.DateTimeField(verbose_name='Criado em')),
+                ('ano_letivo', models.ForeignKey(blank=True, db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.anoletivo', verbose_name='ano letivo')),
+                ('disciplina', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.disciplina', verbose_name='disciplina')),
+                ('turma', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.turma', verbose_name='turma')),
+            ],
+            options={
+                'verbose_name': 'Turma-Disciplina (arquivo)',
+                'verbose_name_plural': 'Turmas-Disciplinas (arquivo)',
+                'db_table': 'pedagogico_turmadisciplina_arquivo',
+                'ordering': [],
+            },
+        ),
+    ]
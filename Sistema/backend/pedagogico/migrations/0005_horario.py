@@ -0,0 +1,71 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedagogico', '0004_arquivo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndisponibilidadeProfessor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('professor', models.CharField(help_text='Mesmo nome usado em Professor Responsável', max_length=150, verbose_name='Professor')),
+                ('dia_semana', models.PositiveSmallIntegerField(choices=[(1, 'Segunda-feira'), (2, 'Terça-feira'), (3, 'Quarta-feira'), (4, 'Quinta-feira'), (5, 'Sexta-feira')], verbose_name='Dia da semana')),
+                ('turno', models.CharField(choices=[('MANHÃ', 'Manhã'), ('TARDE', 'Tarde'), ('NOITE', 'Noite')], max_length=10, verbose_name='Turno')),
+                ('tempo', models.PositiveSmallIntegerField(blank=True, help_text='Vazio = o turno inteiro', null=True, verbose_name='Tempo')),
+            ],
+            options={
+                'verbose_name': 'Indisponibilidade de Professor',
+                'verbose_name_plural': 'Indisponibilidades de Professores',
+                'ordering': ['professor', 'dia_semana', 'turno', 'tempo'],
+            },
+        ),
+        migrations.AddField(
+            model_name='turmadisciplina',
+            name='aulas_semanais',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Vazio = calculado a partir da carga horária da disciplina', null=True, verbose_name='Aulas por semana'),
+        ),
+        migrations.AddField(
+            model_name='turmadisciplinaarquivo',
+            name='aulas_semanais',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Vazio = calculado a partir da carga horária da disciplina', null=True, verbose_name='Aulas por semana'),
+        ),
+        migrations.CreateModel(
+            name='AulaArquivo',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('dia_semana', models.PositiveSmallIntegerField(choices=[(1, 'Segunda-feira'), (2, 'Terça-feira'), (3, 'Quarta-feira'), (4, 'Quinta-feira'), (5, 'Sexta-feira')], verbose_name='Dia da semana')),
+                ('tempo', models.PositiveSmallIntegerField(verbose_name='Tempo')),
+                ('turma', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.turma', verbose_name='turma')),
+                ('turma_disciplina', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.turmadisciplinaarquivo', verbose_name='turma disciplina')),
+            ],
+            options={
+                'verbose_name': 'Aula (arquivo)',
+                'verbose_name_plural': 'Aulas (arquivo)',
+                'db_table': 'pedagogico_aula_arquivo',
+                'ordering': ['turma', 'dia_semana', 'tempo'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Aula',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dia_semana', models.PositiveSmallIntegerField(choices=[(1, 'Segunda-feira'), (2, 'Terça-feira'), (3, 'Quarta-feira'), (4, 'Quinta-feira'), (5, 'Sexta-feira')], verbose_name='Dia da semana')),
+                ('tempo', models.PositiveSmallIntegerField(verbose_name='Tempo')),
+                ('turma', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aulas', to='pedagogico.turma')),
+                ('turma_disciplina', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aulas', to='pedagogico.turmadisciplina')),
+            ],
+            options={
+                'verbose_name': 'Aula',
+                'verbose_name_plural': 'Aulas',
+                'ordering': ['turma', 'dia_semana', 'tempo'],
+                'unique_together': {('turma', 'dia_semana', 'tempo')},
+            },
+        ),
+    ]
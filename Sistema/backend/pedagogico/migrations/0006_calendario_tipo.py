@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:33
+
+from django.db import migrations, models
+
+
+def marcar_feriados(apps, schema_editor):
+    # eventos já cadastrados cujo título indica feriado
+    Calendario = apps.get_model('pedagogico', 'Calendario')
+    Calendario.objects.filter(titulo__icontains='feriado').update(tipo='FERIADO')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedagogico', '0005_horario'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendario',
+            name='tipo',
+            field=models.CharField(choices=[('EVENTO', 'Evento'), ('FERIADO', 'Feriado'), ('PAUSA', 'Pausa letiva (sem aulas)'), ('PROVA', 'Provas / Exames'), ('PRAZO', 'Prazo')], default='EVENTO', help_text='Feriados e pausas letivas não contam como dias letivos', max_length=10),
+        ),
+        migrations.RunPython(marcar_feriados, migrations.RunPython.noop),
+    ]
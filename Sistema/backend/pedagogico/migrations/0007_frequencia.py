@@ -0,0 +1,54 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedagogico', '0006_calendario_tipo'),
+        ('secretaria', '0002_arquivo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FrequenciaArquivo',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('dias', models.BinaryField(default=b'', verbose_name='Dias com chamada')),
+                ('faltas', models.BinaryField(default=b'', verbose_name='Dias com falta')),
+                ('total_aulas', models.PositiveIntegerField(default=0, verbose_name='Aulas registadas')),
+                ('total_faltas', models.PositiveIntegerField(default=0, verbose_name='Faltas')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('aluno', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='secretaria.aluno', verbose_name='aluno')),
+                ('ano_letivo', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.anoletivo', verbose_name='ano letivo')),
+                ('turma_disciplina', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='pedagogico.turmadisciplinaarquivo', verbose_name='turma disciplina')),
+            ],
+            options={
+                'verbose_name': 'Frequência (arquivo)',
+                'verbose_name_plural': 'Frequências (arquivo)',
+                'db_table': 'pedagogico_frequencia_arquivo',
+                'ordering': [],
+            },
+        ),
+        migrations.CreateModel(
+            name='Frequencia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dias', models.BinaryField(default=b'', verbose_name='Dias com chamada')),
+                ('faltas', models.BinaryField(default=b'', verbose_name='Dias com falta')),
+                ('total_aulas', models.PositiveIntegerField(default=0, verbose_name='Aulas registadas')),
+                ('total_faltas', models.PositiveIntegerField(default=0, verbose_name='Faltas')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('aluno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='frequencias', to='secretaria.aluno')),
+                ('ano_letivo', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='frequencias', to='pedagogico.anoletivo')),
+                ('turma_disciplina', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='frequencias', to='pedagogico.turmadisciplina')),
+            ],
+            options={
+                'verbose_name': 'Frequência',
+                'verbose_name_plural': 'Frequências',
+                'unique_together': {('aluno', 'turma_disciplina')},
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedagogico', '0007_frequencia'),
+        ('secretaria', '0002_arquivo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiscoAluno',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pontuacao', models.FloatField(default=0, verbose_name='Pontuação')),
+                ('nivel', models.CharField(choices=[('BAIXO', 'Baixo'), ('MEDIO', 'Médio'), ('ALTO', 'Alto')], default='BAIXO', max_length=5, verbose_name='Nível')),
+                ('academico', models.FloatField(default=0, verbose_name='Componente académico')),
+                ('assiduidade', models.FloatField(default=0, verbose_name='Componente de assiduidade')),
+                ('financeiro', models.FloatField(default=0, verbose_name='Componente financeiro')),
+                ('situacao', models.FloatField(default=0, verbose_name='Componente de situação')),
+                ('media', models.FloatField(blank=True, null=True, verbose_name='Média')),
+                ('reprovacoes', models.PositiveIntegerField(default=0, verbose_name='Reprovações')),
+                ('taxa_faltas', models.FloatField(default=0, verbose_name='Taxa de faltas')),
+                ('faturas_atraso', models.PositiveIntegerField(default=0, verbose_name='Faturas em atraso')),
+                ('dias_atraso', models.PositiveIntegerField(default=0, verbose_name='Dias de atraso')),
+                ('calculado_em', models.DateTimeField(verbose_name='Calculado em')),
+                ('aluno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='riscos', to='secretaria.aluno')),
+                ('ano_letivo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='riscos', to='pedagogico.anoletivo')),
+            ],
+            options={
+                'verbose_name': 'Risco do Aluno',
+                'verbose_name_plural': 'Riscos dos Alunos',
+                'ordering': ['-pontuacao'],
+                'indexes': [models.Index(fields=['ano_letivo', '-pontuacao'], name='risco_ano_pontuacao_idx'), models.Index(fields=['ano_letivo', 'nivel'], name='risco_ano_nivel_idx')],
+                'unique_together': {('aluno', 'ano_letivo')},
+            },
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
 from django.forms import ValidationError
 from accounts.models import User
+from core.arquivo import criar_modelo_arquivo
 from secretaria.models import Aluno
+from .horario import DIAS_SEMANA, mascara_dia, slot
 
 
 class AnoLetivo(models.Model):
@@ -23,6 +25,10 @@ class AnoLetivo(models.Model):
         default=False,
         help_text="Marcar apenas um ano como ativo"
     )
+    arquivado = models.BooleanField(
+        default=False,
+        help_text="Notas, matrículas e faturas pagas deste ano estão nas tabelas de arquivo"
+    )
 
     class Meta:
         ordering = ['-data_inicio']
@@ -59,9 +65,25 @@ class Calendario(models.Model):
     """
     Eventos acadêmicos (feriados, início de período, encerramento, etc.) para cada Ano Letivo.
     """
+    TIPO_CHOICES = [
+        ('EVENTO', 'Evento'),
+        ('FERIADO', 'Feriado'),
+        ('PAUSA', 'Pausa letiva (sem aulas)'),
+        ('PROVA', 'Provas / Exames'),
+        ('PRAZO', 'Prazo'),
+    ]
+    # tipos que tornam o dia não letivo
+    TIPOS_SEM_AULAS = ('FERIADO', 'PAUSA')
+
     ano_letivo = models.ForeignKey(AnoLetivo, on_delete=models.CASCADE, related_name='eventos')
     titulo = models.CharField(max_length=100)
     data = models.DateField()
+    tipo = models.CharField(
+        max_length=10,
+        choices=TIPO_CHOICES,
+        default='EVENTO',
+        help_text="Feriados e pausas letivas não contam como dias letivos"
+    )
     descricao = models.TextField(blank=True)
 
     class Meta:
@@ -113,6 +135,11 @@ class Turma(models.Model):
     nome = models.CharField('Nome da Turma', max_length=50, unique=True)
     nivel = models.CharField('Ano/Nível', max_length=20, choices=NIVEIS_CHOICES)
     turno = models.CharField('Turno', max_length=10, choices=TURNO_CHOICES)
+    capacidade = models.PositiveIntegerField(
+        'Capacidade (vagas)',
+        default=40,
+        help_text='Número máximo de alunos com matrícula ativa na turma'
+    )
     professor_responsavel = models.CharField(
         'Professor Responsável',
         max_length=150,
@@ -185,6 +212,12 @@ class TurmaDisciplina(models.Model):
         blank=True,
         help_text='Nome ou FK para Colaborador (futuro)',
     )
+    aulas_semanais = models.PositiveSmallIntegerField(
+        'Aulas por semana',
+        null=True,
+        blank=True,
+        help_text='Vazio = calculado a partir da carga horária da disciplina'
+    )
     ano_letivo = models.ForeignKey(
         AnoLetivo,
         on_delete=models.PROTECT,
@@ -406,3 +439,164 @@ class PreRematricula(models.Model):
 
     def __str__(self):
         return f"{self.aluno} ({self.turma_origem}) → {self.status}"
+
+
+class Aula(models.Model):
+    """
+    Um tempo letivo no horário semanal de uma turma (gerado por pedagogico.horario).
+    """
+    DIAS_SEMANA = DIAS_SEMANA
+
+    turma = models.ForeignKey(Turma, on_delete=models.CASCADE, related_name='aulas')
+    turma_disciplina = models.ForeignKey(
+        TurmaDisciplina,
+        on_delete=models.CASCADE,
+        related_name='aulas'
+    )
+    dia_semana = models.PositiveSmallIntegerField('Dia da semana', choices=DIAS_SEMANA)
+    tempo = models.PositiveSmallIntegerField('Tempo')
+
+    class Meta:
+        verbose_name = 'Aula'
+        verbose_name_plural = 'Aulas'
+        ordering = ['turma', 'dia_semana', 'tempo']
+        unique_together = [['turma', 'dia_semana', 'tempo']]
+
+    def __str__(self):
+        return f'{self.turma.nome} | {self.get_dia_semana_display()} {self.tempo}º tempo'
+
+
+class IndisponibilidadeProfessor(models.Model):
+    """
+    Tempos em que um professor não pode dar aulas; respeitado pelo gerador de horários.
+    """
+    professor = models.CharField(
+        'Professor',
+        max_length=150,
+        help_text='Mesmo nome usado em Professor Responsável'
+    )
+    dia_semana = models.PositiveSmallIntegerField('Dia da semana', choices=DIAS_SEMANA)
+    turno = models.CharField('Turno', max_length=10, choices=Turma.TURNO_CHOICES)
+    tempo = models.PositiveSmallIntegerField(
+        'Tempo',
+        null=True,
+        blank=True,
+        help_text='Vazio = o turno inteiro'
+    )
+
+    class Meta:
+        verbose_name = 'Indisponibilidade de Professor'
+        verbose_name_plural = 'Indisponibilidades de Professores'
+        ordering = ['professor', 'dia_semana', 'turno', 'tempo']
+
+    def __str__(self):
+        quando = f'{self.tempo}º tempo' if self.tempo else 'turno inteiro'
+        return f'{self.professor} | {self.get_dia_semana_display()} {self.turno} ({quando})'
+
+    def mascara(self):
+        """Bitset dos slots bloqueados (ver pedagogico.horario)."""
+        if self.tempo:
+            return 1 << slot(self.turno, self.dia_semana, self.tempo)
+        return mascara_dia(self.turno, self.dia_semana)
+
+
+class Frequencia(models.Model):
+    """
+    Assiduidade de um aluno numa TurmaDisciplina ao longo do ano letivo.
+    Em vez de uma linha por aula, guarda dois bitmaps indexados pelo dia do ano
+    letivo (bit n = data_inicio + n dias): `dias` (chamada registada) e `faltas`.
+    Os totais ficam desnormalizados para agregações em SQL.
+    """
+    aluno = models.ForeignKey(Aluno, on_delete=models.CASCADE, related_name='frequencias')
+    turma_disciplina = models.ForeignKey(
+        TurmaDisciplina,
+        on_delete=models.CASCADE,
+        related_name='frequencias'
+    )
+    ano_letivo = models.ForeignKey(AnoLetivo, on_delete=models.PROTECT, related_name='frequencias')
+    dias = models.BinaryField('Dias com chamada', default=b'')
+    faltas = models.BinaryField('Dias com falta', default=b'')
+    total_aulas = models.PositiveIntegerField('Aulas registadas', default=0)
+    total_faltas = models.PositiveIntegerField('Faltas', default=0)
+    updated_at = models.DateTimeField('Atualizado em', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Frequência'
+        verbose_name_plural = 'Frequências'
+        unique_together = [['aluno', 'turma_disciplina']]
+
+    def __str__(self):
+        return f'{self.aluno.matricula} | {self.turma_disciplina} | {self.total_faltas}/{self.total_aulas} faltas'
+
+    @staticmethod
+    def para_int(valor):
+        return int.from_bytes(bytes(valor or b''), 'little')
+
+    @staticmethod
+    def para_bytes(bits):
+        return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+    def marcar(self, indice, falta):
+        """Regista a chamada do dia `indice` (dias desde o início do ano letivo)."""
+        dias = self.para_int(self.dias) | (1 << indice)
+        faltas = self.para_int(self.faltas)
+        faltas = faltas | (1 << indice) if falta else faltas & ~(1 << indice)
+        self.dias, self.faltas = self.para_bytes(dias), self.para_bytes(faltas)
+        self.total_aulas, self.total_faltas = dias.bit_count(), faltas.bit_count()
+
+    @property
+    def taxa_faltas(self):
+        return self.total_faltas / self.total_aulas if self.total_aulas else 0
+
+
+
+class RiscoAluno(models.Model):
+    """
+    Pontuação de risco de abandono/insucesso de um aluno num ano letivo,
+    calculada em lote por `pedagogico.risco` a partir das notas, da assiduidade,
+    das faturas em atraso e do status do aluno. Os componentes (0 a 1) ficam
+    guardados para explicar a pontuação.
+    """
+    NIVEL_CHOICES = [
+        ('BAIXO', 'Baixo'),
+        ('MEDIO', 'Médio'),
+        ('ALTO', 'Alto'),
+    ]
+
+    aluno = models.ForeignKey(Aluno, on_delete=models.CASCADE, related_name='riscos')
+    ano_letivo = models.ForeignKey(AnoLetivo, on_delete=models.CASCADE, related_name='riscos')
+    pontuacao = models.FloatField('Pontuação', default=0)
+    nivel = models.CharField('Nível', max_length=5, choices=NIVEL_CHOICES, default='BAIXO')
+    academico = models.FloatField('Componente académico', default=0)
+    assiduidade = models.FloatField('Componente de assiduidade', default=0)
+    financeiro = models.FloatField('Componente financeiro', default=0)
+    situacao = models.FloatField('Componente de situação', default=0)
+    media = models.FloatField('Média', null=True, blank=True)
+    reprovacoes = models.PositiveIntegerField('Reprovações', default=0)
+    taxa_faltas = models.FloatField('Taxa de faltas', default=0)
+    faturas_atraso = models.PositiveIntegerField('Faturas em atraso', default=0)
+    dias_atraso = models.PositiveIntegerField('Dias de atraso', default=0)
+    calculado_em = models.DateTimeField('Calculado em')
+
+    class Meta:
+        verbose_name = 'Risco do Aluno'
+        verbose_name_plural = 'Riscos dos Alunos'
+        unique_together = [['aluno', 'ano_letivo']]
+        ordering = ['-pontuacao']
+        indexes = [
+            models.Index(fields=['ano_letivo', '-pontuacao'], name='risco_ano_pontuacao_idx'),
+            models.Index(fields=['ano_letivo', 'nivel'], name='risco_ano_nivel_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.aluno.matricula} | {self.ano_letivo} | {self.pontuacao:.0f} ({self.nivel})'
+
+
+# --------------------------------
+# Tabelas de arquivo dos anos letivos encerrados (ver core/arquivo.py)
+# --------------------------------
+MatriculaArquivo = criar_modelo_arquivo(Matricula)
+NotaArquivo = criar_modelo_arquivo(Nota)
+TurmaDisciplinaArquivo = criar_modelo_arquivo(TurmaDisciplina)
+AulaArquivo = criar_modelo_arquivo(Aula, alvos={TurmaDisciplina: TurmaDisciplinaArquivo})
+FrequenciaArquivo = criar_modelo_arquivo(Frequencia, alvos={TurmaDisciplina: TurmaDisciplinaArquivo})
@@ -0,0 +1,251 @@
+# Sistema/backend/pedagogico/risco.py
+"""
+Alerta precoce: pontuação de risco por aluno.
+
+Os dados vêm de quatro consultas agregadas por aluno (notas, frequência,
+faturas em atraso e status), alinhadas em vetores NumPy pela posição do aluno
+numa lista ordenada de ids. Cada componente é normalizado entre 0 e 1 e a
+pontuação final (0–100) é a soma ponderada, calculada de uma vez para todos
+os alunos. O resultado é gravado em RiscoAluno com um único upsert.
+
+O recálculo incremental (`atualizar_riscos`) só volta a pontuar os alunos cujas
+entradas mudaram desde o último cálculo, detetados pelos `updated_at` de Nota,
+Frequencia, ContaCorrente e Aluno, mais os que têm faturas a vencer entretanto.
+Notas apagadas não deixam rasto: o recálculo completo (`--completo`) cobre-as.
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min, Q, Sum
+from django.utils import timezone
+
+from secretaria.models import Aluno, ContaCorrente, Fatura
+from .models import AnoLetivo, Frequencia, Nota, RiscoAluno
+
+# alunos ainda ligados à escola; os restantes saem do quadro de risco
+STATUS_PONTUADOS = ['ATIVO', 'SUSPENSO', 'TRANCADO']
+PESO_STATUS = {'ATIVO': 0.0, 'SUSPENSO': 0.5, 'TRANCADO': 1.0}
+
+PESOS = {'academico': 0.4, 'assiduidade': 0.25, 'financeiro': 0.25, 'situacao': 0.1}
+# média abaixo desta fração da escala conta como défice académico
+LIMIAR_MEDIA = 0.6
+# taxa de faltas a partir da qual a assiduidade pesa por inteiro
+FALTAS_MAXIMAS = 0.25
+DIAS_ATRASO_MAXIMOS = 90
+FATURAS_ATRASO_MAXIMAS = 3
+# limites inferiores de pontuação de cada nível
+NIVEIS = [(60, 'ALTO'), (30, 'MEDIO'), (0, 'BAIXO')]
+
+ResultadoRisco = namedtuple('ResultadoRisco', 'calculados removidos')
+
+
+def _posicoes(ids, linhas):
+    """
+    Posições em `ids` (ordenado) dos alunos em `linhas` e o resto das linhas
+    como array; linhas de alunos fora de `ids` são descartadas.
+    """
+    if not linhas:
+        return np.empty(0, dtype=np.int64), np.empty((0, 0))
+    dados = np.array(linhas, dtype=float)
+    alunos = dados[:, 0].astype(np.int64)
+    pos = np.minimum(np.searchsorted(ids, alunos), len(ids) - 1)
+    conhecidos = ids[pos] == alunos
+    return pos[conhecidos], dados[conhecidos, 1:]
+
+
+def _entradas(ano, ids, hoje, todos=False):
+    """Vetores de entrada por aluno, na ordem de `ids`."""
+    n = len(ids)
+    # no cálculo completo não vale a pena mandar a lista de ids para o SQL
+    filtro = {} if todos else {'aluno_id__in': ids.tolist()}
+
+    media = np.full(n, np.nan)
+    avaliadas = np.zeros(n)
+    reprovacoes = np.zeros(n)
+    notas = (
+        Nota.objects.filter(ano_letivo=ano, nota1__gt=0, nota2__gt=0, nota3__gt=0, **filtro)
+        .values('aluno_id')
+        .annotate(
+            media=Avg('media_final'),
+            n=Count('id'),
+            reprovacoes=Count('id', filter=Q(situacao='REPROVADO')),
+        )
+        .values_list('aluno_id', 'media', 'n', 'reprovacoes')
+    )
+    pos, v = _posicoes(ids, list(notas))
+    if len(pos):
+        media[pos], avaliadas[pos], reprovacoes[pos] = v[:, 0], v[:, 1], v[:, 2]
+    # a escala (0–20 ou 0–100) vem de todo o ano, não só dos alunos recalculados
+    maximo = Nota.objects.filter(ano_letivo=ano).aggregate(m=Max('media_final'))['m'] or 0
+
+    aulas = np.zeros(n)
+    faltas = np.zeros(n)
+    freq = (
+        Frequencia.objects.filter(ano_letivo=ano, **filtro)
+        .values('aluno_id')
+        .annotate(aulas=Sum('total_aulas'), faltas=Sum('total_faltas'))
+        .values_list('aluno_id', 'aulas', 'faltas')
+    )
+    pos, v = _posicoes(ids, list(freq))
+    if len(pos):
+        aulas[pos], faltas[pos] = v[:, 0], v[:, 1]
+
+    faturas_atraso = np.zeros(n)
+    dias_atraso = np.zeros(n)
+    atraso = (
+        Fatura.objects.filter(status__in=['PENDENTE', 'VENCIDO'], data_vencimento__lt=hoje, **filtro)
+        .values('aluno_id')
+        .annotate(n=Count('id'), mais_antiga=Min('data_vencimento'))
+        .values_list('aluno_id', 'n', 'mais_antiga')
+    )
+    linhas = [(a, k, (hoje - d).days) for a, k, d in atraso]
+    pos, v = _posicoes(ids, linhas)
+    if len(pos):
+        faturas_atraso[pos], dias_atraso[pos] = v[:, 0], v[:, 1]
+
+    return {
+        'media': media, 'avaliadas': avaliadas, 'reprovacoes': reprovacoes,
+        'escala': 20 if maximo <= 20 else 100,
+        'aulas': aulas, 'faltas': faltas,
+        'faturas_atraso': faturas_atraso, 'dias_atraso': dias_atraso,
+    }
+
+
+def pontuar(entradas, status):
+    """Componentes (0–1), pontuação (0–100) e nível, vetorizados por aluno."""
+    e = entradas
+    with np.errstate(divide='ignore', invalid='ignore'):
+        taxa_reprovacao = np.where(e['avaliadas'] > 0, e['reprovacoes'] / e['avaliadas'], 0)
+        limiar = LIMIAR_MEDIA * e['escala']
+        defice = np.clip((limiar - np.nan_to_num(e['media'], nan=limiar)) / limiar, 0, 1)
+        taxa_faltas = np.where(e['aulas'] > 0, e['faltas'] / e['aulas'], 0)
+    componentes = {
+        'academico': 0.5 * taxa_reprovacao + 0.5 * defice,
+        'assiduidade': np.clip(taxa_faltas / FALTAS_MAXIMAS, 0, 1),
+        'financeiro': np.maximum(
+            np.clip(e['dias_atraso'] / DIAS_ATRASO_MAXIMOS, 0, 1),
+            np.clip(e['faturas_atraso'] / FATURAS_ATRASO_MAXIMAS, 0, 1),
+        ),
+        'situacao': np.array([PESO_STATUS.get(s, 0.0) for s in status]),
+    }
+    pontuacao = 100 * sum(PESOS[k] * v for k, v in componentes.items())
+    limites = np.array([limite for limite, _ in NIVEIS])
+    rotulos = np.array([nivel for _, nivel in NIVEIS])
+    # NIVEIS está por ordem decrescente: o primeiro limite atingido dá o nível
+    nivel = rotulos[np.argmax(pontuacao[:, None] >= limites[None, :], axis=1)]
+    return componentes, pontuacao, nivel, taxa_faltas
+
+
+def calcular_riscos(ano=None, alunos=None):
+    """
+    Calcula e grava o risco dos `alunos` (pks; todos os pontuáveis se None) no
+    ano letivo (ativo por omissão). Alunos que deixaram de estar ativos perdem a
+    linha de risco. Retorna ResultadoRisco(calculados, removidos).
+    """
+    ano = ano or AnoLetivo.objects.filter(ativo=True).first()
+    if ano is None:
+        return ResultadoRisco(0, 0)
+    agora = timezone.now()
+    hoje = timezone.localdate()
+
+    qs = Aluno.objects.all()
+    if alunos is not None:
+        qs = qs.filter(pk__in=list(alunos))
+    linhas = sorted(qs.filter(status__in=STATUS_PONTUADOS).values_list('pk', 'status'))
+    ids = np.array([pk for pk, _ in linhas], dtype=np.int64)
+    status = [s for _, s in linhas]
+
+    removidos = RiscoAluno.objects.filter(ano_letivo=ano).exclude(aluno__status__in=STATUS_PONTUADOS)
+    if alunos is not None:
+        removidos = removidos.filter(aluno_id__in=list(alunos))
+
+    objetos = []
+    if len(ids):
+        e = _entradas(ano, ids, hoje, todos=alunos is None)
+        componentes, pontuacao, nivel, taxa_faltas = pontuar(e, status)
+        for i, pk in enumerate(ids.tolist()):
+            objetos.append(RiscoAluno(
+                aluno_id=pk,
+                ano_letivo=ano,
+                pontuacao=round(float(pontuacao[i]), 2),
+                nivel=str(nivel[i]),
+                academico=round(float(componentes['academico'][i]), 4),
+                assiduidade=round(float(componentes['assiduidade'][i]), 4),
+                financeiro=round(float(componentes['financeiro'][i]), 4),
+                situacao=float(componentes['situacao'][i]),
+                media=None if np.isnan(e['media'][i]) else round(float(e['media'][i]), 2),
+                reprovacoes=int(e['reprovacoes'][i]),
+                taxa_faltas=round(float(taxa_faltas[i]), 4),
+                faturas_atraso=int(e['faturas_atraso'][i]),
+                dias_atraso=int(e['dias_atraso'][i]),
+                calculado_em=agora,
+            ))
+
+    campos = [
+        'pontuacao', 'nivel', 'academico', 'assiduidade', 'financeiro', 'situacao', 'media',
+        'reprovacoes', 'taxa_faltas', 'faturas_atraso', 'dias_atraso', 'calculado_em',
+    ]
+    with transaction.atomic():
+        n_removidos, _ = removidos.delete()
+        RiscoAluno.objects.bulk_create(
+            objetos, batch_size=1000,
+            update_conflicts=True, unique_fields=['aluno', 'ano_letivo'], update_fields=campos,
+        )
+    return ResultadoRisco(len(objetos), n_removidos)
+
+
+def alunos_alterados(ano, desde):
+    """Pks dos alunos cujas entradas de risco mudaram depois de `desde`."""
+    alterados = set()
+    consultas = [
+        Nota.objects.filter(ano_letivo=ano, updated_at__gt=desde),
+        Frequencia.objects.filter(ano_letivo=ano, updated_at__gt=desde),
+        ContaCorrente.objects.filter(updated_at__gt=desde),
+        Fatura.objects.filter(updated_at__gt=desde),
+        # faturas que entraram em atraso sem nenhuma escrita
+        Fatura.objects.filter(
+            status__in=['PENDENTE', 'VENCIDO'],
+            data_vencimento__gte=timezone.localtime(desde).date() - timedelta(days=1),
+            data_vencimento__lt=timezone.localdate(),
+        ),
+        # os dias de atraso crescem todos os dias
+        RiscoAluno.objects.filter(ano_letivo=ano, faturas_atraso__gt=0,
+                                  calculado_em__date__lt=timezone.localdate()),
+    ]
+    for qs in consultas:
+        alterados.update(qs.values_list('aluno_id', flat=True).distinct())
+    alterados.update(Aluno.objects.filter(updated_at__gt=desde).values_list('pk', flat=True))
+    # alunos pontuáveis que ainda não têm linha neste ano
+    alterados.update(
+        Aluno.objects.filter(status__in=STATUS_PONTUADOS)
+        .exclude(riscos__ano_letivo=ano)
+        .values_list('pk', flat=True)
+    )
+    return alterados
+
+
+def atualizar_riscos(ano=None, completo=False):
+    """Recálculo incremental desde o último cálculo do ano (completo se não houver nenhum)."""
+    ano = ano or AnoLetivo.objects.filter(ativo=True).first()
+    if ano is None:
+        return ResultadoRisco(0, 0)
+    desde = RiscoAluno.objects.filter(ano_letivo=ano).aggregate(m=Max('calculado_em'))['m']
+    if completo or desde is None:
+        return calcular_riscos(ano)
+    alterados = alunos_alterados(ano, desde)
+    if not alterados:
+        return ResultadoRisco(0, 0)
+    return calcular_riscos(ano, alterados)
+
+
+def em_risco(ano, nivel='ALTO'):
+    """Leitura indexada para os painéis: riscos do ano a partir de `nivel`."""
+    niveis = [n for _, n in NIVEIS]
+    return (
+        RiscoAluno.objects.filter(ano_letivo=ano, nivel__in=niveis[:niveis.index(nivel) + 1])
+        .select_related('aluno')
+        .order_by('-pontuacao')
+    )
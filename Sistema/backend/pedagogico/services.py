@@ -0,0 +1,428 @@
+# Sistema/backend/pedagogico/services.py
+
+import heapq
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from secretaria.models import Aluno, PreMatricula
+from .models import (
+    AnoLetivo, Turma, TurmaDisciplina, Matricula, Nota, PreRematricula,
+    Aula, IndisponibilidadeProfessor,
+)
+from . import horario
+
+
+# --------------------------------
+# Alocação automática de turmas
+# --------------------------------
+
+ResultadoAlocacao = namedtuple('ResultadoAlocacao', ['alocadas', 'sem_vaga', 'ja_matriculados'])
+
+
+def _turmas(ano, curso=None, turno=None, nivel=None):
+    qs = Turma.objects.filter(ano_letivo=ano)
+    if curso is not None:
+        qs = qs.filter(curso=curso)
+    if turno:
+        qs = qs.filter(turno=turno)
+    if nivel:
+        qs = qs.filter(nivel=nivel)
+    return qs
+
+
+def travar_turmas(ano, curso=None, turno=None, nivel=None):
+    """
+    SELECT ... FOR UPDATE das turmas (dentro de uma transação): quem aloca
+    alunos espera pelos outros antes de contar a ocupação. Sempre pela ordem
+    do pk, para duas alocações concorrentes não se bloquearem mutuamente.
+    """
+    return list(_turmas(ano, curso, turno, nivel).select_for_update().order_by('pk').values_list('pk', flat=True))
+
+
+def ocupacao_turmas(ano, curso=None, turno=None, nivel=None):
+    """
+    Turmas do ano letivo anotadas com `ocupadas` (matrículas ATIVAS) e `vagas`.
+    Uma única consulta agregada, independentemente do número de turmas.
+    """
+    qs = _turmas(ano, curso, turno, nivel).select_related('curso')
+    turmas = list(qs.annotate(
+        ocupadas=Count('matriculas', filter=Q(matriculas__status='ATIVO'))
+    ).order_by('nome'))
+    for t in turmas:
+        t.vagas = max(t.capacidade - t.ocupadas, 0)
+    return turmas
+
+
+def _chave_heap(turma):
+    # Menor taxa de ocupação primeiro; desempate pelo número absoluto e pelo nome
+    capacidade = turma.capacidade or 1
+    return (turma.ocupadas / capacidade, turma.ocupadas, turma.nome)
+
+
+def distribuir(pedidos, turmas):
+    """
+    Distribui `pedidos` (iterável de objetos) pelas `turmas` anotadas por
+    `ocupacao_turmas`, sempre na turma de menor ocupação relativa (min-heap),
+    o que equilibra as turmas mesmo com capacidades diferentes.
+
+    Retorna (pares [(pedido, turma)], pedidos_sem_vaga). Não toca no banco.
+    """
+    heap = []
+    for idx, t in enumerate(turmas):
+        if t.ocupadas < t.capacidade:
+            heap.append((_chave_heap(t), idx, t))
+    heapq.heapify(heap)
+
+    pares, sem_vaga = [], []
+    for pedido in pedidos:
+        if not heap:
+            sem_vaga.append(pedido)
+            continue
+        _, idx, turma = heapq.heappop(heap)
+        pares.append((pedido, turma))
+        turma.ocupadas += 1
+        turma.vagas = max(turma.capacidade - turma.ocupadas, 0)
+        if turma.ocupadas < turma.capacidade:
+            heapq.heappush(heap, (_chave_heap(turma), idx, turma))
+    return pares, sem_vaga
+
+
+def alocar_prematriculas(curso, ano=None, turno=None, nivel=None, data_matricula=None, commit=True):
+    """
+    Aloca as Pré-Matrículas PENDENTES de um Curso nas turmas do ano letivo ativo,
+    respeitando a capacidade de cada turma e equilibrando a ocupação.
+
+    - Pedidos são atendidos por ordem de chegada (data_solic).
+    - Pedidos de alunos que já têm matrícula no ano (ou repetidos) não são tocados.
+    - Pedidos sem vaga permanecem PENDENTES.
+
+    Tudo corre numa única transação: as turmas candidatas e os pedidos
+    pendentes ficam bloqueados (select_for_update) enquanto se contam as vagas
+    e se criam as matrículas (bulk_create), por isso duas alocações em
+    simultâneo, ou uma alocação e uma confirmação manual, não atribuem o mesmo
+    pedido duas vezes nem ultrapassam a capacidade.
+    """
+    ano = ano or AnoLetivo.objects.filter(ativo=True).first()
+    if ano is None:
+        return ResultadoAlocacao([], [], [])
+    data_matricula = data_matricula or timezone.now().date()
+
+    with transaction.atomic():
+        return _alocar(curso, ano, turno, nivel, data_matricula, commit)
+
+
+def _alocar(curso, ano, turno, nivel, data_matricula, commit):
+    if commit:
+        travar_turmas(ano, curso=curso, turno=turno, nivel=nivel)
+    # o filtro status='PENDENTE' é reavaliado depois de obtido o lock, por
+    # isso pedidos aprovados entretanto por outra transação ficam de fora
+    pendentes = PreMatricula.objects.filter(status='PENDENTE', curso=curso)
+    if commit:
+        pendentes = pendentes.select_for_update(of=('self',))
+    pendentes = list(pendentes.select_related('aluno').order_by('data_solic', 'pk'))
+    if not pendentes:
+        return ResultadoAlocacao([], [], [])
+
+    ja_matriculados_ids = set(
+        Matricula.objects.filter(
+            ano_letivo=ano,
+            aluno_id__in=[p.aluno_id for p in pendentes],
+        ).values_list('aluno_id', flat=True)
+    )
+    ja_matriculados, a_alocar, vistos = [], [], set()
+    for p in pendentes:
+        if p.aluno_id in ja_matriculados_ids or p.aluno_id in vistos:
+            ja_matriculados.append(p)
+        else:
+            vistos.add(p.aluno_id)
+            a_alocar.append(p)
+
+    turmas = ocupacao_turmas(ano, curso=curso, turno=turno, nivel=nivel)
+    pares, sem_vaga = distribuir(a_alocar, turmas)
+
+    if commit:
+        Matricula.objects.bulk_create([
+            Matricula(
+                aluno_id=prem.aluno_id,
+                turma=turma,
+                curso=turma.curso,
+                ano_letivo=ano,
+                data_matricula=data_matricula,
+            )
+            for prem, turma in pares
+        ], batch_size=500)
+        PreMatricula.objects.filter(
+            pk__in=[prem.pk for prem, _ in pares]
+        ).update(status='APROVADA')
+
+    return ResultadoAlocacao(pares, sem_vaga, ja_matriculados)
+
+
+# --------------------------------
+# Rematrícula em lote (virada de ano letivo)
+# --------------------------------
+
+ResultadoRematricula = namedtuple('ResultadoRematricula', [
+    'turmas_clonadas', 'disciplinas_clonadas', 'matriculas', 'pre_rematriculas',
+    'promovidos', 'retidos', 'formados', 'sem_avaliacao', 'sem_vaga',
+])
+
+NIVEIS = [valor for valor, _ in Turma.NIVEIS_CHOICES]
+
+
+def proximo_nivel(nivel):
+    """Nível seguinte na grelha (ex.: '10º Ano' → '11º Ano'); None no último."""
+    idx = NIVEIS.index(nivel)
+    return NIVEIS[idx + 1] if idx + 1 < len(NIVEIS) else None
+
+
+def nome_turma_no_ano(nome, ano_origem, ano_destino):
+    """'10º A (2025)' → '10º A (2026)'. Turma.nome é único entre todos os anos."""
+    sufixo = f' ({ano_origem.nome})'
+    base = nome[:-len(sufixo)] if nome.endswith(sufixo) else nome
+    novo_sufixo = f' ({ano_destino.nome})'
+    max_len = Turma._meta.get_field('nome').max_length
+    return base[:max_len - len(novo_sufixo)] + novo_sufixo
+
+
+def situacao_final_alunos(ano):
+    """
+    {aluno_id: 'APROVADO' | 'REPROVADO'} para o ano letivo, numa só consulta agregada.
+    O aluno é aprovado apenas se todas as suas Notas do ano estiverem APROVADO.
+    """
+    linhas = Nota.objects.filter(ano_letivo=ano).values('aluno_id').annotate(
+        total=Count('id'),
+        aprovadas=Count('id', filter=Q(situacao='APROVADO')),
+    )
+    return {
+        l['aluno_id']: 'APROVADO' if l['aprovadas'] == l['total'] else 'REPROVADO'
+        for l in linhas
+    }
+
+
+def clonar_turmas(ano_origem, ano_destino):
+    """
+    Copia as Turmas (e respetivas TurmaDisciplinas) de um ano para o seguinte.
+    Turmas já existentes no destino (mesmo nome) são mantidas. Retorna (turmas, disciplinas).
+    """
+    existentes = set(Turma.objects.filter(ano_letivo=ano_destino).values_list('nome', flat=True))
+    origem_por_nome, novas = {}, []
+    for t in Turma.objects.filter(ano_letivo=ano_origem):
+        nome = nome_turma_no_ano(t.nome, ano_origem, ano_destino)
+        if nome in existentes or nome in origem_por_nome:
+            continue
+        origem_por_nome[nome] = t
+        novas.append(Turma(
+            nome=nome,
+            nivel=t.nivel,
+            turno=t.turno,
+            capacidade=t.capacidade,
+            professor_responsavel=t.professor_responsavel,
+            curso_id=t.curso_id,
+            ano_letivo=ano_destino,
+        ))
+    Turma.objects.bulk_create(novas, batch_size=500)
+    if not novas:
+        return 0, 0
+
+    nova_por_origem = {origem_por_nome[t.nome].pk: t for t in novas}
+    disciplinas = [
+        TurmaDisciplina(
+            turma=nova_por_origem[td.turma_id],
+            disciplina_id=td.disciplina_id,
+            professor_responsavel=td.professor_responsavel,
+            ano_letivo=ano_destino,
+        )
+        for td in TurmaDisciplina.objects.filter(turma_id__in=nova_por_origem.keys())
+    ]
+    TurmaDisciplina.objects.bulk_create(disciplinas, batch_size=1000)
+    return len(novas), len(disciplinas)
+
+
+def rematricula_em_lote(ano_origem, ano_destino, modo='MATRICULA', data_matricula=None, commit=True):
+    """
+    Virada de ano: com base na situação final (Nota.situacao) de cada aluno com
+    matrícula ATIVA em `ano_origem`, promove-o ao nível seguinte ou retém-no no mesmo nível.
+
+    - modo='MATRICULA': cria diretamente as Matrículas no `ano_destino`, distribuídas
+      pelas turmas do mesmo curso/nível (preferindo o mesmo turno) conforme a capacidade.
+    - modo='PRE_REMATRICULA': cria PreRematriculas PENDENTES para confirmação manual.
+
+    Alunos sem notas ou sem vaga ficam sempre como PreRematricula PENDENTE.
+    Alunos aprovados no último nível do curso passam a FORMADO.
+    Turmas e TurmaDisciplinas são clonadas para o destino. Tudo numa só transação;
+    com commit=False a transação é revertida no fim (simulação).
+    """
+    data_matricula = data_matricula or timezone.now().date()
+
+    with transaction.atomic():
+        turmas_clonadas, disciplinas_clonadas = clonar_turmas(ano_origem, ano_destino)
+
+        matriculas = list(
+            Matricula.objects.filter(ano_letivo=ano_origem, status='ATIVO', aluno__status='ATIVO')
+            .select_related('turma')
+            .order_by('turma__nome', 'aluno__nome')
+        )
+        ja_no_destino = set(
+            Matricula.objects.filter(ano_letivo=ano_destino).values_list('aluno_id', flat=True)
+        )
+        ja_solicitados = set(
+            PreRematricula.objects.filter(ano_origem=ano_origem, status='PENDENTE')
+            .values_list('aluno_id', flat=True)
+        )
+        situacoes = situacao_final_alunos(ano_origem)
+
+        # Último nível oferecido por curso (no ano de origem)
+        nivel_final = {}
+        for t in Turma.objects.filter(ano_letivo=ano_origem).values('curso_id', 'nivel').distinct():
+            atual = nivel_final.get(t['curso_id'])
+            if atual is None or NIVEIS.index(t['nivel']) > NIVEIS.index(atual):
+                nivel_final[t['curso_id']] = t['nivel']
+
+        promovidos, retidos, formados, sem_avaliacao = [], [], [], []
+        grupos = {}  # (curso_id, nivel, turno) → [matrícula de origem]
+        for m in matriculas:
+            if m.aluno_id in ja_no_destino or m.aluno_id in ja_solicitados:
+                continue
+            situacao = situacoes.get(m.aluno_id)
+            if situacao is None:
+                sem_avaliacao.append(m)
+                continue
+            if situacao == 'APROVADO':
+                if m.turma.nivel == nivel_final.get(m.turma.curso_id):
+                    formados.append(m)
+                    continue
+                promovidos.append(m)
+                nivel = proximo_nivel(m.turma.nivel)
+            else:
+                retidos.append(m)
+                nivel = m.turma.nivel
+            grupos.setdefault((m.turma.curso_id, nivel, m.turma.turno), []).append(m)
+
+        pares, sem_vaga = [], []
+        if modo == 'MATRICULA':
+            por_curso_nivel = {}
+            for t in ocupacao_turmas(ano_destino):
+                por_curso_nivel.setdefault((t.curso_id, t.nivel), []).append(t)
+            for (curso_id, nivel, turno), grupo in grupos.items():
+                candidatas = por_curso_nivel.get((curso_id, nivel), [])
+                # primeiro o mesmo turno, depois qualquer turma do curso/nível
+                alocados, restantes = distribuir(grupo, [t for t in candidatas if t.turno == turno])
+                pares += alocados
+                alocados, restantes = distribuir(restantes, candidatas)
+                pares += alocados
+                sem_vaga += restantes
+            Matricula.objects.bulk_create([
+                Matricula(
+                    aluno_id=m.aluno_id,
+                    turma=turma,
+                    curso_id=turma.curso_id,
+                    ano_letivo=ano_destino,
+                    data_matricula=data_matricula,
+                )
+                for m, turma in pares
+            ], batch_size=500)
+            pendentes = sem_vaga + sem_avaliacao
+        else:
+            pendentes = [m for grupo in grupos.values() for m in grupo] + sem_avaliacao
+
+        PreRematricula.objects.bulk_create([
+            PreRematricula(
+                aluno_id=m.aluno_id,
+                turma_origem=m.turma,
+                curso_origem_id=m.turma.curso_id,
+                ano_origem=ano_origem,
+            )
+            for m in pendentes
+        ], batch_size=500)
+
+        Aluno.objects.filter(pk__in=[m.aluno_id for m in formados]).update(status='FORMADO')
+
+        if not commit:
+            transaction.set_rollback(True)
+
+    return ResultadoRematricula(
+        turmas_clonadas, disciplinas_clonadas, len(pares), len(pendentes),
+        len(promovidos), len(retidos), len(formados), len(sem_avaliacao), len(sem_vaga),
+    )
+
+
+# --------------------------------
+# Gerador de horários
+# --------------------------------
+
+def semanas_letivas(ano):
+    return max((ano.data_fim - ano.data_inicio).days // 7, 1)
+
+
+def aulas_por_semana(td, semanas):
+    """Aulas semanais de uma TurmaDisciplina: o valor definido ou carga horária anual / semanas."""
+    if td.aulas_semanais:
+        return td.aulas_semanais
+    return max(round(td.disciplina.carga_horaria / semanas), 1)
+
+
+def professor_da(td):
+    return (td.professor_responsavel or td.disciplina.professor_responsavel or '').strip()
+
+
+def pedidos_horario(ano, turno=None):
+    """Converte as TurmaDisciplinas do ano em pedidos para `horario.resolver`."""
+    tds = TurmaDisciplina.objects.filter(ano_letivo=ano).select_related('turma', 'disciplina')
+    if turno:
+        tds = tds.filter(turma__turno=turno)
+    bloqueados = defaultdict(int)
+    for ind in IndisponibilidadeProfessor.objects.all():
+        bloqueados[ind.professor.strip()] |= ind.mascara()
+    semanas = semanas_letivas(ano)
+    pedidos = []
+    for td in tds:
+        professor = professor_da(td)
+        pedidos.append(horario.Pedido(
+            chave=td.pk,
+            turma=td.turma_id,
+            professor=professor,
+            aulas=aulas_por_semana(td, semanas),
+            permitido=horario.mascara_turno(td.turma.turno) & ~bloqueados[professor],
+        ))
+    return pedidos
+
+
+def gerar_horario(ano=None, turno=None, commit=True, **opcoes):
+    """
+    Gera o horário semanal das turmas do ano (ou só de um turno) e substitui as
+    Aulas existentes dessas turmas. Retorna o ResultadoHorario do resolvedor;
+    `sem_horario` usa como chave o pk da TurmaDisciplina.
+    """
+    ano = ano or AnoLetivo.objects.filter(ativo=True).first()
+    pedidos = pedidos_horario(ano, turno)
+    resultado = horario.resolver(pedidos, **opcoes)
+    if not commit:
+        return resultado
+
+    turma_de = {p.chave: p.turma for p in pedidos}
+    aulas = []
+    for chave, slots in resultado.alocacao.items():
+        for s in slots:
+            _, dia, tempo = horario.decompor(s)
+            aulas.append(Aula(turma_id=turma_de[chave], turma_disciplina_id=chave,
+                              dia_semana=dia, tempo=tempo))
+    with transaction.atomic():
+        Aula.objects.filter(turma_id__in=set(turma_de.values())).delete()
+        Aula.objects.bulk_create(aulas, batch_size=1000)
+    return resultado
+
+
+def grelha_turma(turma):
+    """Horário de uma turma como linhas [(tempo, [aula ou None por dia])]."""
+    aulas = {
+        (a.dia_semana, a.tempo): a
+        for a in turma.aulas.select_related('turma_disciplina__disciplina')
+    }
+    return [
+        (tempo, [aulas.get((dia, tempo)) for dia, _ in horario.DIAS_SEMANA])
+        for tempo in range(1, horario.TEMPOS_POR_TURNO + 1)
+    ]
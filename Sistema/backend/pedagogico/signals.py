@@ -1,8 +1,9 @@
 # Sistema/backend/pedagogico/signals.py
 
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import Nota
+from .models import AnoLetivo, Calendario, Nota, TurmaDisciplina
+from . import analitica, calendario
 
 @receiver(pre_save, sender=Nota)
 def calcular_notas_pre_save(sender, instance, **kwargs):
@@ -16,3 +17,47 @@ def calcular_notas_pre_save(sender, instance, **kwargs):
     soma_pesos = 3
     instance.media_final = (instance.nota1 + instance.nota2 + instance.nota3) / soma_pesos
     instance.situacao = 'APROVADO' if instance.media_final >= 60 else 'REPROVADO'
+
+
+@receiver(pre_save, sender=Calendario)
+def guardar_ano_anterior_do_evento(sender, instance, **kwargs):
+    """
+    Se o evento mudar de ano letivo, o índice do ano antigo também fica inválido.
+    """
+    if instance.pk:
+        instance._ano_anterior_id = (
+            Calendario.objects.filter(pk=instance.pk).values_list('ano_letivo_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Calendario)
+@receiver(post_delete, sender=Calendario)
+def invalidar_calendario_no_evento(sender, instance, **kwargs):
+    """
+    Qualquer alteração num evento invalida o índice em cache do seu ano letivo.
+    """
+    calendario.invalidar(instance.ano_letivo_id)
+    anterior = getattr(instance, '_ano_anterior_id', None)
+    if anterior and anterior != instance.ano_letivo_id:
+        calendario.invalidar(anterior)
+
+
+@receiver(post_save, sender=AnoLetivo)
+@receiver(post_delete, sender=AnoLetivo)
+def invalidar_calendario_no_ano(sender, instance, **kwargs):
+    """
+    As datas de início/fim definem os dias letivos: invalida o índice do ano.
+    """
+    calendario.invalidar(instance.pk)
+
+
+@receiver(post_save, sender=Nota)
+@receiver(post_delete, sender=Nota)
+@receiver(post_save, sender=TurmaDisciplina)
+@receiver(post_delete, sender=TurmaDisciplina)
+def invalidar_analitica(sender, instance, **kwargs):
+    """
+    Notas lançadas ou alteradas (e mudanças de professor numa TurmaDisciplina)
+    invalidam a análise de desempenho em cache do ano letivo.
+    """
+    analitica.invalidar(instance.ano_letivo_id)
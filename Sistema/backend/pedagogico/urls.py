@@ -14,6 +14,13 @@ urlpatterns = [
     path('turmas/new/', views.TurmaCreateView.as_view(), name='turma-create'),
     path('turmas/edit/<int:pk>/', views.TurmaUpdateView.as_view(), name='turma-edit'),
     path('turmas/delete/<int:pk>/', views.TurmaDeleteView.as_view(), name='turma-delete'),
+    path('turmas/autocomplete/', views.turma_autocomplete, name='turma-autocomplete'),
+    path('turmas/<int:pk>/horario/', views.horario_turma, name='turma-horario'),
+    path('turmas/horarios/gerar/', views.gerar_horarios, name='horario-gerar'),
+
+    # Frequência
+    path('turmadisciplinas/<int:pk>/chamada/', views.registar_chamada, name='frequencia-chamada'),
+    path('turmas/<int:pk>/frequencia/', views.frequencia_turma, name='frequencia-turma'),
 
     # CRUD Disciplina
     path('disciplinas/', views.DisciplinaListView.as_view(), name='disciplina-list'),
@@ -54,6 +61,7 @@ urlpatterns = [
     path('calendario/new/', views.CalendarioCreateView.as_view(), name='calendario-create'),
     path('calendario/edit/<int:pk>/', views.CalendarioUpdateView.as_view(), name='calendario-edit'),
     path('calendario/delete/<int:pk>/', views.CalendarioDeleteView.as_view(), name='calendario-delete'),
+    path('calendario/mensal/', views.calendario_mensal, name='calendario-mensal'),
 
     # CRUD Curso
     path('cursos/',       views.CursoListView.as_view(),   name='curso-list'),
@@ -64,6 +72,7 @@ urlpatterns = [
     # Pré-matrícula
     path('prematriculas/pendentes/', views.PreMatriculaPendentesListView.as_view(), name='prematricula-pendentes'),
     path('prematricula/<int:pk>/confirmar/', views.confirmar_prematricula, name='confirmar-prematricula'),
+    path('prematriculas/alocar/', views.alocar_turmas, name='prematricula-alocar'),
 
     # Rematrícula
     path('rematricula/solicitar/', views.rematricula_solicitar, name='rematricula-solicitar'),
@@ -72,4 +81,6 @@ urlpatterns = [
 
     # Relatório de Ano Letivo
     path('relatorio/', views.relatorio_ano_letivo, name='relatorio-ano'),
+    path('relatorio/desempenho/', views.desempenho_academico, name='desempenho'),
+    path('relatorio/risco/', views.RiscoAlunoListView.as_view(), name='risco-list'),
 ]
@@ -9,18 +9,22 @@ from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 
 from core.mixins import AnoContextMixin
-from .models import PreRematricula, Turma, Disciplina, TurmaDisciplina, Matricula, Nota, Boletim, AnoLetivo, Calendario, Curso
+from .models import PreRematricula, Turma, Disciplina, TurmaDisciplina, Matricula, Nota, Boletim, AnoLetivo, Calendario, Curso, RiscoAluno
 from .forms import PreRematriculaForm, TurmaForm, DisciplinaForm, TurmaDisciplinaForm, MatriculaForm, NotaForm, AnoLetivoForm, CalendarioForm, CursoForm
+from .services import ocupacao_turmas, alocar_prematriculas, gerar_horario, grelha_turma
+from .horario import DIAS_SEMANA
+from . import analitica, calendario, frequencia
 from accounts.decorators import role_required
 
 from secretaria.models import PreMatricula
 
 from django.template.loader import render_to_string
 from weasyprint import HTML
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
 
 from django.contrib import messages
 from django.utils import timezone
+from django.db import transaction
 
 
 @login_required
@@ -48,6 +52,11 @@ class TurmaListView(LoginRequiredMixin, AnoContextMixin, ListView):
             return qs.filter(ano_letivo=ano)
         return qs.none()
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['turno_choices'] = Turma.TURNO_CHOICES
+        return context
+
 
 @method_decorator(role_required('Admin','Diretor','Pedagogico'), name='dispatch')
 class TurmaCreateView(LoginRequiredMixin, CreateView):
@@ -80,6 +89,132 @@ class TurmaDeleteView(LoginRequiredMixin, DeleteView):
     success_url = reverse_lazy('pedagogico:turma-list')
 
 
+# --------------------------------
+# Horários
+# --------------------------------
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria', 'Pedagogico')
+def turma_autocomplete(request):
+    """Sugestões de turmas pelo início do nome (?ano_ativo=1: só do ano letivo ativo)."""
+    termo = request.GET.get('q', '').strip()
+    try:
+        limite = max(1, min(int(request.GET.get('limite', 20)), 50))
+    except ValueError:
+        limite = 20
+    qs = Turma.objects.order_by('nome')
+    if request.GET.get('ano_ativo'):
+        qs = qs.filter(ano_letivo__ativo=True)
+    if termo:
+        qs = qs.filter(nome__istartswith=termo)
+    return JsonResponse({'resultados': [{'id': t.pk, 'texto': str(t)} for t in qs.only('pk', 'nome')[:limite]]})
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Pedagogico')
+def horario_turma(request, pk):
+    """Grelha semanal (dias × tempos) de uma turma."""
+    turma = get_object_or_404(Turma, pk=pk)
+    return render(request, 'pedagogico/turma/horario_turma.html', {
+        'turma': turma,
+        'dias': DIAS_SEMANA,
+        'grelha': grelha_turma(turma),
+    })
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Pedagogico')
+def gerar_horarios(request):
+    """
+    Gera automaticamente o horário de todas as turmas do ano letivo ativo
+    (ou só de um turno), substituindo os horários existentes.
+    """
+    if request.method != 'POST':
+        return redirect('pedagogico:turma-list')
+
+    ano = AnoLetivo.objects.filter(ativo=True).first()
+    if not ano:
+        messages.error(request, "Não há ano letivo ativo.")
+        return redirect('pedagogico:turma-list')
+
+    resultado = gerar_horario(ano, turno=request.POST.get('turno') or None)
+    colocadas = sum(len(s) for s in resultado.alocacao.values())
+    messages.success(request, f"Horário gerado: {colocadas} aula(s) em {resultado.segundos:.1f}s.")
+    if resultado.sem_horario:
+        faltam = TurmaDisciplina.objects.filter(pk__in=resultado.sem_horario).select_related('turma', 'disciplina')
+        messages.warning(request, "Sem horário suficiente para: " + "; ".join(
+            f"{td} ({resultado.sem_horario[td.pk]} aula(s))" for td in faltam
+        ))
+    return redirect('pedagogico:turma-list')
+
+
+# --------------------------------
+# Frequência (chamadas)
+# --------------------------------
+
+@login_required
+@role_required('Admin', 'Diretor', 'Pedagogico')
+def registar_chamada(request, pk):
+    """
+    Chamada de uma TurmaDisciplina num dia: todos os alunos da turma numa só
+    página, presentes por omissão; as faltas são marcadas e gravadas de uma vez.
+    """
+    from datetime import date
+
+    td = get_object_or_404(TurmaDisciplina.objects.select_related('turma', 'disciplina', 'ano_letivo'), pk=pk)
+    try:
+        dia = date.fromisoformat(request.POST.get('data') or request.GET.get('data') or '')
+    except ValueError:
+        dia = timezone.localdate()
+
+    ano = td.ano_letivo
+    if not ano.data_inicio <= dia <= ano.data_fim:
+        messages.error(
+            request,
+            f"{dia:%d/%m/%Y} está fora do ano letivo {ano} "
+            f"({ano.data_inicio:%d/%m/%Y} a {ano.data_fim:%d/%m/%Y}).",
+        )
+        dia = min(max(dia, ano.data_inicio), ano.data_fim)
+        return redirect(f"{request.path}?data={dia.isoformat()}")
+
+    if request.method == 'POST':
+        # valores que não são pks (POST adulterado) são ignorados
+        ausentes = [int(pk) for pk in request.POST.getlist('ausentes') if pk.isdigit()]
+        try:
+            presentes, faltas = frequencia.registar_chamada(td, dia, ausentes)
+        except ValueError as exc:
+            messages.error(request, str(exc))
+        else:
+            messages.success(request, f"Chamada de {dia:%d/%m/%Y} registada: {presentes} presente(s), {faltas} falta(s).")
+            return redirect(f"{request.path}?data={dia.isoformat()}")
+
+    return render(request, 'pedagogico/frequencia/chamada.html', {
+        'td': td,
+        'dia': dia,
+        'dia_letivo': calendario.e_dia_letivo(td.ano_letivo, dia),
+        'linhas': frequencia.chamada_do_dia(td, dia),
+    })
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Pedagogico')
+def frequencia_turma(request, pk):
+    """Taxa de faltas por aluno de uma turma, no ano ou num trimestre."""
+    from secretaria.models import Aluno
+
+    turma = get_object_or_404(Turma.objects.select_related('ano_letivo'), pk=pk)
+    trimestre = request.GET.get('trimestre')
+    trimestre = int(trimestre) if trimestre in ('1', '2', '3') else None
+    resumo = frequencia.resumo_turma(turma, trimestre)
+    alunos = Aluno.objects.in_bulk([r.aluno_id for r in resumo])
+    return render(request, 'pedagogico/frequencia/frequencia_turma.html', {
+        'turma': turma,
+        'trimestre': trimestre,
+        'linhas': [(alunos[r.aluno_id], r) for r in resumo],
+        'disciplinas': turma.turma_disciplinas.select_related('disciplina'),
+    })
+
+
 # --------------------------------
 # CRUD de Disciplina
 # --------------------------------
@@ -130,14 +265,6 @@ class TurmaDisciplinaListView(LoginRequiredMixin, AnoContextMixin, ListView):
 
     # def get_queryset(self):
     #    return super().get_queryset().select_related('turma', 'disciplina')
-    
-    def get_queryset(self):
-        # Pega ano ativo (ativo=True)
-        ano = AnoLetivo.objects.filter(ativo=True).first()
-        qs = super().get_queryset()
-        if ano:
-            return qs.filter(ano_letivo=ano)
-        return qs.none()
 
 
 @method_decorator(role_required('Admin', 'Diretor', 'Pedagogico'), name='dispatch')
@@ -187,11 +314,6 @@ class MatriculaListView(LoginRequiredMixin, AnoContextMixin, ListView):
     # def get_queryset(self):
     #    return super().get_queryset().select_related('aluno', 'turma')
 
-    def get_queryset(self):
-        ano = AnoLetivo.objects.filter(ativo=True).first()
-        qs = super().get_queryset()
-        return qs.filter(ano_letivo=ano)
-
 @method_decorator(role_required('Admin','Diretor','Pedagogico'), name='dispatch')
 class MatriculaCreateView(LoginRequiredMixin, CreateView):
     model = Matricula
@@ -244,11 +366,6 @@ class NotaListView(LoginRequiredMixin, AnoContextMixin, ListView):
     # def get_queryset(self):
     #    return super().get_queryset().select_related('aluno', 'turma', 'disciplina')
 
-    def get_queryset(self):
-        ano = AnoLetivo.objects.filter(ativo=True).first()
-        qs = super().get_queryset()
-        return qs.filter(ano_letivo=ano)
-
 @method_decorator(role_required('Admin', 'Diretor', 'Pedagogico'), name='dispatch')
 class NotaCreateView(LoginRequiredMixin, CreateView):
     model = Nota
@@ -458,17 +575,28 @@ class CalendarioDeleteView(DeleteView):
 @role_required('Admin', 'Diretor', 'Pedagogico')
 def calendario_mensal(request):
     """
-    View para exibir o calendário em formato mensal.
+    View para exibir o calendário em formato mensal, mês a mês do ano letivo
+    (e não do ano civil), com os dias não letivos assinalados.
     """
-    from django.utils import timezone
-    from .models import Calendario
-
-    ano_atual = timezone.now().year
-    meses = Calendario.objects.filter(data__year=ano_atual).order_by('data')
+    ano_id = request.GET.get('ano')
+    if ano_id:
+        ano = get_object_or_404(AnoLetivo, pk=ano_id)
+    else:
+        ano = AnoLetivo.objects.filter(ativo=True).first()
+    if not ano:
+        messages.error(request, "Não há ano letivo ativo.")
+        return redirect('pedagogico:calendario-list')
 
+    meses = [
+        (mes, calendario.grelha_mes(ano, mes))
+        for mes in calendario.meses(ano)
+    ]
     return render(request, 'pedagogico/calendario/calendario_mensal.html', {
+        'ano': ano,
+        'anos': AnoLetivo.objects.all(),
         'meses': meses,
-        'ano_atual': ano_atual,
+        'dias_letivos': len(calendario.indice(ano).dias_letivos),
+        'dias_semana': ['Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb', 'Dom'],
     })
 
 # --------------------------------
@@ -502,6 +630,59 @@ def relatorio_ano_letivo(request):
     })
 
 
+
+DIMENSOES_DESEMPENHO = [
+    ('turmas', 'Turmas'),
+    ('disciplinas', 'Disciplinas'),
+    ('professores', 'Professores'),
+    ('turma_disciplina', 'Turma × Disciplina'),
+]
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Pedagogico')
+def desempenho_academico(request):
+    """Distribuição de notas, percentis e aprovação por turma, disciplina ou professor."""
+    anos = AnoLetivo.objects.order_by('-data_inicio')
+    ano_id = request.GET.get('ano')
+    ano = anos.filter(pk=ano_id).first() if ano_id and ano_id.isdigit() else None
+    ano = ano or anos.filter(ativo=True).first()
+    dimensao = request.GET.get('dimensao')
+    if dimensao not in dict(DIMENSOES_DESEMPENHO):
+        dimensao = 'turmas'
+    resultado = analitica.analise(ano) if ano else None
+    return render(request, 'pedagogico/desempenho.html', {
+        'anos': anos,
+        'ano': ano,
+        'dimensoes': DIMENSOES_DESEMPENHO,
+        'dimensao': dimensao,
+        'analise': resultado,
+        'linhas': getattr(resultado, dimensao) if resultado else [],
+    })
+
+
+@method_decorator(role_required('Admin', 'Diretor', 'Pedagogico'), name='dispatch')
+class RiscoAlunoListView(LoginRequiredMixin, AnoContextMixin, ListView):
+    """Alunos por pontuação de risco (calculada em lote por `calcular_riscos`)."""
+    model = RiscoAluno
+    template_name = 'pedagogico/risco/risco_list.html'
+    context_object_name = 'riscos'
+    paginate_by = 20
+    ordering = ['-pontuacao']
+
+    def get_queryset(self):
+        qs = super().get_queryset().select_related('aluno')
+        nivel = self.request.GET.get('nivel')
+        if nivel in dict(RiscoAluno.NIVEL_CHOICES):
+            qs = qs.filter(nivel=nivel)
+        return qs
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx['niveis'] = RiscoAluno.NIVEL_CHOICES
+        ctx['nivel'] = self.request.GET.get('nivel', '')
+        return ctx
+
 # --------------------------------
 # CRUD de Curso
 # --------------------------------
@@ -556,6 +737,13 @@ class PreMatriculaPendentesListView(LoginRequiredMixin, AnoContextMixin, ListVie
             return qs.filter(data_solic__year=ano_int).order_by('-data_solic')
         return qs.order_by('-data_solic')
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx['cursos'] = Curso.objects.filter(ativo=True)
+        ctx['turno_choices'] = Turma.TURNO_CHOICES
+        ctx['nivel_choices'] = Turma.NIVEIS_CHOICES
+        return ctx
+
 @login_required
 @role_required('Admin','Diretor','Pedagogico')
 def confirmar_prematricula(request, pk):
@@ -565,7 +753,8 @@ def confirmar_prematricula(request, pk):
         messages.error(request, "Não há ano letivo ativo.")
         return redirect('pedagogico:prematricula-pendentes')
 
-    turmas = Turma.objects.filter(ano_letivo=ano)
+    # Turmas do curso pedido, com ocupação atual (uma só consulta agregada)
+    turmas = ocupacao_turmas(ano, curso=prem.curso)
 
     if request.method == 'POST':
         acao = request.POST.get('acao')
@@ -579,32 +768,49 @@ def confirmar_prematricula(request, pk):
 
             turma = get_object_or_404(Turma, pk=turma_id, ano_letivo=ano)
 
-            # 2) Verifica se o aluno já tem matrícula neste ano
-            existe = Matricula.objects.filter(
-                aluno=prem.aluno,
-                ano_letivo=ano
-            )
-            if existe.exists():
-                messages.error(request,
-                    "Este aluno já possui matrícula no ano letivo atual.")
-                return redirect(request.path)
-
-            # 3) Garante que turma.curso == prem.curso
+            # 2) Garante que turma.curso == prem.curso
             if turma.curso != prem.curso:
                 messages.error(request,
                     "A turma escolhida não pertence ao curso solicitado na pré‑matrícula.")
                 return redirect(request.path)
 
-            # Tudo OK → cria matrícula
-            Matricula.objects.create(
-                aluno=prem.aluno,
-                turma=turma,
-                curso=turma.curso,
-                ano_letivo=ano,
-                data_matricula=timezone.now().date()
-            )
-            prem.status = 'APROVADA'
-            prem.save()
+            # Turma e pedido bloqueados até ao fim: a contagem de vagas e a
+            # matrícula não se cruzam com alocar_prematriculas nem com outra
+            # confirmação em simultâneo.
+            with transaction.atomic():
+                turma = Turma.objects.select_for_update().get(pk=turma.pk)
+                prem = PreMatricula.objects.select_for_update().filter(pk=prem.pk, status='PENDENTE').first()
+                if prem is None:
+                    messages.error(request, "Esta pré‑matrícula já foi tratada.")
+                    return redirect('pedagogico:prematricula-pendentes')
+
+                # 3) Verifica se o aluno já tem matrícula neste ano
+                existe = Matricula.objects.filter(
+                    aluno_id=prem.aluno_id,
+                    ano_letivo=ano
+                )
+                if existe.exists():
+                    messages.error(request,
+                        "Este aluno já possui matrícula no ano letivo atual.")
+                    return redirect(request.path)
+
+                # 4) Respeita a capacidade da turma
+                ocupadas = Matricula.objects.filter(turma=turma, status='ATIVO').count()
+                if ocupadas >= turma.capacidade:
+                    messages.error(request,
+                        f"A turma {turma.nome} está lotada ({ocupadas}/{turma.capacidade}).")
+                    return redirect(request.path)
+
+                # Tudo OK → cria matrícula
+                Matricula.objects.create(
+                    aluno_id=prem.aluno_id,
+                    turma=turma,
+                    curso=turma.curso,
+                    ano_letivo=ano,
+                    data_matricula=timezone.now().date()
+                )
+                prem.status = 'APROVADA'
+                prem.save(update_fields=['status'])
             messages.success(request, "Pré‑matrícula aprovada.")
             return redirect('pedagogico:prematricula-pendentes')
 
@@ -619,6 +825,39 @@ def confirmar_prematricula(request, pk):
         'turmas': turmas,
     })
 
+@login_required
+@role_required('Admin','Diretor','Pedagogico')
+def alocar_turmas(request):
+    """
+    Aloca automaticamente as pré-matrículas pendentes de um curso nas turmas
+    do ano letivo ativo, respeitando a capacidade e equilibrando a ocupação.
+    """
+    if request.method != 'POST':
+        return redirect('pedagogico:prematricula-pendentes')
+
+    curso = get_object_or_404(Curso, pk=request.POST.get('curso'))
+    if not AnoLetivo.objects.filter(ativo=True).exists():
+        messages.error(request, "Não há ano letivo ativo.")
+        return redirect('pedagogico:prematricula-pendentes')
+
+    resultado = alocar_prematriculas(
+        curso,
+        turno=request.POST.get('turno') or None,
+        nivel=request.POST.get('nivel') or None,
+    )
+    if resultado.alocadas:
+        messages.success(request,
+            f"{len(resultado.alocadas)} pré‑matrícula(s) de {curso.nome} alocada(s) automaticamente.")
+    if resultado.sem_vaga:
+        messages.warning(request,
+            f"{len(resultado.sem_vaga)} pré‑matrícula(s) ficaram pendentes por falta de vagas.")
+    if resultado.ja_matriculados:
+        messages.warning(request,
+            f"{len(resultado.ja_matriculados)} aluno(s) já possuem matrícula neste ano e foram ignorados.")
+    if not any(resultado):
+        messages.info(request, "Não há pré‑matrículas pendentes para este curso.")
+    return redirect('pedagogico:prematricula-pendentes')
+
 # --------------------------------
 # CRUD de Confirmação de Matrícula
 # --------------------------------
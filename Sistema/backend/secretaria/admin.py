@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Encarregado, Aluno, Fatura, Recibo, ContaCorrente
+from .models import (
+    Encarregado, Aluno, Fatura, Recibo, ContaCorrente, PrecoCurso, SequenciaDocumento,
+    RegraEncargo, EncargoFatura, ImportacaoExtrato, MovimentoBancario,
+)
 
 @admin.register(Encarregado)
 class EncarregadoAdmin(admin.ModelAdmin):
@@ -16,7 +19,7 @@ class AlunoAdmin(admin.ModelAdmin):
 
 @admin.register(Fatura)
 class FaturaAdmin(admin.ModelAdmin):
-    list_display = ('numero', 'aluno', 'tipo', 'valor_atual', 'status', 'data_vencimento')
+    list_display = ('numero', 'aluno', 'tipo', 'competencia', 'valor_atual', 'encargos', 'status', 'data_vencimento')
     list_filter = ('tipo', 'status')
     search_fields = ('numero', 'aluno__nome')
     raw_id_fields = ('aluno',)
@@ -33,4 +36,40 @@ class ReciboAdmin(admin.ModelAdmin):
 class ContaCorrenteAdmin(admin.ModelAdmin):
     list_display = ('aluno', 'total_debito', 'total_credito', 'saldo')
     search_fields = ('aluno__matricula', 'aluno__nome')
-    raw_id_fields = ('aluno',)
\ No newline at end of file
+    raw_id_fields = ('aluno',)
+
+@admin.register(PrecoCurso)
+class PrecoCursoAdmin(admin.ModelAdmin):
+    list_display = ('curso', 'servico', 'valor', 'ativo')
+    list_filter = ('ativo', 'curso')
+    search_fields = ('curso__nome', 'servico__descricao')
+
+@admin.register(SequenciaDocumento)
+class SequenciaDocumentoAdmin(admin.ModelAdmin):
+    list_display = ('serie', 'ano', 'ultimo')
+    list_filter = ('serie',)
+
+@admin.register(RegraEncargo)
+class RegraEncargoAdmin(admin.ModelAdmin):
+    list_display = ('tipo', 'multa_percentual', 'juros_mensal_percentual', 'carencia_dias', 'teto_percentual', 'ativo')
+    list_filter = ('ativo',)
+
+@admin.register(EncargoFatura)
+class EncargoFaturaAdmin(admin.ModelAdmin):
+    list_display = ('fatura', 'data', 'dias_atraso', 'multa', 'juros', 'acrescimo')
+    search_fields = ('fatura__numero', 'fatura__aluno__nome')
+    raw_id_fields = ('fatura',)
+    date_hierarchy = 'data'
+
+@admin.register(ImportacaoExtrato)
+class ImportacaoExtratoAdmin(admin.ModelAdmin):
+    list_display = ('ficheiro', 'formato', 'importado_em', 'importado_por', 'movimentos', 'conciliados')
+    list_filter = ('formato',)
+
+@admin.register(MovimentoBancario)
+class MovimentoBancarioAdmin(admin.ModelAdmin):
+    list_display = ('data', 'valor', 'descricao', 'estado', 'fatura', 'recibo')
+    list_filter = ('estado',)
+    search_fields = ('descricao', 'fatura__numero')
+    raw_id_fields = ('fatura', 'recibo')
+    date_hierarchy = 'data'
@@ -0,0 +1,165 @@
+# Sistema/backend/secretaria/antiguidade.py
+"""
+Antiguidade dos saldos a receber (aging).
+
+O valor em aberto (faturas PENDENTE/VENCIDO, pelo valor atual) é repartido
+por faixas de dias de atraso em relação a hoje: a vencer, 0–30, 31–60, 61–90
+e mais de 90. As faixas são intervalos de data_vencimento, por isso cada
+relatório é um único aggregate agrupado com somas condicionais (CASE), sem
+calcular o atraso fatura a fatura em Python.
+
+Agrupa-se por aluno, encarregado, curso ou turma; curso e turma vêm da
+matrícula do aluno no ano letivo ativo (subconsulta), e quem não tem
+matrícula nesse ano fica no grupo "Sem matrícula".
+"""
+
+import csv
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Case, Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from pedagogico.models import AnoLetivo, Curso, Matricula, Turma
+from .busca import alunos as alunos_correspondentes
+from .models import Fatura
+
+Faixa = namedtuple('Faixa', 'chave rotulo')
+FAIXAS = [
+    Faixa('a_vencer', 'A vencer'),
+    Faixa('d0_30', '0–30 dias'),
+    Faixa('d31_60', '31–60 dias'),
+    Faixa('d61_90', '61–90 dias'),
+    Faixa('d90', '+90 dias'),
+]
+
+# dimensão → (campo de agrupamento, campos descritivos)
+DIMENSOES = {
+    'aluno': ('aluno_id', ('aluno__nome', 'aluno__matricula')),
+    'encarregado': ('aluno__encarregado_id', ('aluno__encarregado__nome', 'aluno__encarregado__telefone')),
+    'curso': ('curso_id', ()),
+    'turma': ('turma_id', ()),
+}
+ROTULOS_DIMENSAO = {'aluno': 'Aluno', 'encarregado': 'Encarregado', 'curso': 'Curso', 'turma': 'Turma'}
+
+# celulas: [(faixa, valor)] pela ordem de FAIXAS
+Linha = namedtuple('Linha', 'chave nome detalhe celulas total faturas')
+
+
+def condicoes(hoje=None):
+    """{faixa: Q} sobre data_vencimento."""
+    hoje = hoje or timezone.localdate()
+    d30, d60, d90 = (hoje - timedelta(days=n) for n in (30, 60, 90))
+    return {
+        'a_vencer': Q(data_vencimento__gte=hoje),
+        'd0_30': Q(data_vencimento__lt=hoje, data_vencimento__gte=d30),
+        'd31_60': Q(data_vencimento__lt=d30, data_vencimento__gte=d60),
+        'd61_90': Q(data_vencimento__lt=d60, data_vencimento__gte=d90),
+        'd90': Q(data_vencimento__lt=d90),
+    }
+
+
+def _valor():
+    return Coalesce('valor_atual', 'valor_original')
+
+
+def _somas(hoje):
+    decimal = DecimalField(max_digits=14, decimal_places=2)
+    somas = {
+        faixa: Sum(Case(When(q, then=_valor()), default=Value(Decimal('0')), output_field=decimal))
+        for faixa, q in condicoes(hoje).items()
+    }
+    somas['total'] = Sum(_valor(), output_field=decimal)
+    somas['faturas'] = Count('pk')
+    return somas
+
+
+def em_aberto(ano=None):
+    """Faturas em aberto, anotadas com a turma e o curso da matrícula no ano letivo ativo."""
+    ano = ano or AnoLetivo.objects.filter(ativo=True).first()
+    matricula = Matricula.objects.filter(aluno=OuterRef('aluno_id'), ano_letivo=ano)
+    return Fatura.objects.filter(status__in=['PENDENTE', 'VENCIDO']).annotate(
+        turma_id=Subquery(matricula.values('turma_id')[:1]),
+        curso_id=Subquery(matricula.annotate(c=Coalesce('curso_id', 'turma__curso_id')).values('c')[:1]),
+    )
+
+
+def relatorio(dimensao='aluno', hoje=None, busca=''):
+    """
+    Linhas agrupadas por `dimensao` (dicts com a chave, os descritivos, uma
+    soma por faixa, total e nº de faturas), das maiores dívidas para as menores.
+    """
+    campo, descritivos = DIMENSOES[dimensao]
+    qs = em_aberto()
+    if busca:
+        qs = qs.filter(aluno_id__in=alunos_correspondentes(busca))
+    return (
+        qs.order_by()
+        .values(*descritivos, chave=F(campo))
+        .annotate(**_somas(hoje))
+        .order_by('-total', 'chave')
+    )
+
+
+def totais(hoje=None):
+    """Somas por faixa de todas as faturas em aberto (um aggregate)."""
+    return Fatura.objects.filter(status__in=['PENDENTE', 'VENCIDO']).aggregate(**_somas(hoje))
+
+
+def linhas(dimensao, registos):
+    """Converte os dicts de `relatorio` em Linha, com os nomes de cursos/turmas de uma só vez."""
+    registos = list(registos)
+    _, descritivos = DIMENSOES[dimensao]
+    nomes = {}
+    if dimensao in ('curso', 'turma'):
+        modelo = Curso if dimensao == 'curso' else Turma
+        nomes = dict(modelo.objects.filter(pk__in=[r['chave'] for r in registos]).values_list('pk', 'nome'))
+    resultado = []
+    for r in registos:
+        if descritivos:
+            nome, detalhe = r[descritivos[0]], r[descritivos[1]]
+        else:
+            nome, detalhe = nomes.get(r['chave'], 'Sem matrícula'), ''
+        resultado.append(Linha(
+            r['chave'], nome, detalhe, [(f.chave, r[f.chave] or 0) for f in FAIXAS], r['total'] or 0, r['faturas'],
+        ))
+    return resultado
+
+
+def faturas(dimensao, chave, faixa=None, hoje=None):
+    """Faturas em aberto de um grupo (e faixa) do relatório, para o detalhe."""
+    campo, _ = DIMENSOES[dimensao]
+    filtro = {f'{campo}__isnull': True} if chave is None else {campo: chave}
+    qs = em_aberto().filter(**filtro).select_related('aluno')
+    if faixa in dict(FAIXAS):
+        qs = qs.filter(condicoes(hoje)[faixa])
+    return qs.order_by('data_vencimento', 'pk')
+
+
+class _Linha:
+    """Escritor para o csv.writer: cada writerow devolve o texto da linha."""
+    def write(self, valor):
+        return valor
+
+
+def csv_linhas(dimensao, hoje=None, busca=''):
+    """Exportação CSV de todo o relatório, linha a linha (StreamingHttpResponse)."""
+    escritor = csv.writer(_Linha(), delimiter=';')
+    yield '\ufeff'  # BOM, para o Excel abrir os acentos corretamente
+    yield escritor.writerow([ROTULOS_DIMENSAO[dimensao], '', *[f.rotulo for f in FAIXAS], 'Total', 'Faturas'])
+    registos = relatorio(dimensao, hoje, busca)
+    # lotes de 500: os nomes de curso/turma são resolvidos por lote
+    lote = []
+    for registo in registos.iterator(chunk_size=500):
+        lote.append(registo)
+        if len(lote) == 500:
+            yield from _csv_lote(escritor, dimensao, lote)
+            lote = []
+    yield from _csv_lote(escritor, dimensao, lote)
+
+
+def _csv_lote(escritor, dimensao, lote):
+    for l in linhas(dimensao, lote):
+        yield escritor.writerow([l.nome, l.detalhe, *[v for _, v in l.celulas], l.total, l.faturas])
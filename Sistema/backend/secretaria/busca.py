@@ -0,0 +1,123 @@
+# Sistema/backend/secretaria/busca.py
+"""
+Pesquisa de alunos e encarregados.
+
+Em vez de `aluno__nome__icontains` (varrimento da tabela de alunos, e só pelo
+nome), cada aluno e encarregado tem uma linha em IndiceBusca com o texto
+pesquisável já normalizado (minúsculas, sem acentos): nome, matrícula,
+documento, nome e telefone do encarregado. Cada termo da pesquisa tem de
+aparecer no texto (LIKE '%termo%'); em PostgreSQL o índice GIN de trigramas
+(pg_trgm) responde a estes LIKE sem varrer a tabela e os resultados são
+ordenados por semelhança; nas outras bases o LIKE corre sobre a tabela
+estreita do índice.
+
+O índice é mantido pelos sinais de Aluno e Encarregado (secretaria/signals.py);
+`manage.py reindexar_busca` reconstrói-o de raiz.
+"""
+
+import re
+import unicodedata
+
+from django.db import connection
+from django.urls import reverse
+
+from .models import Aluno, Encarregado, IndiceBusca
+
+LIMITE = 20
+LOTE = 2000
+
+
+def normalizar(texto):
+    """'  José  ÁLVARES ' → 'jose alvares'."""
+    texto = unicodedata.normalize('NFKD', str(texto or ''))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.lower().split())
+
+
+def _digitos(texto):
+    return re.sub(r'\D', '', texto or '')
+
+
+def _entrada_aluno(aluno):
+    enc = aluno.encarregado
+    return IndiceBusca(
+        tipo='ALUNO', objeto_id=aluno.pk, titulo=aluno.nome[:150],
+        detalhe=f'Matrícula {aluno.matricula} · {enc.nome}'[:255],
+        texto=normalizar(' '.join([
+            aluno.nome, aluno.matricula, aluno.documento, enc.nome, enc.telefone, _digitos(enc.telefone),
+        ])),
+    )
+
+
+def _entrada_encarregado(enc):
+    return IndiceBusca(
+        tipo='ENCARREGADO', objeto_id=enc.pk, titulo=enc.nome[:150],
+        detalhe=' · '.join(filter(None, [enc.telefone, enc.email]))[:255],
+        texto=normalizar(' '.join([enc.nome, enc.telefone, _digitos(enc.telefone), enc.email])),
+    )
+
+
+def _gravar(entradas):
+    IndiceBusca.objects.bulk_create(
+        entradas, batch_size=1000,
+        update_conflicts=True, unique_fields=['tipo', 'objeto_id'], update_fields=['titulo', 'detalhe', 'texto'],
+    )
+    return len(entradas)
+
+
+def indexar_alunos(alunos):
+    """Atualiza as entradas dos `alunos` (queryset). Retorna quantas gravou."""
+    total = 0
+    lote = []
+    for aluno in alunos.select_related('encarregado').iterator(chunk_size=LOTE):
+        lote.append(_entrada_aluno(aluno))
+        if len(lote) == LOTE:
+            total += _gravar(lote)
+            lote = []
+    return total + _gravar(lote)
+
+
+def indexar_encarregados(encarregados):
+    """Atualiza as entradas dos `encarregados` (queryset ou lista). Retorna quantas gravou."""
+    return _gravar([_entrada_encarregado(e) for e in encarregados])
+
+
+def remover(tipo, pk):
+    IndiceBusca.objects.filter(tipo=tipo, objeto_id=pk).delete()
+
+
+def reindexar():
+    """Reconstrói o índice inteiro. Retorna (alunos, encarregados)."""
+    alunos = indexar_alunos(Aluno.objects.all())
+    encarregados = indexar_encarregados(Encarregado.objects.all())
+    # entradas de registos apagados sem passar pelos sinais
+    IndiceBusca.objects.filter(tipo='ALUNO').exclude(objeto_id__in=Aluno.objects.values('pk')).delete()
+    IndiceBusca.objects.filter(tipo='ENCARREGADO').exclude(objeto_id__in=Encarregado.objects.values('pk')).delete()
+    return alunos, encarregados
+
+
+def procurar(termo, tipo=None):
+    """Entradas do índice que contêm todos os termos de `termo`, as mais parecidas primeiro."""
+    termo = normalizar(termo)
+    qs = IndiceBusca.objects.all()
+    if tipo:
+        qs = qs.filter(tipo=tipo)
+    if not termo:
+        return qs.none()
+    for parte in termo.split():
+        qs = qs.filter(texto__contains=parte)
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramSimilarity
+        return qs.annotate(semelhanca=TrigramSimilarity('texto', termo)).order_by('-semelhanca', 'titulo')
+    return qs.order_by('titulo')
+
+
+def alunos(termo):
+    """pks dos alunos que correspondem a `termo` (subconsulta para filtrar faturas, contas, ...)."""
+    return procurar(termo, 'ALUNO').order_by().values('objeto_id')
+
+
+def url(entrada):
+    if entrada.tipo == 'ALUNO':
+        return reverse('secretaria:aluno-edit', args=[entrada.objeto_id])
+    return reverse('secretaria:encarregado-edit', args=[entrada.objeto_id])
@@ -0,0 +1,120 @@
+# Sistema/backend/secretaria/cobranca.py
+"""
+Emissão em lote das mensalidades do mês.
+
+Para cada matrícula ativa do ano letivo, o curso (da matrícula ou, na falta,
+da turma) dá na tabela PrecoCurso os serviços a cobrar. Os alunos que já têm a
+mensalidade do mês (Fatura.competencia) ficam de fora, por isso voltar a
+correr o mesmo mês só emite o que falta.
+
+Tudo numa transação: os números são reservados de uma vez
+(secretaria/numeracao.py), faturas e itens entram com bulk_create (sem os
+sinais por fatura) e, no fim, as contas correntes dos alunos são recalculadas
+numa só passagem e as faturas novas contabilizadas pelas regras de lançamento.
+"""
+
+import calendar
+from collections import defaultdict, namedtuple
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from pedagogico.models import AnoLetivo, Matricula
+from . import numeracao, saldos
+from .models import Fatura, FaturaServico, PrecoCurso
+
+# dia do mês em que vence a mensalidade, por omissão
+DIA_VENCIMENTO = 10
+
+ResultadoCobranca = namedtuple('ResultadoCobranca', 'mes emitidas ja_emitidas sem_preco valor_total por_curso')
+
+
+def vencimento(mes, dia=DIA_VENCIMENTO):
+    return mes.replace(day=min(dia, calendar.monthrange(mes.year, mes.month)[1]))
+
+
+def tabela_precos():
+    """{curso_id: [(servico_id, preço)]} dos preços ativos."""
+    tabela = defaultdict(list)
+    for p in PrecoCurso.objects.filter(ativo=True, servico__ativo=True).select_related('servico'):
+        tabela[p.curso_id].append((p.servico_id, p.preco))
+    return tabela
+
+
+def _matriculas(ano, mes):
+    """(aluno_id, curso_id) das matrículas ativas ainda sem mensalidade do mês."""
+    ja_emitida = Fatura.objects.filter(aluno=OuterRef('aluno_id'), tipo='MENSALIDADE', competencia=mes)
+    return (
+        Matricula.objects.filter(ano_letivo=ano, status='ATIVO', aluno__status='ATIVO')
+        .annotate(curso_cobrado=Coalesce('curso_id', 'turma__curso_id'), emitida=Exists(ja_emitida))
+        .order_by('aluno__nome')
+        .values_list('aluno_id', 'curso_cobrado', 'emitida')
+    )
+
+
+def emitir_mensalidades(mes=None, ano=None, dia_vencimento=DIA_VENCIMENTO, data_emissao=None, simular=False):
+    """
+    Emite as mensalidades de `mes` (mês corrente por omissão) para as matrículas
+    ativas de `ano` (ano letivo ativo por omissão). Com `simular`, só calcula.
+    """
+    hoje = timezone.localdate()
+    mes = (mes or hoje).replace(day=1)
+    ano = ano or AnoLetivo.objects.filter(ativo=True).first()
+    data_emissao = data_emissao or hoje
+    if ano is None:
+        return ResultadoCobranca(mes, 0, 0, 0, Decimal('0'), {})
+
+    precos = tabela_precos()
+    a_emitir, ja_emitidas, sem_preco = [], 0, 0
+    por_curso = defaultdict(lambda: [0, Decimal('0')])
+    for aluno, curso, emitida in _matriculas(ano, mes):
+        if emitida:
+            ja_emitidas += 1
+            continue
+        itens = precos.get(curso)
+        if not itens:
+            sem_preco += 1
+            continue
+        total = sum((preco for _, preco in itens), Decimal('0'))
+        a_emitir.append((aluno, itens, total))
+        por_curso[curso][0] += 1
+        por_curso[curso][1] += total
+
+    valor_total = sum((total for _, _, total in a_emitir), Decimal('0'))
+    resultado = ResultadoCobranca(
+        mes, len(a_emitir), ja_emitidas, sem_preco, valor_total,
+        {curso: tuple(v) for curso, v in por_curso.items()},
+    )
+    if simular or not a_emitir:
+        return resultado
+
+    with transaction.atomic():
+        numeros = numeracao.reservar('FATURA', data_emissao.year, len(a_emitir))
+        faturas = Fatura.objects.bulk_create([
+            Fatura(
+                numero=numero,
+                aluno_id=aluno,
+                tipo='MENSALIDADE',
+                valor_original=total,
+                valor_atual=total,
+                data_emissao=data_emissao,
+                data_vencimento=vencimento(mes, dia_vencimento),
+                status='PENDENTE',
+                competencia=mes,
+                observacoes=f'Mensalidade {mes:%m/%Y}',
+            )
+            for numero, (aluno, _, total) in zip(numeros, a_emitir)
+        ], batch_size=1000)
+        FaturaServico.objects.bulk_create([
+            FaturaServico(fatura=fatura, servico_id=servico, quantidade=1, valor_unitario=preco)
+            for fatura, (_, itens, _) in zip(faturas, a_emitir)
+            for servico, preco in itens
+        ], batch_size=1000)
+        saldos.atualizar_contas([aluno for aluno, _, _ in a_emitir])
+        # bulk_create não passa pelos sinais de contabilização
+        from administrativo.contabilizacao import contabilizar_periodo
+        contabilizar_periodo(data_emissao, data_emissao, origens=['FATURA'])
+    return resultado
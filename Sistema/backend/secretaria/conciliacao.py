@@ -0,0 +1,277 @@
+# Sistema/backend/secretaria/conciliacao.py
+"""
+Conciliação de extratos bancários (CSV ou OFX, Multicaixa incluído).
+
+Os créditos do extrato são comparados com as faturas em aberto, lidas numa
+só consulta e indexadas em memória (dicionários) por número, por telefone do
+encarregado e por valor:
+
+- número da fatura no descritivo e valor igual ao valor atual → conciliado;
+- telefone do encarregado no descritivo e uma única fatura desse encarregado
+  com o mesmo valor → conciliado;
+- tudo o resto (valor diferente, várias candidatas, só o valor coincide,
+  nenhuma pista) fica em revisão, com a fatura sugerida quando há uma.
+
+Os conciliados geram os recibos em lote (secretaria/pagamentos.py). Cada
+movimento guarda uma chave (FITID / referência, ou hash de data, valor,
+descritivo e ocorrência), por isso importar de novo o mesmo extrato, ou um
+que se sobreponha, não duplica nada.
+"""
+
+import csv
+import hashlib
+import io
+import re
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from . import pagamentos
+from .models import Fatura, ImportacaoExtrato, MovimentoBancario
+
+Movimento = namedtuple('Movimento', 'chave data valor descricao')
+ResultadoConciliacao = namedtuple('ResultadoConciliacao', 'importacao movimentos repetidos conciliados revisao')
+
+FORMA_PAGAMENTO = 'TRANSFERÊNCIA'
+
+RE_NUMERO = re.compile(r'\b(\d{4})\s*/\s*(\d{1,6})\b')
+# telemóveis angolanos: 9 dígitos começados por 9, com ou sem o indicativo 244
+RE_TELEFONE = re.compile(r'(?<!\d)(?:00244|\+?244)?\s?(9\d{2})\s?(\d{3})\s?(\d{3})(?!\d)')
+
+COLUNAS = {
+    'data': ('data', 'data movimento', 'data valor', 'data mov.', 'date'),
+    'valor': ('valor', 'montante', 'crédito', 'credito', 'amount'),
+    'descricao': ('descrição', 'descricao', 'descritivo', 'movimento', 'memo', 'description'),
+    'referencia': ('referência', 'referencia', 'ref', 'id', 'fitid'),
+}
+
+
+# --------------------------------
+# Leitura dos ficheiros
+# --------------------------------
+
+def _valor(texto):
+    """
+    '1.234,56', '1,234.56', '1234.56' ou '1 234,56 Kz' → Decimal. O último
+    separador (',' ou '.') é o decimal, a não ser que se repita ('1.234.567');
+    os outros são de milhares. Mais de duas casas decimais → None.
+    """
+    texto = re.sub(r'[^\d,.\-]', '', texto or '')
+    i = max(texto.rfind(','), texto.rfind('.'))
+    inteiro, decimais = texto, ''
+    if i >= 0 and texto.count(texto[i]) == 1:
+        inteiro, decimais = texto[:i], texto[i + 1:]
+    numero = inteiro.replace(',', '').replace('.', '') + (f'.{decimais}' if decimais else '')
+    try:
+        valor = Decimal(numero)
+    except InvalidOperation:
+        return None
+    return valor if valor.as_tuple().exponent >= -2 else None
+
+
+def _data(texto):
+    texto = (texto or '').strip()
+    for formato in ('%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d.%m.%Y', '%Y%m%d'):
+        try:
+            return datetime.strptime(texto[:10] if formato != '%Y%m%d' else texto[:8], formato).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _hash(*partes):
+    return hashlib.sha1('|'.join(str(p) for p in partes).encode()).hexdigest()
+
+
+class _Chaves:
+    """
+    Chaves dos movimentos sem referência do banco: (data, valor, descritivo) e
+    a ocorrência dessa combinação no ficheiro. Duas transferências iguais no
+    mesmo dia ficam distintas, e um extrato alargado ou sobreposto volta a dar
+    as mesmas chaves às mesmas linhas (o número da linha mudaria).
+    """
+
+    def __init__(self):
+        self.ocorrencias = defaultdict(int)
+
+    def __call__(self, data, valor, descricao):
+        self.ocorrencias[(data, valor, descricao)] += 1
+        n = self.ocorrencias[(data, valor, descricao)]
+        return _hash(data, valor, descricao) if n == 1 else _hash(data, valor, descricao, n)
+
+
+def ler_csv(conteudo):
+    """Créditos de um extrato CSV (cabeçalho com data, valor e descritivo)."""
+    texto = conteudo.decode('utf-8-sig', errors='replace') if isinstance(conteudo, bytes) else conteudo
+    try:
+        dialeto = csv.Sniffer().sniff(texto[:4096], delimiters=';,\t')
+    except csv.Error:
+        dialeto = csv.excel
+    leitor = csv.reader(io.StringIO(texto), dialeto)
+    cabecalho = [c.strip().lower() for c in next(leitor, [])]
+    indices = {
+        campo: next((i for i, c in enumerate(cabecalho) if c in nomes), None)
+        for campo, nomes in COLUNAS.items()
+    }
+    if indices['data'] is None or indices['valor'] is None:
+        raise ValueError('O CSV precisa das colunas de data e valor.')
+
+    def coluna(linha, campo):
+        i = indices[campo]
+        return linha[i].strip() if i is not None and i < len(linha) else ''
+
+    movimentos, chaves = [], _Chaves()
+    for linha in leitor:
+        data, valor = _data(coluna(linha, 'data')), _valor(coluna(linha, 'valor'))
+        if not data or not valor or valor <= 0:
+            continue  # linhas de saldo, débitos e rodapés
+        descricao = coluna(linha, 'descricao')
+        referencia = coluna(linha, 'referencia')
+        chave = _hash('REF', referencia) if referencia else chaves(data, valor, descricao)
+        movimentos.append(Movimento(chave, data, valor, descricao[:255]))
+    return movimentos
+
+
+RE_OFX_TRANSACAO = re.compile(r'<STMTTRN>(.*?)(?:</STMTTRN>|(?=<STMTTRN>)|</BANKTRANLIST>)', re.S | re.I)
+
+
+def _ofx_campo(bloco, nome):
+    m = re.search(rf'<{nome}>([^<\r\n]*)', bloco, re.I)
+    return m.group(1).strip() if m else ''
+
+
+def ler_ofx(conteudo):
+    """Créditos de um extrato OFX (SGML 1.x ou XML 2.x)."""
+    texto = conteudo.decode('latin-1') if isinstance(conteudo, bytes) else conteudo
+    movimentos, chaves = [], _Chaves()
+    for bloco in RE_OFX_TRANSACAO.findall(texto):
+        data, valor = _data(_ofx_campo(bloco, 'DTPOSTED')), _valor(_ofx_campo(bloco, 'TRNAMT'))
+        if not data or not valor or valor <= 0:
+            continue
+        descricao = ' '.join(filter(None, [_ofx_campo(bloco, 'NAME'), _ofx_campo(bloco, 'MEMO')]))
+        fitid = _ofx_campo(bloco, 'FITID')
+        chave = _hash('REF', fitid) if fitid else chaves(data, valor, descricao)
+        movimentos.append(Movimento(chave, data, valor, descricao[:255]))
+    return movimentos
+
+
+def ler(nome, conteudo):
+    """(formato, movimentos) conforme a extensão do ficheiro."""
+    if nome.lower().endswith('.ofx'):
+        return 'OFX', ler_ofx(conteudo)
+    return 'CSV', ler_csv(conteudo)
+
+
+# --------------------------------
+# Correspondência
+# --------------------------------
+
+def _telefone(texto):
+    return re.sub(r'\D', '', texto or '')[-9:]
+
+
+class Indices:
+    """Faturas em aberto indexadas por número, telefone do encarregado e valor."""
+
+    def __init__(self):
+        self.por_numero, self.por_telefone, self.por_valor = {}, defaultdict(list), defaultdict(list)
+        faturas = Fatura.objects.filter(status__in=['PENDENTE', 'VENCIDO'], recibo__isnull=True).values_list(
+            'pk', 'numero', 'valor_atual', 'valor_original', 'data_vencimento', 'aluno__encarregado__telefone',
+        ).order_by('data_vencimento', 'pk')
+        for pk, numero, atual, original, vencimento, telefone in faturas:
+            valor = atual if atual is not None else original
+            if numero:
+                self.por_numero[numero] = (pk, valor)
+            if telefone:
+                self.por_telefone[_telefone(telefone)].append((pk, valor))
+            self.por_valor[valor].append((pk, valor))
+
+    def corresponder(self, movimento, usadas):
+        """(fatura_id ou None, confiante, motivo); `usadas` são as faturas já atribuídas no extrato."""
+        def livres(candidatas):
+            return [c for c in candidatas if c[0] not in usadas]
+
+        for ano, seq in RE_NUMERO.findall(movimento.descricao):
+            fatura = self.por_numero.get(f'{ano}/{int(seq):04d}') or self.por_numero.get(f'{ano}/{seq}')
+            if fatura and fatura[0] not in usadas:
+                if fatura[1] == movimento.valor:
+                    return fatura[0], True, ''
+                return fatura[0], False, 'Valor diferente do da fatura'
+
+        for partes in RE_TELEFONE.findall(movimento.descricao):
+            candidatas = livres(self.por_telefone.get(''.join(partes), []))
+            mesmo_valor = [c for c in candidatas if c[1] == movimento.valor]
+            if len(mesmo_valor) == 1:
+                return mesmo_valor[0][0], True, ''
+            if mesmo_valor:
+                return mesmo_valor[0][0], False, 'Várias faturas do encarregado com este valor'
+            if candidatas:
+                return None, False, 'Encarregado sem fatura com este valor'
+
+        candidatas = livres(self.por_valor.get(movimento.valor, []))
+        if len(candidatas) == 1:
+            return candidatas[0][0], False, 'Só o valor coincide'
+        if candidatas:
+            return None, False, f'{len(candidatas)} faturas com este valor'
+        return None, False, 'Sem correspondência'
+
+
+def importar(nome, conteudo, importado_por=None):
+    """Lê o extrato, concilia o que for seguro e põe o resto em revisão."""
+    formato, movimentos = ler(nome, conteudo)
+    existentes = set(
+        MovimentoBancario.objects.filter(chave__in=[m.chave for m in movimentos]).values_list('chave', flat=True)
+    )
+    novos = [m for m in movimentos if m.chave not in existentes]
+
+    indices = Indices()
+    usadas, registos, confirmados = set(), [], []
+    for m in novos:
+        fatura_id, confiante, motivo = indices.corresponder(m, usadas)
+        if fatura_id:
+            usadas.add(fatura_id)
+        registos.append(MovimentoBancario(
+            chave=m.chave, data=m.data, valor=m.valor, descricao=m.descricao, fatura_id=fatura_id,
+            estado='CONCILIADO' if confiante else 'REVISAO', motivo=motivo,
+        ))
+        if confiante:
+            confirmados.append(registos[-1])
+
+    with transaction.atomic():
+        importacao = ImportacaoExtrato.objects.create(
+            ficheiro=nome[:255], formato=formato, importado_por=importado_por, movimentos=len(novos),
+        )
+        for r in registos:
+            r.importacao = importacao
+        MovimentoBancario.objects.bulk_create(registos, batch_size=1000)
+        conciliados = conciliar(confirmados, importado_por)
+        importacao.conciliados = conciliados
+        importacao.save(update_fields=['conciliados'])
+
+    return ResultadoConciliacao(
+        importacao, len(novos), len(movimentos) - len(novos), conciliados, len(registos) - conciliados
+    )
+
+
+def conciliar(movimentos, lancado_por=None):
+    """
+    Gera os recibos dos `movimentos` (com fatura) e marca-os CONCILIADO; os
+    que a fatura já não aceita (entretanto paga) voltam para revisão.
+    """
+    resultado = pagamentos.registrar(
+        [
+            pagamentos.Pagamento(m.fatura_id, m.data, FORMA_PAGAMENTO, m.valor, f'Extrato bancário: {m.descricao}')
+            for m in movimentos
+        ],
+        lancado_por=lancado_por,
+    )
+    recibos = {r.fatura_id: r for r in resultado.recibos}
+    for m in movimentos:
+        recibo = recibos.pop(m.fatura_id, None)
+        m.recibo = recibo
+        m.estado = 'CONCILIADO' if recibo else 'REVISAO'
+        m.motivo = '' if recibo else 'Fatura já paga'
+    MovimentoBancario.objects.bulk_update(movimentos, ['recibo', 'estado', 'motivo', 'fatura'], batch_size=1000)
+    return len(resultado.recibos)
@@ -0,0 +1,108 @@
+# Sistema/backend/secretaria/encargos.py
+"""
+Multa e juros de mora das faturas vencidas.
+
+Corre uma vez por dia, pelo comando aplicar_encargos (as listas de faturas só
+leem o resultado):
+
+1. um único UPDATE passa a VENCIDO as faturas pendentes com vencimento
+   anterior a hoje;
+2. para as faturas vencidas dos tipos com RegraEncargo ativa, os encargos a que
+   têm direito hoje (sobre o valor original) são comparados com os já
+   aplicados (Fatura.encargos); só a diferença entra em valor_atual, por isso
+   correr de novo no mesmo dia não muda nada e os ajustes manuais ao valor
+   atual são preservados;
+3. as faturas alteradas são gravadas com bulk_update em lotes, o histórico com
+   bulk_create e as contas correntes dos alunos afetados são recalculadas numa
+   só passagem (secretaria/saldos.py);
+4. os lançamentos contábeis dessas faturas são postos em dia em lote
+   (administrativo/contabilizacao.recontabilizar), e os saldos mensais
+   recebem só as diferenças.
+"""
+
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import pagamentos, saldos
+from .models import EncargoFatura, Fatura, RegraEncargo
+
+CENTIMO = Decimal('0.01')
+CEM = Decimal('100')
+
+ResultadoEncargos = namedtuple('ResultadoEncargos', 'data vencidas faturas acrescimo contas')
+
+
+def _arredondar(valor):
+    return valor.quantize(CENTIMO, rounding=ROUND_HALF_UP)
+
+
+def calcular(regra, valor_original, dias):
+    """(multa, juros) devidos por uma fatura de `valor_original` com `dias` de atraso."""
+    zero = Decimal('0')
+    if dias <= regra.carencia_dias:
+        return zero, zero
+    multa = _arredondar(valor_original * regra.multa_percentual / CEM)
+    juros = _arredondar(valor_original * regra.juros_mensal_percentual / CEM * dias / 30)
+    if regra.teto_percentual is not None:
+        teto = _arredondar(valor_original * regra.teto_percentual / CEM)
+        multa = min(multa, teto)
+        juros = min(juros, teto - multa)
+    return multa, juros
+
+
+def marcar_vencidas(hoje=None):
+    """Passa a VENCIDO as faturas pendentes já vencidas. Retorna quantas."""
+    hoje = hoje or timezone.localdate()
+    with transaction.atomic():
+        vencidas = dict(
+            Fatura.objects.select_for_update()
+            .filter(status='PENDENTE', data_vencimento__lt=hoje)
+            .values_list('pk', 'numero')
+        )
+        Fatura.objects.filter(pk__in=vencidas).update(status='VENCIDO')
+        pagamentos.invalidar(*vencidas.values())
+    return len(vencidas)
+
+
+def aplicar(hoje=None):
+    """Marca as faturas vencidas e atualiza multa e juros à data `hoje`."""
+    hoje = hoje or timezone.localdate()
+    regras = {r.tipo: r for r in RegraEncargo.objects.filter(ativo=True)}
+
+    with transaction.atomic():
+        vencidas = marcar_vencidas(hoje)
+        alteradas, historico = [], []
+        faturas = (
+            Fatura.objects.filter(status='VENCIDO', tipo__in=regras, data_vencimento__lt=hoje)
+            .only('pk', 'numero', 'aluno_id', 'tipo', 'valor_original', 'valor_atual', 'encargos', 'data_vencimento')
+        )
+        for fatura in faturas.iterator(chunk_size=2000):
+            dias = (hoje - fatura.data_vencimento).days
+            multa, juros = calcular(regras[fatura.tipo], fatura.valor_original, dias)
+            acrescimo = multa + juros - fatura.encargos
+            if not acrescimo:
+                continue
+            fatura.valor_atual = (fatura.valor_atual or fatura.valor_original) + acrescimo
+            fatura.encargos += acrescimo
+            alteradas.append(fatura)
+            historico.append(EncargoFatura(
+                fatura_id=fatura.pk, data=hoje, dias_atraso=dias,
+                multa=multa, juros=juros, acrescimo=acrescimo,
+            ))
+
+        # bulk_update não passa pelos sinais, que recalculariam a conta fatura a fatura
+        Fatura.objects.bulk_update(alteradas, ['valor_atual', 'encargos'], batch_size=1000)
+        EncargoFatura.objects.bulk_create(historico, batch_size=1000)
+        contas = saldos.atualizar_contas({f.aluno_id for f in alteradas})
+        pagamentos.invalidar(*[f.numero for f in alteradas])
+
+        # nem os lançamentos das faturas (regras FATURA sobre valor_atual)
+        from administrativo.contabilizacao import recontabilizar
+        recontabilizar('FATURA', [f.pk for f in alteradas])
+
+    return ResultadoEncargos(
+        hoje, vencidas, len(alteradas), sum((h.acrescimo for h in historico), Decimal('0')), contas
+    )
@@ -0,0 +1,157 @@
+# Sistema/backend/secretaria/extratos.py
+"""
+Extratos mensais dos encarregados.
+
+Um extrato por encarregado com todos os seus educandos: faturas em aberto,
+recibos do mês e saldo de cada aluno. Os dados de todos os encarregados vêm
+de quatro consultas (encarregados, alunos com a conta corrente, faturas em
+aberto, recibos do mês) agrupadas em memória por encarregado, em vez de
+percorrer aluno a aluno.
+
+O HTML é gerado no processo principal; a conversão para PDF, que é o passo
+pesado, corre num conjunto de processos (secretaria/pdf.py). Cada PDF fica em
+MEDIA_ROOT/secretaria/extratos/AAAA-MM/ com um nome fixo por encarregado,
+por isso gerar de novo o mesmo mês substitui os ficheiros. O envio usa os
+canais de core.utils: e-mail com o PDF em anexo e um resumo por WhatsApp.
+"""
+
+import calendar
+import os
+from collections import defaultdict, namedtuple
+from decimal import Decimal
+
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from . import pdf
+from .models import Aluno, Encarregado, Fatura, Recibo
+
+Extrato = namedtuple('Extrato', 'encarregado alunos faturas recibos em_aberto pago saldo')
+ResultadoExtratos = namedtuple('ResultadoExtratos', 'mes extratos gerados emails whatsapps falhas')
+
+PASTA = os.path.join('secretaria', 'extratos')
+TEMPLATE = 'secretaria/extrato_encarregado_pdf.html'
+
+
+def _fim(mes):
+    return mes.replace(day=calendar.monthrange(mes.year, mes.month)[1])
+
+
+def montar(mes, encarregados=None, incluir_vazios=False):
+    """
+    Extratos de `mes` dos encarregados ativos com alunos (ou só dos pks em
+    `encarregados`). Sem `incluir_vazios`, quem não tem faturas em aberto nem
+    pagamentos no mês fica de fora.
+    """
+    mes = mes.replace(day=1)
+    encs = Encarregado.objects.filter(is_active=True, alunos__isnull=False).distinct()
+    if encarregados is not None:
+        encs = encs.filter(pk__in=encarregados)
+    # as três consultas seguintes usam o queryset dos encarregados como subconsulta
+    ids = encs.values('pk')
+
+    alunos = defaultdict(list)
+    for a in (
+        Aluno.objects.filter(encarregado__in=ids)
+        .values('pk', 'nome', 'matricula', 'status', 'encarregado_id', saldo=F('conta_corrente__saldo'))
+        .order_by('nome')
+    ):
+        alunos[a['encarregado_id']].append(a)
+
+    faturas = defaultdict(list)
+    for f in (
+        Fatura.objects.filter(aluno__encarregado__in=ids, status__in=['PENDENTE', 'VENCIDO'])
+        .values('numero', 'tipo', 'data_vencimento', 'status', 'valor_original', 'valor_atual',
+                'aluno__nome', encarregado_id=F('aluno__encarregado_id'))
+        .order_by('data_vencimento', 'pk')
+    ):
+        f['valor'] = f['valor_atual'] if f['valor_atual'] is not None else f['valor_original']
+        faturas[f['encarregado_id']].append(f)
+
+    recibos = defaultdict(list)
+    for r in (
+        Recibo.objects.filter(fatura__aluno__encarregado__in=ids, data_pagamento__range=(mes, _fim(mes)))
+        .values('numero_recibo', 'data_pagamento', 'forma_pagamento', 'valor_pago',
+                'fatura__numero', 'fatura__aluno__nome', encarregado_id=F('fatura__aluno__encarregado_id'))
+        .order_by('data_pagamento', 'pk')
+    ):
+        recibos[r['encarregado_id']].append(r)
+
+    zero = Decimal('0')
+    extratos = []
+    for enc in encs.order_by('nome'):
+        if not incluir_vazios and not faturas[enc.pk] and not recibos[enc.pk]:
+            continue
+        extratos.append(Extrato(
+            enc, alunos[enc.pk], faturas[enc.pk], recibos[enc.pk],
+            sum((f['valor'] for f in faturas[enc.pk]), zero),
+            sum((r['valor_pago'] for r in recibos[enc.pk]), zero),
+            sum((a['saldo'] or zero for a in alunos[enc.pk]), zero),
+        ))
+    return extratos
+
+
+def html(extrato, mes):
+    return render_to_string(TEMPLATE, {'extrato': extrato, 'mes': mes, 'emitido_em': timezone.localdate()})
+
+
+def pdfs(extratos, mes, processos=None, base_url=None):
+    """(extrato, bytes do PDF) pela ordem de `extratos`, convertidos em `processos` paralelos."""
+    return zip(extratos, pdf.converter_em_lote([html(e, mes) for e in extratos], processos, base_url))
+
+
+def caminho(encarregado_id, mes):
+    """Caminho relativo a MEDIA_ROOT do PDF do encarregado no mês."""
+    return os.path.join(PASTA, f'{mes:%Y-%m}', f'extrato_{encarregado_id}.pdf')
+
+
+def guardar(extrato, mes, conteudo):
+    return pdf.gravar(caminho(extrato.encarregado.pk, mes), conteudo)
+
+
+def resumo(extrato, mes):
+    """Texto do e-mail e da mensagem de WhatsApp."""
+    linhas = [
+        f'Prezado(a) {extrato.encarregado.nome},',
+        '',
+        f'Segue o extrato de {mes:%m/%Y} dos seus educandos.',
+        f'Faturas em aberto: {len(extrato.faturas)} ({extrato.em_aberto:.2f} AOA)',
+        f'Pagamentos no mês: {len(extrato.recibos)} ({extrato.pago:.2f} AOA)',
+    ]
+    for f in extrato.faturas[:10]:
+        linhas.append(f"- {f['numero'] or '—'} {f['aluno__nome']}: {f['valor']:.2f} AOA, "
+                      f"vence {f['data_vencimento']:%d/%m/%Y}")
+    if len(extrato.faturas) > 10:
+        linhas.append(f'- … e mais {len(extrato.faturas) - 10} fatura(s)')
+    return '\n'.join(linhas)
+
+
+def enviar(extrato, mes, conteudo):
+    """(e-mail enviado, WhatsApp enviado) pelos canais de core.utils."""
+    from core.utils import send_email, send_whatsapp
+    texto = resumo(extrato, mes)
+    enc = extrato.encarregado
+    email = bool(enc.email) and send_email(
+        enc.email, f'Extrato {mes:%m/%Y}', texto,
+        anexos=[(f'extrato_{mes:%Y-%m}.pdf', conteudo, 'pdf')],
+    )
+    whatsapp = bool(enc.telefone) and send_whatsapp(enc.telefone, texto)
+    return email, whatsapp
+
+
+def gerar_extratos(mes=None, encarregados=None, processos=None, enviar_para_encarregados=False):
+    """Monta, converte em PDF, guarda e (opcionalmente) envia os extratos de `mes`."""
+    mes = (mes or timezone.localdate()).replace(day=1)
+    extratos = montar(mes, encarregados)
+    gerados = emails = whatsapps = falhas = 0
+    # os PDFs são consumidos à medida que ficam prontos, sem os ter todos em memória
+    for extrato, conteudo in pdfs(extratos, mes, processos):
+        guardar(extrato, mes, conteudo)
+        gerados += 1
+        if enviar_para_encarregados:
+            email, whatsapp = enviar(extrato, mes, conteudo)
+            emails += email
+            whatsapps += whatsapp
+            falhas += not (email or whatsapp)
+    return ResultadoExtratos(mes, len(extratos), gerados, emails, whatsapps, falhas)
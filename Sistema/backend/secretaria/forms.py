@@ -1,6 +1,7 @@
 from django import forms
 from django.forms import BaseInlineFormSet, inlineformset_factory
 
+from core.widgets import AutocompleteSelect
 from pedagogico.models import AnoLetivo, PreRematricula, Turma
 from .models import Encarregado, Aluno, Fatura, Servico, FaturaServico, PreMatricula
 from django.core.exceptions import ValidationError
@@ -92,6 +93,7 @@ class FaturaForm(forms.ModelForm):
             'observacoes',
         ]
         widgets = {
+            'aluno': AutocompleteSelect('secretaria:aluno-autocomplete'),
             'data_emissao': forms.DateInput(attrs={'type': 'date'}),
             'data_vencimento': forms.DateInput(attrs={'type': 'date'}),
             'observacoes': forms.Textarea(attrs={'rows': 2}),
@@ -149,7 +151,7 @@ class PreMatriculaForm(forms.ModelForm):
         model = PreMatricula
         fields = ['aluno', 'curso']
         widgets = {
-            'aluno':  forms.Select(attrs={'class': 'form-select'}),
+            'aluno':  AutocompleteSelect('secretaria:aluno-autocomplete', attrs={'class': 'form-select'}),
             'curso':  forms.Select(attrs={'class': 'form-select'}),
         }
         
@@ -164,7 +166,7 @@ class PreRematriculaForm(forms.ModelForm):
         model = PreRematricula
         fields = ['aluno', 'turma_origem']
         widgets = {
-            'aluno': forms.Select(attrs={'class': 'w-full'}),
+            'aluno': AutocompleteSelect('secretaria:aluno-autocomplete', attrs={'class': 'w-full'}),
         }
 
     def __init__(self, *args, **kwargs):
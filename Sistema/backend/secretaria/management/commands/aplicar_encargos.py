@@ -0,0 +1,27 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from secretaria.encargos import aplicar
+
+
+class Command(BaseCommand):
+    help = 'Marca as faturas vencidas e atualiza multa e juros de mora pelas regras de encargos (correr diariamente).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data', help='Data de cálculo (AAAA-MM-DD). Padrão: hoje.')
+
+    def handle(self, *args, **options):
+        data = None
+        if options['data']:
+            try:
+                data = date.fromisoformat(options['data'])
+            except ValueError:
+                raise CommandError('Data inválida; use AAAA-MM-DD.')
+
+        resultado = aplicar(data)
+        self.stdout.write(self.style.SUCCESS(
+            f'{resultado.data:%d/%m/%Y}: {resultado.vencidas} fatura(s) passaram a vencidas, '
+            f'{resultado.faturas} com encargos atualizados (+{resultado.acrescimo} AOA), '
+            f'{resultado.contas} conta(s) corrente(s) recalculada(s).'
+        ))
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from secretaria.cobranca import DIA_VENCIMENTO, emitir_mensalidades
+
+
+class Command(BaseCommand):
+    help = 'Emite as mensalidades do mês para todas as matrículas ativas, pela tabela de preços por curso.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mes', help='Mês de referência (AAAA-MM). Padrão: mês corrente.')
+        parser.add_argument('--vencimento', type=int, default=DIA_VENCIMENTO,
+                            help=f'Dia de vencimento (padrão: {DIA_VENCIMENTO}).')
+        parser.add_argument('--simular', action='store_true',
+                            help='Só mostra o que seria emitido, sem gravar.')
+
+    def handle(self, *args, **options):
+        mes = None
+        if options['mes']:
+            try:
+                mes = datetime.strptime(options['mes'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('Mês inválido; use AAAA-MM.')
+        if not 1 <= options['vencimento'] <= 31:
+            raise CommandError('Dia de vencimento inválido.')
+
+        resultado = emitir_mensalidades(mes, dia_vencimento=options['vencimento'], simular=options['simular'])
+        acao = 'a emitir' if options['simular'] else 'emitida(s)'
+        self.stdout.write(self.style.SUCCESS(
+            f'{resultado.mes:%m/%Y}: {resultado.emitidas} mensalidade(s) {acao}, {resultado.valor_total} AOA; '
+            f'{resultado.ja_emitidas} já emitida(s), {resultado.sem_preco} sem preço definido.'
+        ))
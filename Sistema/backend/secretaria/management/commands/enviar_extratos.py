@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from secretaria.extratos import gerar_extratos
+
+
+class Command(BaseCommand):
+    help = 'Gera os extratos mensais (PDF) dos encarregados e envia-os por e-mail e WhatsApp.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mes', help='Mês do extrato (AAAA-MM). Padrão: mês corrente.')
+        parser.add_argument('--processos', type=int, default=None,
+                            help='Processos paralelos para gerar os PDFs (padrão: até 4).')
+        parser.add_argument('--encarregado', type=int, action='append', dest='encarregados',
+                            help='Só este encarregado (pk); pode repetir-se.')
+        parser.add_argument('--sem-envio', action='store_true',
+                            help='Só gera e guarda os PDFs, sem enviar.')
+
+    def handle(self, *args, **options):
+        mes = None
+        if options['mes']:
+            try:
+                mes = datetime.strptime(options['mes'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('Mês inválido; use AAAA-MM.')
+        if options['processos'] is not None and options['processos'] < 1:
+            raise CommandError('O número de processos tem de ser positivo.')
+
+        resultado = gerar_extratos(
+            mes, encarregados=options['encarregados'], processos=options['processos'],
+            enviar_para_encarregados=not options['sem_envio'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{resultado.mes:%m/%Y}: {resultado.gerados} extrato(s) gerado(s); '
+            f'{resultado.emails} e-mail(s), {resultado.whatsapps} WhatsApp(s), '
+            f'{resultado.falhas} sem envio.'
+        ))
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from secretaria.recibos import gerar_periodo
+
+
+class Command(BaseCommand):
+    help = 'Gera de novo (em lote) os PDFs dos recibos pagos num intervalo de datas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--de', help='Data inicial (AAAA-MM-DD). Padrão: hoje.')
+        parser.add_argument('--ate', help='Data final (AAAA-MM-DD). Padrão: a data inicial.')
+        parser.add_argument('--processos', type=int, default=None,
+                            help='Processos paralelos para gerar os PDFs (padrão: até 4).')
+        parser.add_argument('--em-falta', action='store_true',
+                            help='Só gera os recibos que ainda não têm PDF.')
+
+    def _data(self, valor):
+        try:
+            return datetime.strptime(valor, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'Data inválida: {valor}; use AAAA-MM-DD.')
+
+    def handle(self, *args, **options):
+        inicio = self._data(options['de']) if options['de'] else timezone.localdate()
+        fim = self._data(options['ate']) if options['ate'] else inicio
+        if fim < inicio:
+            raise CommandError('A data final é anterior à inicial.')
+        if options['processos'] is not None and options['processos'] < 1:
+            raise CommandError('O número de processos tem de ser positivo.')
+
+        resultado = gerar_periodo(inicio, fim, options['processos'], so_em_falta=options['em_falta'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{inicio:%d/%m/%Y} a {fim:%d/%m/%Y}: {resultado.gerados} PDF(s) gerado(s) '
+            f'de {resultado.recibos} recibo(s).'
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from secretaria.busca import reindexar
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o índice de pesquisa de alunos e encarregados.'
+
+    def handle(self, *args, **options):
+        alunos, encarregados = reindexar()
+        self.stdout.write(self.style.SUCCESS(
+            f'Índice reconstruído: {alunos} aluno(s), {encarregados} encarregado(s).'
+        ))
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('secretaria', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FaturaArquivo',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('numero', models.CharField(blank=True, max_length=20, null=True, verbose_name='Número da Fatura')),
+                ('tipo', models.CharField(choices=[('MENSALIDADE', 'Mensalidade'), ('MATRICULA', 'Matrícula'), ('MATERIAL', 'Material Didático'), ('OUTRO', 'Outro')], max_length=15, verbose_name='Tipo')),
+                ('valor_original', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Valor Original')),
+                ('valor_atual', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True, verbose_name='Valor Atual')),
+                ('data_emissao', models.DateField(verbose_name='Data de Emissão')),
+                ('data_vencimento', models.DateField(verbose_name='Data de Vencimento')),
+                ('status', models.CharField(choices=[('PENDENTE', 'PENDENTE'), ('VENCIDO', 'VENCIDO'), ('PAGO', 'PAGO')], default='PENDENTE', max_length=10, verbose_name='Status')),
+                ('observacoes', models.TextField(blank=True, verbose_name='Observações')),
+                ('created_at', models.DateTimeField(verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('aluno', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='secretaria.aluno', verbose_name='Aluno')),
+            ],
+            options={
+                'verbose_name': 'Fatura (arquivo)',
+                'verbose_name_plural': 'Faturas (arquivo)',
+                'db_table': 'secretaria_fatura_arquivo',
+                'ordering': ['-data_emissao'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FaturaServicoArquivo',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('quantidade', models.PositiveIntegerField(default=1)),
+                ('valor_unitario', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Valor Unitário')),
+                ('fatura', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='secretaria.faturaarquivo', verbose_name='fatura')),
+                ('servico', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='secretaria.servico', verbose_name='servico')),
+            ],
+            options={
+                'verbose_name': 'fatura servico (arquivo)',
+                'verbose_name_plural': 'fatura servicos (arquivo)',
+                'db_table': 'secretaria_faturaservico_arquivo',
+                'ordering': [],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReciboArquivo',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('numero_recibo', models.CharField(max_length=20, verbose_name='Número do Recibo')),
+                ('data_pagamento', models.DateField(verbose_name='Data de Pagamento')),
+                ('forma_pagamento', models.CharField(choices=[('DINHEIRO', 'Dinheiro'), ('TRANSFERÊNCIA', 'Transferência Bancária'), ('CHEQUE', 'Cheque'), ('OUTRO', 'Outro')], max_length=15, verbose_name='Forma de Pagamento')),
+                ('valor_pago', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Valor Pago')),
+                ('observacoes', models.TextField(blank=True, verbose_name='Observações')),
+                ('created_at', models.DateTimeField(verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('fatura', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='secretaria.faturaarquivo', verbose_name='Fatura')),
+            ],
+            options={
+                'verbose_name': 'Recibo (arquivo)',
+                'verbose_name_plural': 'Recibos (arquivo)',
+                'db_table': 'secretaria_recibo_arquivo',
+                'ordering': ['-data_pagamento'],
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedagogico', '0008_riscoaluno'),
+        ('secretaria', '0002_arquivo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrecoCurso',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('valor', models.DecimalField(blank=True, decimal_places=2, help_text='Vazio = preço do serviço.', max_digits=10, null=True, verbose_name='Valor')),
+                ('ativo', models.BooleanField(default=True, verbose_name='Ativo')),
+            ],
+            options={
+                'verbose_name': 'Preço por Curso',
+                'verbose_name_plural': 'Preços por Curso',
+                'ordering': ['curso', 'servico'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SequenciaDocumento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('serie', models.CharField(max_length=10, verbose_name='Série')),
+                ('ano', models.PositiveIntegerField(verbose_name='Ano')),
+                ('ultimo', models.PositiveIntegerField(default=0, verbose_name='Último número')),
+            ],
+            options={
+                'verbose_name': 'Sequência de Documentos',
+                'verbose_name_plural': 'Sequências de Documentos',
+            },
+        ),
+        migrations.AddField(
+            model_name='fatura',
+            name='competencia',
+            field=models.DateField(blank=True, null=True, verbose_name='Mês de Referência'),
+        ),
+        migrations.AddField(
+            model_name='faturaarquivo',
+            name='competencia',
+            field=models.DateField(blank=True, null=True, verbose_name='Mês de Referência'),
+        ),
+        migrations.AddConstraint(
+            model_name='fatura',
+            constraint=models.UniqueConstraint(condition=models.Q(('tipo', 'MENSALIDADE')), fields=('aluno', 'competencia'), name='fatura_mensalidade_unica'),
+        ),
+        migrations.AddField(
+            model_name='precocurso',
+            name='curso',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='precos', to='pedagogico.curso', verbose_name='Curso'),
+        ),
+        migrations.AddField(
+            model_name='precocurso',
+            name='servico',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='secretaria.servico', verbose_name='Serviço'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='sequenciadocumento',
+            unique_together={('serie', 'ano')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='precocurso',
+            unique_together={('curso', 'servico')},
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('secretaria', '0003_mensalidades'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegraEncargo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('MENSALIDADE', 'Mensalidade'), ('MATRICULA', 'Matrícula'), ('MATERIAL', 'Material Didático'), ('OUTRO', 'Outro')], max_length=15, unique=True, verbose_name='Tipo de Fatura')),
+                ('multa_percentual', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='Multa (%)')),
+                ('juros_mensal_percentual', models.DecimalField(decimal_places=2, default=0, help_text='Contados por dia de atraso (mês de 30 dias).', max_digits=5, verbose_name='Juros de Mora (% ao mês)')),
+                ('carencia_dias', models.PositiveIntegerField(default=0, verbose_name='Carência (dias)')),
+                ('teto_percentual', models.DecimalField(blank=True, decimal_places=2, help_text='Máximo de multa + juros, em % do valor original. Vazio = sem teto.', max_digits=6, null=True, verbose_name='Teto dos Encargos (%)')),
+                ('ativo', models.BooleanField(default=True, verbose_name='Ativo')),
+            ],
+            options={
+                'verbose_name': 'Regra de Encargos',
+                'verbose_name_plural': 'Regras de Encargos',
+                'ordering': ['tipo'],
+            },
+        ),
+        migrations.AddField(
+            model_name='fatura',
+            name='encargos',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Encargos'),
+        ),
+        migrations.AddField(
+            model_name='faturaarquivo',
+            name='encargos',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Encargos'),
+        ),
+        migrations.CreateModel(
+            name='EncargoFaturaArquivo',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('data', models.DateField(verbose_name='Data do Cálculo')),
+                ('dias_atraso', models.PositiveIntegerField(verbose_name='Dias de Atraso')),
+                ('multa', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Multa')),
+                ('juros', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Juros')),
+                ('acrescimo', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Acréscimo')),
+                ('fatura', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='secretaria.faturaarquivo', verbose_name='Fatura')),
+            ],
+            options={
+                'verbose_name': 'Encargo de Fatura (arquivo)',
+                'verbose_name_plural': 'Encargos de Faturas (arquivo)',
+                'db_table': 'secretaria_encargofatura_arquivo',
+                'ordering': ['-data'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EncargoFatura',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.DateField(verbose_name='Data do Cálculo')),
+                ('dias_atraso', models.PositiveIntegerField(verbose_name='Dias de Atraso')),
+                ('multa', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Multa')),
+                ('juros', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Juros')),
+                ('acrescimo', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Acréscimo')),
+                ('fatura', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='historico_encargos', to='secretaria.fatura', verbose_name='Fatura')),
+            ],
+            options={
+                'verbose_name': 'Encargo de Fatura',
+                'verbose_name_plural': 'Encargos de Faturas',
+                'ordering': ['-data'],
+                'indexes': [models.Index(fields=['fatura', 'data'], name='encargo_fatura_data_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('secretaria', '0004_encargos'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportacaoExtrato',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ficheiro', models.CharField(max_length=255, verbose_name='Ficheiro')),
+                ('formato', models.CharField(choices=[('CSV', 'CSV'), ('OFX', 'OFX')], max_length=3, verbose_name='Formato')),
+                ('importado_em', models.DateTimeField(auto_now_add=True, verbose_name='Importado em')),
+                ('movimentos', models.PositiveIntegerField(default=0, verbose_name='Movimentos')),
+                ('conciliados', models.PositiveIntegerField(default=0, verbose_name='Conciliados')),
+                ('importado_por', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='importacoes_extrato', to=settings.AUTH_USER_MODEL, verbose_name='Importado por')),
+            ],
+            options={
+                'verbose_name': 'Importação de Extrato',
+                'verbose_name_plural': 'Importações de Extratos',
+                'ordering': ['-importado_em'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MovimentoBancario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chave', models.CharField(max_length=64, unique=True, verbose_name='Chave')),
+                ('data', models.DateField(verbose_name='Data')),
+                ('valor', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Valor')),
+                ('descricao', models.CharField(blank=True, max_length=255, verbose_name='Descrição')),
+                ('estado', models.CharField(choices=[('CONCILIADO', 'Conciliado'), ('REVISAO', 'Em revisão'), ('IGNORADO', 'Ignorado')], default='REVISAO', max_length=10, verbose_name='Estado')),
+                ('motivo', models.CharField(blank=True, max_length=100, verbose_name='Motivo')),
+                ('fatura', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movimentos_bancarios', to='secretaria.fatura', verbose_name='Fatura')),
+                ('importacao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movimentos_extrato', to='secretaria.importacaoextrato', verbose_name='Importação')),
+                ('recibo', models.OneToOneField(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movimento_bancario', to='secretaria.recibo', verbose_name='Recibo')),
+            ],
+            options={
+                'verbose_name': 'Movimento Bancário',
+                'verbose_name_plural': 'Movimentos Bancários',
+                'ordering': ['data', 'pk'],
+                'indexes': [models.Index(fields=['estado', 'data'], name='movimento_estado_data_idx')],
+            },
+        ),
+    ]
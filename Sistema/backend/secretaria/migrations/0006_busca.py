@@ -0,0 +1,82 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:20
+
+import re
+
+from django.db import migrations, models
+
+
+# Índice GIN de trigramas só em PostgreSQL; nas outras bases a pesquisa faz
+# LIKE sobre a coluna já normalizada.
+def criar_indice_trigramas(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS indice_busca_texto_trgm '
+        'ON secretaria_indicebusca USING gin (texto gin_trgm_ops)'
+    )
+
+
+def remover_indice_trigramas(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS indice_busca_texto_trgm')
+
+
+# As pesquisas de alunos passam a depender do índice: preenchê-lo já com os
+# alunos e encarregados existentes (as mesmas entradas de secretaria/busca.py,
+# com os modelos históricos). Depois disso os sinais mantêm-no.
+def preencher_indice(apps, schema_editor):
+    from secretaria.busca import normalizar
+
+    Aluno = apps.get_model('secretaria', 'Aluno')
+    Encarregado = apps.get_model('secretaria', 'Encarregado')
+    IndiceBusca = apps.get_model('secretaria', 'IndiceBusca')
+
+    def digitos(texto):
+        return re.sub(r'\D', '', texto or '')
+
+    entradas = []
+    for aluno in Aluno.objects.select_related('encarregado').iterator(chunk_size=2000):
+        enc = aluno.encarregado
+        entradas.append(IndiceBusca(
+            tipo='ALUNO', objeto_id=aluno.pk, titulo=aluno.nome[:150],
+            detalhe=f'Matrícula {aluno.matricula} · {enc.nome}'[:255],
+            texto=normalizar(' '.join([
+                aluno.nome, aluno.matricula, aluno.documento, enc.nome, enc.telefone, digitos(enc.telefone),
+            ])),
+        ))
+    for enc in Encarregado.objects.iterator(chunk_size=2000):
+        entradas.append(IndiceBusca(
+            tipo='ENCARREGADO', objeto_id=enc.pk, titulo=enc.nome[:150],
+            detalhe=' · '.join(filter(None, [enc.telefone, enc.email]))[:255],
+            texto=normalizar(' '.join([enc.nome, enc.telefone, digitos(enc.telefone), enc.email])),
+        ))
+    IndiceBusca.objects.bulk_create(entradas, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('secretaria', '0005_conciliacao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndiceBusca',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('ALUNO', 'Aluno'), ('ENCARREGADO', 'Encarregado')], max_length=11, verbose_name='Tipo')),
+                ('objeto_id', models.PositiveIntegerField(verbose_name='ID do objeto')),
+                ('titulo', models.CharField(max_length=150, verbose_name='Título')),
+                ('detalhe', models.CharField(blank=True, max_length=255, verbose_name='Detalhe')),
+                ('texto', models.TextField(verbose_name='Texto pesquisável')),
+            ],
+            options={
+                'verbose_name': 'Entrada do Índice de Pesquisa',
+                'verbose_name_plural': 'Índice de Pesquisa',
+                'constraints': [models.UniqueConstraint(fields=('tipo', 'objeto_id'), name='indice_busca_unico')],
+            },
+        ),
+        migrations.RunPython(criar_indice_trigramas, remover_indice_trigramas),
+        migrations.RunPython(preencher_indice, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('secretaria', '0006_busca'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fatura',
+            index=models.Index(fields=['data_emissao', 'id'], name='fatura_emissao_id_idx'),
+        ),
+    ]
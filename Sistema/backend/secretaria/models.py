@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from core.arquivo import criar_modelo_arquivo
 
 
 User = get_user_model()
@@ -164,6 +165,10 @@ class Fatura(models.Model):
     data_vencimento = models.DateField('Data de Vencimento')
     status = models.CharField('Status', max_length=10, choices=STATUS_CHOICES, default='PENDENTE')
     observacoes = models.TextField('Observações', blank=True)
+    # mês (dia 1) a que a mensalidade respeita; preenchido pela emissão em lote
+    competencia = models.DateField('Mês de Referência', null=True, blank=True)
+    # multa e juros já somados a valor_atual (ver secretaria/encargos.py)
+    encargos = models.DecimalField('Encargos', max_digits=12, decimal_places=2, default=0)
     created_at = models.DateTimeField('Criado em', auto_now_add=True)
     updated_at = models.DateTimeField('Atualizado em', auto_now=True)
 
@@ -171,6 +176,16 @@ class Fatura(models.Model):
         verbose_name = 'Fatura'
         verbose_name_plural = 'Faturas'
         ordering = ['-data_emissao']
+        # paginação por chave da lista de faturas (core/paginacao.py)
+        indexes = [models.Index(fields=['data_emissao', 'id'], name='fatura_emissao_id_idx')]
+        constraints = [
+            # uma mensalidade por aluno e mês
+            models.UniqueConstraint(
+                fields=['aluno', 'competencia'],
+                condition=models.Q(tipo='MENSALIDADE'),
+                name='fatura_mensalidade_unica'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.numero} | {self.aluno.matricula} | {self.status}'
@@ -259,7 +274,249 @@ class ContaCorrente(models.Model):
         faturas = self.aluno.faturas.all()
         self.total_debito = sum([f.valor_atual for f in faturas if f.status in ['PENDENTE', 'VENCIDO']])
         recibos = [f.recibo.valor_pago for f in faturas if hasattr(f, 'recibo')]
-        self.total_credito = sum(recibos)
+        # recibos de faturas já arquivadas (anos letivos encerrados) continuam a contar
+        arquivados = ReciboArquivo.objects.filter(fatura__aluno=self.aluno).aggregate(
+            total=models.Sum('valor_pago'))['total'] or 0
+        self.total_credito = sum(recibos) + arquivados
         self.saldo = self.total_debito - self.total_credito
         self.save()
 
+
+class PrecoCurso(models.Model):
+    """
+    Tabela de mensalidades: serviços cobrados todos os meses aos alunos com
+    matrícula ativa num curso. Sem `valor`, vale o preço do serviço.
+    """
+    curso = models.ForeignKey(
+        'pedagogico.Curso',
+        on_delete=models.CASCADE,
+        related_name='precos',
+        verbose_name='Curso'
+    )
+    servico = models.ForeignKey(Servico, on_delete=models.PROTECT, verbose_name='Serviço')
+    valor = models.DecimalField(
+        'Valor',
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text='Vazio = preço do serviço.'
+    )
+    ativo = models.BooleanField('Ativo', default=True)
+
+    class Meta:
+        verbose_name = 'Preço por Curso'
+        verbose_name_plural = 'Preços por Curso'
+        unique_together = [['curso', 'servico']]
+        ordering = ['curso', 'servico']
+
+    def __str__(self):
+        return f'{self.curso} | {self.servico.descricao}'
+
+    @property
+    def preco(self):
+        return self.servico.preco if self.valor is None else self.valor
+
+
+class RegraEncargo(models.Model):
+    """
+    Multa e juros de mora das faturas vencidas de um tipo. Os encargos são
+    calculados sobre o valor original: a multa uma vez, passada a carência, e
+    os juros pro rata por dia de atraso.
+    """
+    tipo = models.CharField('Tipo de Fatura', max_length=15, choices=Fatura.TIPO_CHOICES, unique=True)
+    multa_percentual = models.DecimalField('Multa (%)', max_digits=5, decimal_places=2, default=0)
+    juros_mensal_percentual = models.DecimalField(
+        'Juros de Mora (% ao mês)',
+        max_digits=5,
+        decimal_places=2,
+        default=0,
+        help_text='Contados por dia de atraso (mês de 30 dias).'
+    )
+    carencia_dias = models.PositiveIntegerField('Carência (dias)', default=0)
+    teto_percentual = models.DecimalField(
+        'Teto dos Encargos (%)',
+        max_digits=6,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text='Máximo de multa + juros, em % do valor original. Vazio = sem teto.'
+    )
+    ativo = models.BooleanField('Ativo', default=True)
+
+    class Meta:
+        verbose_name = 'Regra de Encargos'
+        verbose_name_plural = 'Regras de Encargos'
+        ordering = ['tipo']
+
+    def __str__(self):
+        return f'{self.get_tipo_display()}: multa {self.multa_percentual}% + juros {self.juros_mensal_percentual}%/mês'
+
+
+class EncargoFatura(models.Model):
+    """Histórico dos encargos: cada alteração aplicada a uma fatura vencida."""
+    fatura = models.ForeignKey(
+        Fatura,
+        on_delete=models.CASCADE,
+        related_name='historico_encargos',
+        verbose_name='Fatura'
+    )
+    data = models.DateField('Data do Cálculo')
+    dias_atraso = models.PositiveIntegerField('Dias de Atraso')
+    multa = models.DecimalField('Multa', max_digits=12, decimal_places=2)
+    juros = models.DecimalField('Juros', max_digits=12, decimal_places=2)
+    acrescimo = models.DecimalField('Acréscimo', max_digits=12, decimal_places=2)
+
+    class Meta:
+        verbose_name = 'Encargo de Fatura'
+        verbose_name_plural = 'Encargos de Faturas'
+        ordering = ['-data']
+        indexes = [
+            models.Index(fields=['fatura', 'data'], name='encargo_fatura_data_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.fatura.numero} | {self.data:%d/%m/%Y} | {self.acrescimo}'
+
+
+class ImportacaoExtrato(models.Model):
+    """Ficheiro de extrato bancário (CSV/OFX) importado para conciliação."""
+    FORMATO_CHOICES = [
+        ('CSV', 'CSV'),
+        ('OFX', 'OFX'),
+    ]
+
+    ficheiro = models.CharField('Ficheiro', max_length=255)
+    formato = models.CharField('Formato', max_length=3, choices=FORMATO_CHOICES)
+    importado_em = models.DateTimeField('Importado em', auto_now_add=True)
+    importado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='importacoes_extrato',
+        verbose_name='Importado por'
+    )
+    movimentos = models.PositiveIntegerField('Movimentos', default=0)
+    conciliados = models.PositiveIntegerField('Conciliados', default=0)
+
+    class Meta:
+        verbose_name = 'Importação de Extrato'
+        verbose_name_plural = 'Importações de Extratos'
+        ordering = ['-importado_em']
+
+    def __str__(self):
+        return f'{self.ficheiro} ({self.importado_em:%d/%m/%Y %H:%M})'
+
+
+class MovimentoBancario(models.Model):
+    """
+    Crédito lido de um extrato. Os que correspondem com segurança a uma fatura
+    ficam CONCILIADO (com o recibo gerado); os restantes ficam em REVISAO, com a
+    fatura sugerida (se houver), até a secretaria confirmar ou ignorar.
+    """
+    ESTADO_CHOICES = [
+        ('CONCILIADO', 'Conciliado'),
+        ('REVISAO', 'Em revisão'),
+        ('IGNORADO', 'Ignorado'),
+    ]
+
+    importacao = models.ForeignKey(
+        ImportacaoExtrato,
+        on_delete=models.CASCADE,
+        related_name='movimentos_extrato',
+        verbose_name='Importação'
+    )
+    # identifica o movimento entre importações (FITID do OFX ou hash da linha)
+    chave = models.CharField('Chave', max_length=64, unique=True)
+    data = models.DateField('Data')
+    valor = models.DecimalField('Valor', max_digits=12, decimal_places=2)
+    descricao = models.CharField('Descrição', max_length=255, blank=True)
+    estado = models.CharField('Estado', max_length=10, choices=ESTADO_CHOICES, default='REVISAO')
+    # sem constraint na BD: faturas pagas e recibos podem ir para o arquivo (core/arquivo.py)
+    fatura = models.ForeignKey(
+        Fatura,
+        on_delete=models.SET_NULL,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='movimentos_bancarios',
+        verbose_name='Fatura'
+    )
+    recibo = models.OneToOneField(
+        'Recibo',
+        on_delete=models.SET_NULL,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='movimento_bancario',
+        verbose_name='Recibo'
+    )
+    motivo = models.CharField('Motivo', max_length=100, blank=True)
+
+    class Meta:
+        verbose_name = 'Movimento Bancário'
+        verbose_name_plural = 'Movimentos Bancários'
+        ordering = ['data', 'pk']
+        indexes = [
+            models.Index(fields=['estado', 'data'], name='movimento_estado_data_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.data:%d/%m/%Y} | {self.valor} | {self.get_estado_display()}'
+
+
+class SequenciaDocumento(models.Model):
+    """
+    Último número emitido por série e ano (ex.: faturas de 2025). Os números
+    são reservados com a linha bloqueada, ver secretaria/numeracao.py.
+    """
+    serie = models.CharField('Série', max_length=10)
+    ano = models.PositiveIntegerField('Ano')
+    ultimo = models.PositiveIntegerField('Último número', default=0)
+
+    class Meta:
+        verbose_name = 'Sequência de Documentos'
+        verbose_name_plural = 'Sequências de Documentos'
+        unique_together = [['serie', 'ano']]
+
+    def __str__(self):
+        return f'{self.serie} {self.ano}: {self.ultimo}'
+
+
+class IndiceBusca(models.Model):
+    """
+    Entrada do índice de pesquisa de alunos e encarregados (ver
+    secretaria/busca.py): o texto pesquisável (nomes, matrícula, documento,
+    telefone) normalizado numa só coluna, mantida pelos sinais. Em PostgreSQL a
+    coluna tem um índice GIN de trigramas (pg_trgm), criado na migração.
+    """
+    TIPO_CHOICES = [
+        ('ALUNO', 'Aluno'),
+        ('ENCARREGADO', 'Encarregado'),
+    ]
+
+    tipo = models.CharField('Tipo', max_length=11, choices=TIPO_CHOICES)
+    objeto_id = models.PositiveIntegerField('ID do objeto')
+    titulo = models.CharField('Título', max_length=150)
+    detalhe = models.CharField('Detalhe', max_length=255, blank=True)
+    # minúsculas, sem acentos; telefones também só com os dígitos
+    texto = models.TextField('Texto pesquisável')
+
+    class Meta:
+        verbose_name = 'Entrada do Índice de Pesquisa'
+        verbose_name_plural = 'Índice de Pesquisa'
+        constraints = [
+            models.UniqueConstraint(fields=['tipo', 'objeto_id'], name='indice_busca_unico'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_tipo_display()}: {self.titulo}'
+
+
+# --------------------------------
+# Tabelas de arquivo: faturas pagas de anos letivos encerrados (ver core/arquivo.py)
+# --------------------------------
+FaturaArquivo = criar_modelo_arquivo(Fatura)
+ReciboArquivo = criar_modelo_arquivo(Recibo, alvos={Fatura: FaturaArquivo})
+FaturaServicoArquivo = criar_modelo_arquivo(FaturaServico, alvos={Fatura: FaturaArquivo})
+EncargoFaturaArquivo = criar_modelo_arquivo(EncargoFatura, alvos={Fatura: FaturaArquivo})
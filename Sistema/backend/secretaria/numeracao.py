@@ -0,0 +1,59 @@
+# Sistema/backend/secretaria/numeracao.py
+"""
+Numeração sequencial de documentos ("AAAA/NNNN" por ano).
+
+O último número de cada série e ano fica em SequenciaDocumento. Reservar
+números bloqueia essa linha (select_for_update) até ao fim da transação, por
+isso emissões simultâneas nunca recebem o mesmo número e, se a transação
+falhar, os números voltam a ficar livres. Uma série ainda sem linha começa no
+maior número já emitido nesse ano.
+"""
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+
+from .models import SequenciaDocumento
+
+# série → (modelo, campo do número)
+SERIES = {
+    'FATURA': ('secretaria.Fatura', 'numero'),
+    'RECIBO': ('secretaria.Recibo', 'numero_recibo'),
+}
+
+
+def formatar(ano, n):
+    return f'{ano}/{n:04d}'
+
+
+def _maior_emitido(serie, ano):
+    modelo, campo = SERIES[serie]
+    numeros = apps.get_model(modelo).objects.filter(**{f'{campo}__startswith': f'{ano}/'}).values_list(campo, flat=True)
+    # comparação numérica: "2025/10000" é maior que "2025/9999"
+    return max((int(n.rsplit('/', 1)[-1]) for n in numeros if n.rsplit('/', 1)[-1].isdigit()), default=0)
+
+
+def _sequencia(serie, ano):
+    try:
+        return SequenciaDocumento.objects.select_for_update().get(serie=serie, ano=ano)
+    except SequenciaDocumento.DoesNotExist:
+        pass
+    try:
+        with transaction.atomic():
+            SequenciaDocumento.objects.create(serie=serie, ano=ano, ultimo=_maior_emitido(serie, ano))
+    except IntegrityError:
+        pass  # criada entretanto por outra transação
+    return SequenciaDocumento.objects.select_for_update().get(serie=serie, ano=ano)
+
+
+def reservar(serie, ano, quantidade=1):
+    """Reserva `quantidade` números seguidos da série no ano; devolve-os formatados."""
+    with transaction.atomic():
+        sequencia = _sequencia(serie, ano)
+        inicio = sequencia.ultimo + 1
+        sequencia.ultimo += quantidade
+        sequencia.save(update_fields=['ultimo'])
+    return [formatar(ano, n) for n in range(inicio, inicio + quantidade)]
+
+
+def proximo(serie, ano):
+    return reservar(serie, ano)[0]
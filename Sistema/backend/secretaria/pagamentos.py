@@ -0,0 +1,131 @@
+# Sistema/backend/secretaria/pagamentos.py
+"""
+Registo de pagamentos em lote.
+
+Cada Recibo gravado um a um dispara `atualizar_contacorrente_no_recibo`, que
+relê todas as faturas do aluno. Aqui os recibos de um lote entram numa só
+transação: as faturas são bloqueadas (select_for_update) e só as que ainda
+estão por pagar seguem; os números de recibo são reservados de uma vez, os
+recibos entram com bulk_create, as faturas passam a PAGO com um UPDATE, as
+contas correntes são recalculadas numa passagem e os recibos contabilizados
+pelas regras de lançamento. Os PDFs dos recibos são gerados em fundo depois
+do commit (secretaria/recibos.py).
+
+O modo caixa consulta as faturas pelo número a cada leitura; essa consulta
+fica em cache (por número) e é invalidada pelos sinais de Fatura e pelas
+operações em lote que alteram faturas.
+"""
+
+from collections import defaultdict, namedtuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from . import numeracao, recibos as recibos_pdf, saldos
+from .models import Fatura, Recibo
+
+Pagamento = namedtuple('Pagamento', 'fatura_id data forma valor observacoes')
+ResultadoPagamentos = namedtuple('ResultadoPagamentos', 'recibos recusados')
+
+CACHE_TIMEOUT = 60 * 10
+CAMPOS_CONSULTA = ('pk', 'numero', 'aluno__nome', 'aluno__matricula', 'tipo', 'valor_atual', 'valor_original',
+                   'status', 'data_vencimento')
+
+
+def _chave(numero):
+    return f'secretaria:fatura:{numero}'
+
+
+def invalidar(*numeros):
+    """
+    Apaga da cache a consulta das faturas `numeros` depois do commit da
+    transação atual: apagar antes deixaria um pedido concorrente voltar a
+    guardar a linha ainda por gravar.
+    """
+    chaves = [_chave(n) for n in numeros if n]
+    if chaves:
+        transaction.on_commit(lambda: cache.delete_many(chaves))
+
+
+def consultar(numero):
+    """Dados da fatura `numero` para o caixa (dict) ou None se não existir."""
+    numero = (numero or '').strip()
+    if not numero:
+        return None
+    dados = cache.get(_chave(numero))
+    if dados is None:
+        dados = Fatura.objects.filter(numero=numero).values(*CAMPOS_CONSULTA).first()
+        if dados is None:
+            return None
+        dados['valor'] = dados['valor_atual'] if dados['valor_atual'] is not None else dados['valor_original']
+        cache.set(_chave(numero), dados, CACHE_TIMEOUT)
+    return dados
+
+
+def registrar(pagamentos, lancado_por=None):
+    """
+    Cria os recibos de `pagamentos` (lista de Pagamento). Faturas já pagas,
+    inexistentes ou repetidas no lote são recusadas (pks em `recusados`).
+    """
+    if not pagamentos:
+        return ResultadoPagamentos([], [])
+
+    with transaction.atomic():
+        # of=self: o LEFT JOIN do recibo não pode ser bloqueado
+        bloqueadas = (
+            Fatura.objects.select_for_update(of=('self',))
+            .filter(pk__in=[p.fatura_id for p in pagamentos], status__in=['PENDENTE', 'VENCIDO'], recibo__isnull=True)
+            .values_list('pk', 'aluno_id', 'numero')
+        )
+        abertas = {pk: (aluno, numero) for pk, aluno, numero in bloqueadas}
+        aceites, recusados, vistas = [], [], set()
+        for p in pagamentos:
+            if p.fatura_id in abertas and p.fatura_id not in vistas:
+                aceites.append(p)
+                vistas.add(p.fatura_id)
+            else:
+                recusados.append(p.fatura_id)
+        if not aceites:
+            return ResultadoPagamentos([], recusados)
+
+        por_ano = defaultdict(list)
+        for p in aceites:
+            por_ano[p.data.year].append(p)
+        recibos = []
+        for ano, lote in sorted(por_ano.items()):
+            numeros = numeracao.reservar('RECIBO', ano, len(lote))
+            recibos += [
+                Recibo(
+                    fatura_id=p.fatura_id, numero_recibo=numero, data_pagamento=p.data,
+                    forma_pagamento=p.forma, valor_pago=p.valor, observacoes=p.observacoes or '',
+                )
+                for numero, p in zip(numeros, lote)
+            ]
+        recibos = Recibo.objects.bulk_create(recibos, batch_size=1000)
+        # update() não aplica auto_now; a receita mensal do dashboard filtra por updated_at
+        Fatura.objects.filter(pk__in=[p.fatura_id for p in aceites]).update(status='PAGO', updated_at=timezone.now())
+        saldos.atualizar_contas({abertas[p.fatura_id][0] for p in aceites})
+        invalidar(*[abertas[p.fatura_id][1] for p in aceites])
+        recibos_pdf.agendar([r.pk for r in recibos])
+
+        # bulk_create não passa pelos sinais de contabilização
+        from administrativo.contabilizacao import contabilizar_periodo
+        datas = [p.data for p in aceites]
+        contabilizar_periodo(min(datas), max(datas), origens=['RECIBO'], lancado_por=lancado_por)
+    return ResultadoPagamentos(recibos, recusados)
+
+
+def por_numero(numeros, data, forma, observacoes=''):
+    """
+    Pagamentos pelo valor atual das faturas em aberto com os `numeros` (uma
+    consulta). Retorna (pagamentos, números desconhecidos ou já pagos).
+    """
+    faturas = {
+        numero: (pk, atual if atual is not None else original)
+        for pk, numero, atual, original in Fatura.objects.filter(
+            numero__in=numeros, status__in=['PENDENTE', 'VENCIDO']
+        ).values_list('pk', 'numero', 'valor_atual', 'valor_original')
+    }
+    lista = [Pagamento(faturas[n][0], data, forma, faturas[n][1], observacoes) for n in numeros if n in faturas]
+    return lista, [n for n in numeros if n not in faturas]
@@ -0,0 +1,51 @@
+# Sistema/backend/secretaria/pdf.py
+"""
+Conversão HTML → PDF (weasyprint) partilhada pelos extratos e recibos.
+
+O HTML é sempre gerado no processo principal (templates do Django); aqui só
+se converte, o que permite fazê-lo num conjunto de processos sem que estes
+toquem na base de dados. Os ficheiros são gravados sob MEDIA_ROOT com escrita
+num temporário seguida de os.replace, para que quem os leia nunca apanhe um
+PDF a meio.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+
+def converter(argumentos):
+    """(html, base_url) → bytes do PDF. Corre também nos processos filhos."""
+    from weasyprint import HTML
+    conteudo, base_url = argumentos
+    return HTML(string=conteudo, base_url=base_url).write_pdf()
+
+
+def converter_em_lote(htmls, processos=None, base_url=None):
+    """Bytes dos PDFs de `htmls`, pela mesma ordem, em `processos` paralelos (até 4 por omissão)."""
+    base_url = base_url or settings.MEDIA_ROOT
+    trabalhos = [(h, base_url) for h in htmls]
+    processos = processos or min(os.cpu_count() or 1, 4)
+    if processos <= 1 or len(trabalhos) <= 1:
+        yield from map(converter, trabalhos)
+        return
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        yield from pool.map(converter, trabalhos, chunksize=8)
+
+
+def gravar(relativo, conteudo):
+    """Grava `conteudo` em MEDIA_ROOT/`relativo`, substituindo o anterior. Retorna `relativo`."""
+    absoluto = os.path.join(settings.MEDIA_ROOT, relativo)
+    pasta = os.path.dirname(absoluto)
+    os.makedirs(pasta, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as ficheiro:
+            ficheiro.write(conteudo)
+        os.replace(temporario, absoluto)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+    return relativo
@@ -0,0 +1,108 @@
+# Sistema/backend/secretaria/recibos.py
+"""
+PDF dos recibos.
+
+Cada recibo tem um PDF com nome fixo pelo número
+(MEDIA_ROOT/secretaria/recibos/AAAA/recibo_AAAA-NNNN.pdf), por isso gerar de
+novo substitui o anterior.
+
+A geração nunca corre no pedido que regista o pagamento: depois do commit
+(transaction.on_commit) os pks são entregues a uma thread de fundo do
+próprio processo, que lê os recibos numa consulta, gera os PDFs e fecha a sua
+ligação à base de dados. Isto cobre tanto o Recibo gravado um a um (sinal
+post_save) como os lotes de secretaria/pagamentos.py (bulk_create, sem
+sinais). Se o processo terminar antes de a fila esvaziar, o PDF em falta é
+gerado no primeiro download ou pelo comando gerar_recibos, que refaz em
+lote os de um intervalo de datas num conjunto de processos.
+"""
+
+import logging
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from . import pdf
+from .models import Recibo
+
+logger = logging.getLogger(__name__)
+
+PASTA = os.path.join('secretaria', 'recibos')
+TEMPLATE = 'secretaria/recibo_pdf.html'
+
+ResultadoRecibos = namedtuple('ResultadoRecibos', 'recibos gerados')
+
+# uma só thread: os PDFs são gerados por ordem e sem competir com os pedidos
+_fila = ThreadPoolExecutor(max_workers=1, thread_name_prefix='recibos-pdf')
+
+
+def caminho(numero_recibo):
+    """Caminho relativo a MEDIA_ROOT do PDF do recibo `numero_recibo` ('2025/0001')."""
+    ano = numero_recibo.split('/')[0] if '/' in numero_recibo else 'outros'
+    nome = numero_recibo.replace('/', '-').replace('\\', '-')
+    return os.path.join(PASTA, ano, f'recibo_{nome}.pdf')
+
+
+def existe(numero_recibo):
+    return os.path.exists(os.path.join(settings.MEDIA_ROOT, caminho(numero_recibo)))
+
+
+def _consulta():
+    return Recibo.objects.select_related('fatura__aluno__encarregado').prefetch_related('fatura__faturaservico_set__servico')
+
+
+def html(recibo):
+    return render_to_string(TEMPLATE, {'recibo': recibo, 'fatura': recibo.fatura, 'emitido_em': timezone.localdate()})
+
+
+def gerar(recibos, processos=1):
+    """Gera e grava os PDFs de `recibos` (instâncias de _consulta). Retorna quantos."""
+    recibos = list(recibos)
+    conteudos = pdf.converter_em_lote([html(r) for r in recibos], processos)
+    for recibo, conteudo in zip(recibos, conteudos):
+        pdf.gravar(caminho(recibo.numero_recibo), conteudo)
+    return len(recibos)
+
+
+def _gerar_em_fundo(pks):
+    try:
+        gerar(_consulta().filter(pk__in=pks).order_by('pk'))
+    except Exception:
+        logger.exception('Falha ao gerar o PDF dos recibos %s', pks)
+    finally:
+        connection.close()
+
+
+def agendar(pks):
+    """Gera os PDFs dos recibos `pks` em fundo, depois do commit da transação atual."""
+    pks = list(pks)
+    if pks:
+        transaction.on_commit(lambda: _fila.submit(_gerar_em_fundo, pks))
+
+
+def garantir(recibo):
+    """Caminho relativo do PDF do `recibo`, gerando-o agora se ainda não existir."""
+    if not existe(recibo.numero_recibo):
+        gerar(_consulta().filter(pk=recibo.pk))
+    return caminho(recibo.numero_recibo)
+
+
+def gerar_periodo(inicio, fim, processos=None, so_em_falta=False):
+    """(Re)gera os PDFs dos recibos pagos entre `inicio` e `fim`, em lotes de 500."""
+    qs = _consulta().filter(data_pagamento__range=(inicio, fim)).order_by('pk')
+    total = gerados = 0
+    lote = []
+    for recibo in qs.iterator(chunk_size=500):
+        total += 1
+        if so_em_falta and existe(recibo.numero_recibo):
+            continue
+        lote.append(recibo)
+        if len(lote) == 500:
+            gerados += gerar(lote, processos)
+            lote = []
+    gerados += gerar(lote, processos)
+    return ResultadoRecibos(total, gerados)
@@ -0,0 +1,58 @@
+# Sistema/backend/secretaria/saldos.py
+"""
+Recálculo em lote das contas correntes.
+
+`ContaCorrente.recalcular_saldo` (chamado pelos sinais de Fatura e Recibo)
+percorre as faturas de um aluno de cada vez. Operações em lote (emissão de
+mensalidades, multas, pagamentos) escrevem sem sinais e chamam no fim
+`atualizar_contas` com os alunos afetados: três consultas agrupadas e um upsert.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from .models import Aluno, ContaCorrente, Fatura, Recibo, ReciboArquivo
+
+
+def _somas(qs, chave, campo):
+    return dict(qs.order_by().values_list(chave).annotate(t=Sum(campo)))
+
+
+def atualizar_contas(alunos=None):
+    """
+    Recalcula débito, crédito e saldo (mesmas regras de recalcular_saldo) dos
+    `alunos` (pks; todos se None). Cria as contas em falta. Retorna quantas gravou.
+    """
+    faturas = Fatura.objects.filter(status__in=['PENDENTE', 'VENCIDO'])
+    recibos = Recibo.objects.all()
+    arquivados = ReciboArquivo.objects.all()
+    ids = None
+    if alunos is not None:
+        ids = list(set(alunos))
+        if not ids:
+            return 0
+        faturas = faturas.filter(aluno_id__in=ids)
+        recibos = recibos.filter(fatura__aluno_id__in=ids)
+        arquivados = arquivados.filter(fatura__aluno_id__in=ids)
+    else:
+        ids = list(Aluno.objects.values_list('pk', flat=True))
+
+    debitos = _somas(faturas, 'aluno_id', 'valor_atual')
+    creditos = _somas(recibos, 'fatura__aluno_id', 'valor_pago')
+    for aluno, total in _somas(arquivados, 'fatura__aluno_id', 'valor_pago').items():
+        creditos[aluno] = (creditos.get(aluno) or 0) + total
+
+    zero = Decimal('0')
+    contas = []
+    for aluno in ids:
+        debito, credito = debitos.get(aluno) or zero, creditos.get(aluno) or zero
+        contas.append(ContaCorrente(
+            aluno_id=aluno, total_debito=debito, total_credito=credito, saldo=debito - credito,
+        ))
+    ContaCorrente.objects.bulk_create(
+        contas, batch_size=1000,
+        update_conflicts=True, unique_fields=['aluno'],
+        update_fields=['total_debito', 'total_credito', 'saldo', 'updated_at'],
+    )
+    return len(contas)
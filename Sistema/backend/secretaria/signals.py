@@ -2,13 +2,17 @@
 
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Fatura, Recibo, ContaCorrente
+from . import busca
+from .models import Aluno, Encarregado, Fatura, Recibo, ContaCorrente
+from .pagamentos import invalidar as invalidar_consulta_fatura
+from .recibos import agendar as agendar_pdf_recibo
 
 @receiver(post_save, sender=Fatura)
 def atualizar_contacorrente_na_fatura(sender, instance, created, **kwargs):
     """
     Quando uma Fatura é criada ou atualizada, recalcula o saldo da ContaCorrente.
     """
+    invalidar_consulta_fatura(instance.numero)
     conta = None
     try:
         conta = instance.aluno.conta_corrente
@@ -22,6 +26,7 @@ def remocao_fatura_contacorrente(sender, instance, **kwargs):
     """
     Quando uma fatura é excluída, recalcula o saldo.
     """
+    invalidar_consulta_fatura(instance.numero)
     try:
         conta = instance.aluno.conta_corrente
         conta.recalcular_saldo()
@@ -33,6 +38,7 @@ def atualizar_contacorrente_no_recibo(sender, instance, created, **kwargs):
     """
     Quando um Recibo é criado ou atualizado, recalcula o saldo da ContaCorrente.
     """
+    invalidar_consulta_fatura(instance.fatura.numero)
     conta = None
     try:
         conta = instance.fatura.aluno.conta_corrente
@@ -40,6 +46,13 @@ def atualizar_contacorrente_no_recibo(sender, instance, created, **kwargs):
         conta = ContaCorrente.objects.create(aluno=instance.fatura.aluno)
     conta.recalcular_saldo()
 
+@receiver(post_save, sender=Recibo)
+def gerar_pdf_do_recibo(sender, instance, **kwargs):
+    """
+    Gera (ou refaz) o PDF do Recibo em fundo, depois do commit.
+    """
+    agendar_pdf_recibo([instance.pk])
+
 @receiver(post_delete, sender=Recibo)
 def remocao_recibo_contacorrente(sender, instance, **kwargs):
     """
@@ -50,3 +63,27 @@ def remocao_recibo_contacorrente(sender, instance, **kwargs):
         conta.recalcular_saldo()
     except ContaCorrente.DoesNotExist:
         pass
+
+@receiver(post_save, sender=Aluno)
+def indexar_aluno(sender, instance, **kwargs):
+    """
+    Mantém a entrada do aluno no índice de pesquisa.
+    """
+    busca.indexar_alunos(Aluno.objects.filter(pk=instance.pk))
+
+@receiver(post_delete, sender=Aluno)
+def remover_aluno_do_indice(sender, instance, **kwargs):
+    busca.remover('ALUNO', instance.pk)
+
+@receiver(post_save, sender=Encarregado)
+def indexar_encarregado(sender, instance, **kwargs):
+    """
+    Mantém a entrada do encarregado e as dos seus alunos (que incluem o nome e
+    o telefone dele) no índice de pesquisa.
+    """
+    busca.indexar_encarregados([instance])
+    busca.indexar_alunos(instance.alunos.all())
+
+@receiver(post_delete, sender=Encarregado)
+def remover_encarregado_do_indice(sender, instance, **kwargs):
+    busca.remover('ENCARREGADO', instance.pk)
@@ -9,17 +9,22 @@ urlpatterns = [
     # Dashboard de secretaria (caso alguém acesse /secretaria/ sem especificar)
     path('', views.usuario_redirect_secretaria, name='root'),
 
+    # Pesquisa de alunos e encarregados (JSON)
+    path('pesquisa/', views.pesquisa_global, name='pesquisa'),
+
     # CRUD Encarregado
     path('encarregados/', views.EncarregadoListView.as_view(), name='encarregado-list'),
     path('encarregados/new/', views.EncarregadoCreateView.as_view(), name='encarregado-create'),
     path('encarregados/edit/<int:pk>/', views.EncarregadoUpdateView.as_view(), name='encarregado-edit'),
     path('encarregados/delete/<int:pk>/', views.EncarregadoDeleteView.as_view(), name='encarregado-delete'),
+    path('encarregados/<int:pk>/extrato/', views.encarregado_extrato, name='encarregado-extrato'),
 
     # CRUD Aluno
     path('alunos/', views.AlunoListView.as_view(), name='aluno-list'),
     path('alunos/new/', views.AlunoCreateView.as_view(), name='aluno-create'),
     path('alunos/edit/<int:pk>/', views.AlunoUpdateView.as_view(), name='aluno-edit'),
     path('alunos/delete/<int:pk>/', views.AlunoDeleteView.as_view(), name='aluno-delete'),
+    path('alunos/autocomplete/', views.aluno_autocomplete, name='aluno-autocomplete'),
 
      # CRUD Pré‑Matrícula
     path('prematriculas/', views.PreMatriculaListView.as_view(),   name='prematricula-list'),
@@ -38,11 +43,23 @@ urlpatterns = [
     path('faturas/new/', views.FaturaCreateView.as_view(), name='fatura-create'),
     path('faturas/edit/<int:pk>/', views.FaturaUpdateView.as_view(), name='fatura-edit'),
     path('faturas/delete/<int:pk>/', views.FaturaDeleteView.as_view(), name='fatura-delete'),
+    path('faturas/<int:pk>/recibo/', views.fatura_recibo, name='fatura-recibo'),
     path('faturas/report/', views.fatura_report, name='fatura-report'),
+    path('faturas/mensalidades/', views.emitir_mensalidades, name='fatura-mensalidades'),
+
+    # Conciliação de extratos bancários
+    path('conciliacao/', views.conciliacao_bancaria, name='conciliacao'),
+    path('conciliacao/<int:pk>/', views.conciliacao_movimento, name='conciliacao-movimento'),
+
+    # Caixa: registo de pagamentos em lote
+    path('caixa/', views.caixa, name='caixa'),
+    path('caixa/fatura/', views.caixa_fatura, name='caixa-fatura'),
 
     # Listagem de Conta Corrente (somente leitura)
     path('contacorrente/', views.ContaCorrenteListView.as_view(), name='contacorrente-list'),
     path('contacorrente/report/', views.contacorrente_report, name='contacorrente-report'),
+    path('contacorrente/antiguidade/', views.antiguidade_saldos, name='antiguidade-saldos'),
+    path('contacorrente/antiguidade/<str:dimensao>/<str:chave>/', views.antiguidade_detalhe, name='antiguidade-detalhe'),
 
     # CRUD Servico
     path('servicos/', views.ServicoListView.as_view(),   name='servico-list'),
@@ -1,8 +1,10 @@
 # Sistema/backend/secretaria/views.py
+import os
 from datetime import datetime, timedelta
+from django.conf import settings
 from django.utils import timezone
-from pyexpat.errors import messages
-from django.http import HttpResponse, HttpResponseRedirect
+from django.contrib import messages
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse_lazy
@@ -11,17 +13,18 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 
-from pedagogico.models import PreRematricula
-from .models import Encarregado, Aluno, Fatura, ContaCorrente, Servico, PreMatricula
+from pedagogico.models import Curso, PreRematricula
+from .models import Encarregado, Aluno, Fatura, ContaCorrente, Servico, PreMatricula, ImportacaoExtrato, IndiceBusca, MovimentoBancario, Recibo
 from .forms import EncarregadoForm, AlunoForm, FaturaForm, PreRematriculaForm, ServicoForm, FaturaServicoFormset, PreMatriculaForm
 
 import pandas as pd
 from io import BytesIO
 from django.core.paginator import Paginator
-from django.db.models import Q
 
 # Decorator para checar roles (pode usar o mesmo role_required do accounts)
 from accounts.decorators import role_required
+from core.paginacao import KeysetPaginationMixin
+from . import antiguidade, busca, cobranca, conciliacao, extratos, numeracao, pagamentos, recibos
 
 ENCARREGADO_FORM_FIELDS = [
     'nome', 'telefone', 'email', 'endereco',
@@ -156,20 +159,15 @@ class AlunoDeleteView(LoginRequiredMixin, DeleteView):
 # ------------------------------
 
 @method_decorator(role_required('Admin', 'Diretor', 'Secretaria'), name='dispatch')
-class FaturaListView(LoginRequiredMixin, ListView):
+class FaturaListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Fatura
     template_name = 'secretaria/fatura_list.html'
     context_object_name = 'faturas'
     paginate_by = 20
-    ordering = ['-data_emissao']
+    ordering = ['-data_emissao', '-pk']
 
     def get_queryset(self):
-        hoje = timezone.localdate()
-        Fatura.objects.filter(
-            data_vencimento__lt=hoje,
-            status='PENDENTE'
-        ).update(status='VENCIDO')
-
+        # vencimentos, multa e juros do dia: aplicados pelo comando diário aplicar_encargos
         qs = super().get_queryset().select_related('aluno')
         # Filtro opcional por status ou aluno (poderá ser adicionado via GET)
         status = self.request.GET.get('status')
@@ -177,7 +175,7 @@ class FaturaListView(LoginRequiredMixin, ListView):
         if status:
             qs = qs.filter(status=status)
         if aluno:
-            qs = qs.filter(aluno__nome__icontains=aluno)
+            qs = qs.filter(aluno_id__in=busca.alunos(aluno))
         return qs
     
     
@@ -198,14 +196,8 @@ class FaturaCreateView(LoginRequiredMixin, CreateView):
         return ctx
 
     def form_valid(self, form):
-        # Geração automática de número
-        from datetime import date
-        ano = date.today().year
-        ultimo = Fatura.objects.filter(numero__startswith=str(ano))\
-                                .order_by('-numero').first()
-        seq = (int(ultimo.numero.split('/')[-1]) + 1) \
-              if (ultimo and ultimo.numero.split('/')[-1].isdigit()) else 1
-        form.instance.numero = f"{ano}/{seq:04d}"
+        # Geração automática de número (sequência reservada, sem corrida entre pedidos)
+        form.instance.numero = numeracao.proximo('FATURA', timezone.localdate().year)
 
         # Salva fields comuns (aluno, tipo, datas, status, observações...)
         self.object = form.save(commit=False)
@@ -256,8 +248,8 @@ class FaturaUpdateView(LoginRequiredMixin, UpdateView):
 
         # RAMO 1: tipo fixo
         if form.instance.tipo != 'OUTRO':
-            # mantém valor_atual = valor_original
-            self.object.valor_atual = form.cleaned_data['valor_original']
+            # mantém valor_atual = valor_original + encargos já aplicados
+            self.object.valor_atual = form.cleaned_data['valor_original'] + self.object.encargos
             self.object.save()
             return redirect(self.get_success_url())
 
@@ -267,7 +259,7 @@ class FaturaUpdateView(LoginRequiredMixin, UpdateView):
         if formset.is_valid():
             total = sum(item.servico.preco * item.quantidade for item in formset.save(commit=False))
             form.instance.valor_original = total
-            form.instance.valor_atual    = total
+            form.instance.valor_atual    = total + self.object.encargos
             self.object.save()
             formset.save_m2m()
             return redirect(self.get_success_url())
@@ -450,6 +442,296 @@ def prematricula_delete(request, pk):
 # Relatório de Faturas (RF-XX)
 # ------------------------------
 
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria')
+def emitir_mensalidades(request):
+    """
+    GET: pré-visualização das mensalidades do mês (quantas faltam emitir, por
+    curso). POST: emite-as de uma vez (ver secretaria/cobranca.py).
+    """
+    dados = request.POST if request.method == 'POST' else request.GET
+    mes = None
+    if dados.get('mes'):
+        try:
+            mes = datetime.strptime(dados['mes'], '%Y-%m').date()
+        except ValueError:
+            messages.error(request, "Mês inválido.")
+            return redirect('secretaria:fatura-mensalidades')
+    try:
+        dia = min(max(int(dados.get('vencimento') or cobranca.DIA_VENCIMENTO), 1), 31)
+    except ValueError:
+        dia = cobranca.DIA_VENCIMENTO
+
+    if request.method == 'POST':
+        resultado = cobranca.emitir_mensalidades(mes, dia_vencimento=dia)
+        messages.success(
+            request,
+            f"Mensalidades de {resultado.mes:%m/%Y}: {resultado.emitidas} fatura(s) emitida(s), "
+            f"{resultado.valor_total} AOA; {resultado.ja_emitidas} já emitida(s), "
+            f"{resultado.sem_preco} matrícula(s) sem preço definido."
+        )
+        return redirect('secretaria:fatura-list')
+
+    resultado = cobranca.emitir_mensalidades(mes, dia_vencimento=dia, simular=True)
+    cursos = dict(Curso.objects.filter(pk__in=resultado.por_curso).values_list('pk', 'nome'))
+    por_curso = sorted(
+        (cursos.get(pk, '—'), n, valor) for pk, (n, valor) in resultado.por_curso.items()
+    )
+    return render(request, 'secretaria/fatura_mensalidades.html', {
+        'resultado': resultado,
+        'por_curso': por_curso,
+        'vencimento': cobranca.vencimento(resultado.mes, dia),
+        'dia': dia,
+    })
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria')
+def conciliacao_bancaria(request):
+    """
+    Importa um extrato (CSV/OFX): os movimentos seguros geram logo os recibos,
+    os restantes aparecem na fila de revisão desta página.
+    """
+    if request.method == 'POST':
+        ficheiro = request.FILES.get('extrato')
+        if not ficheiro:
+            messages.error(request, "Escolha o ficheiro do extrato.")
+            return redirect('secretaria:conciliacao')
+        try:
+            resultado = conciliacao.importar(ficheiro.name, ficheiro.read(), importado_por=request.user)
+        except ValueError as e:
+            messages.error(request, f"Não foi possível ler o extrato: {e}")
+            return redirect('secretaria:conciliacao')
+        messages.success(
+            request,
+            f"{resultado.movimentos} movimento(s) importado(s): {resultado.conciliados} conciliado(s), "
+            f"{resultado.revisao} para revisão, {resultado.repetidos} já importado(s) antes."
+        )
+        return redirect('secretaria:conciliacao')
+
+    revisao = (
+        MovimentoBancario.objects.filter(estado='REVISAO')
+        .select_related('fatura__aluno', 'importacao')
+        .order_by('data', 'pk')
+    )
+    paginator = Paginator(revisao, 50)
+    return render(request, 'secretaria/conciliacao.html', {
+        'page_obj': paginator.get_page(request.GET.get('page')),
+        'importacoes': ImportacaoExtrato.objects.select_related('importado_por')[:5],
+    })
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria')
+def conciliacao_movimento(request, pk):
+    """Confirma (com a fatura sugerida ou outra, pelo número) ou ignora um movimento em revisão."""
+    movimento = get_object_or_404(MovimentoBancario, pk=pk, estado='REVISAO')
+    if request.method != 'POST':
+        return redirect('secretaria:conciliacao')
+
+    if request.POST.get('acao') == 'ignorar':
+        movimento.estado = 'IGNORADO'
+        movimento.save(update_fields=['estado'])
+        messages.success(request, "Movimento ignorado.")
+        return redirect('secretaria:conciliacao')
+
+    numero = request.POST.get('numero', '').strip()
+    if numero:
+        movimento.fatura = Fatura.objects.filter(numero=numero).first()
+    if movimento.fatura is None:
+        messages.error(request, "Indique o número de uma fatura existente.")
+    elif conciliacao.conciliar([movimento], request.user):
+        messages.success(request, f"Pagamento da fatura {movimento.fatura.numero} registado.")
+    else:
+        messages.error(request, f"A fatura {movimento.fatura.numero} já está paga.")
+    return redirect('secretaria:conciliacao')
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria')
+def caixa(request):
+    """
+    Modo caixa: o operador lê/digita os números das faturas, confere os valores
+    e regista todos os pagamentos da fila de uma vez (secretaria/pagamentos.py).
+    """
+    formas = Recibo.FORMA_PAGAMENTO_CHOICES
+    if request.method == 'POST':
+        numeros = [n.strip() for n in request.POST.getlist('numeros') if n.strip()]
+        forma = request.POST.get('forma_pagamento') or 'DINHEIRO'
+        if forma not in dict(formas):
+            forma = 'DINHEIRO'
+        try:
+            data = datetime.strptime(request.POST.get('data_pagamento') or '', '%Y-%m-%d').date()
+        except ValueError:
+            data = timezone.localdate()
+        if not numeros:
+            messages.error(request, "Nenhuma fatura na fila.")
+            return redirect('secretaria:caixa')
+
+        lista, desconhecidas = pagamentos.por_numero(numeros, data, forma, f'Caixa: {request.user}')
+        resultado = pagamentos.registrar(lista, lancado_por=request.user)
+        if resultado.recibos:
+            messages.success(
+                request,
+                f"{len(resultado.recibos)} pagamento(s) registado(s): recibos "
+                + ', '.join(r.numero_recibo for r in resultado.recibos) + '.'
+            )
+        if desconhecidas or resultado.recusados:
+            messages.error(request, f"{len(desconhecidas) + len(resultado.recusados)} fatura(s) inexistente(s) ou já paga(s).")
+        return redirect('secretaria:caixa')
+
+    return render(request, 'secretaria/caixa.html', {
+        'formas': formas,
+        'hoje': timezone.localdate(),
+    })
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria')
+def caixa_fatura(request):
+    """Consulta (em cache) de uma fatura pelo número, para a fila do caixa."""
+    dados = pagamentos.consultar(request.GET.get('numero'))
+    if dados is None:
+        return JsonResponse({'erro': 'Fatura não encontrada.'}, status=404)
+    return JsonResponse({
+        'numero': dados['numero'],
+        'aluno': dados['aluno__nome'],
+        'matricula': dados['aluno__matricula'],
+        'tipo': dados['tipo'],
+        'valor': str(dados['valor']),
+        'status': dados['status'],
+        'vencimento': dados['data_vencimento'].strftime('%d/%m/%Y'),
+        'aberta': dados['status'] in ('PENDENTE', 'VENCIDO'),
+    })
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria')
+def antiguidade_saldos(request):
+    """Antiguidade dos saldos em aberto por aluno, encarregado, curso ou turma (ver secretaria/antiguidade.py)."""
+    dimensao = request.GET.get('por', 'aluno')
+    if dimensao not in antiguidade.DIMENSOES:
+        dimensao = 'aluno'
+    busca = request.GET.get('busca', '').strip()
+
+    if request.GET.get('format') == 'csv':
+        response = StreamingHttpResponse(
+            antiguidade.csv_linhas(dimensao, busca=busca), content_type='text/csv; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'attachment; filename=antiguidade_{dimensao}_{timezone.localdate():%Y%m%d}.csv'
+        return response
+
+    paginator = Paginator(antiguidade.relatorio(dimensao, busca=busca), 25)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    totais = antiguidade.totais()
+    return render(request, 'secretaria/antiguidade.html', {
+        'page_obj': page_obj,
+        'linhas': antiguidade.linhas(dimensao, page_obj.object_list),
+        'faixas': antiguidade.FAIXAS,
+        'totais': totais,
+        'totais_faixas': [(f.rotulo, totais[f.chave]) for f in antiguidade.FAIXAS],
+        'dimensao': dimensao,
+        'rotulo': antiguidade.ROTULOS_DIMENSAO[dimensao],
+        'dimensoes': antiguidade.ROTULOS_DIMENSAO,
+        'busca': busca,
+    })
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria')
+def antiguidade_detalhe(request, dimensao, chave):
+    """Faturas em aberto de uma linha do relatório de antiguidade (opcionalmente de uma faixa)."""
+    if dimensao not in antiguidade.DIMENSOES:
+        return redirect('secretaria:antiguidade-saldos')
+    chave = None if chave == 'sem' else chave
+    faixa = request.GET.get('faixa')
+    paginator = Paginator(antiguidade.faturas(dimensao, chave, faixa), 25)
+    return render(request, 'secretaria/antiguidade_detalhe.html', {
+        'page_obj': paginator.get_page(request.GET.get('page')),
+        'dimensao': dimensao,
+        'rotulo': antiguidade.ROTULOS_DIMENSAO[dimensao],
+        'faixa': dict(antiguidade.FAIXAS).get(faixa),
+        'faixa_chave': faixa or '',
+        'hoje': timezone.localdate(),
+    })
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria')
+def encarregado_extrato(request, pk):
+    """PDF do extrato mensal de um encarregado (?mes=AAAA-MM; padrão: mês corrente)."""
+    encarregado = get_object_or_404(Encarregado, pk=pk)
+    try:
+        mes = datetime.strptime(request.GET.get('mes') or '', '%Y-%m').date()
+    except ValueError:
+        mes = timezone.localdate().replace(day=1)
+    lista = extratos.montar(mes, encarregados=[encarregado.pk], incluir_vazios=True)
+    if not lista:
+        messages.error(request, "Encarregado inativo ou sem alunos associados.")
+        return redirect('secretaria:encarregado-list')
+    _, pdf = next(extratos.pdfs(lista, mes, processos=1, base_url=request.build_absolute_uri('/')))
+    response = HttpResponse(pdf, content_type='application/pdf')
+    response['Content-Disposition'] = f'inline; filename=extrato_{encarregado.pk}_{mes:%Y-%m}.pdf'
+    return response
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria')
+def fatura_recibo(request, pk):
+    """PDF do recibo da fatura; normalmente já gerado em fundo, senão é gerado agora."""
+    recibo = get_object_or_404(Recibo, fatura_id=pk)
+    relativo = recibos.garantir(recibo)
+    return FileResponse(
+        open(os.path.join(settings.MEDIA_ROOT, relativo), 'rb'),
+        content_type='application/pdf', filename=os.path.basename(relativo),
+    )
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria')
+def pesquisa_global(request):
+    """
+    Pesquisa de alunos e encarregados por nome, matrícula, documento ou
+    telefone (JSON), sobre o índice de secretaria/busca.py.
+    """
+    termo = request.GET.get('q', '').strip()
+    tipo = request.GET.get('tipo')
+    if tipo not in dict(IndiceBusca.TIPO_CHOICES):
+        tipo = None
+    try:
+        limite = max(1, min(int(request.GET.get('limite', busca.LIMITE)), 50))
+    except ValueError:
+        limite = busca.LIMITE
+    entradas = busca.procurar(termo, tipo)[:limite] if len(termo) >= 2 else []
+    return JsonResponse({
+        'q': termo,
+        'resultados': [
+            {'tipo': e.tipo, 'id': e.objeto_id, 'titulo': e.titulo, 'detalhe': e.detalhe, 'url': busca.url(e)}
+            for e in entradas
+        ],
+    })
+
+
+@login_required
+@role_required('Admin', 'Diretor', 'Secretaria', 'Pedagogico')
+def aluno_autocomplete(request):
+    """
+    Sugestões de alunos para os campos de formulário com AutocompleteSelect
+    (nome, matrícula, documento ou encarregado; ?status= restringe).
+    """
+    termo = request.GET.get('q', '').strip()
+    try:
+        limite = max(1, min(int(request.GET.get('limite', busca.LIMITE)), 50))
+    except ValueError:
+        limite = busca.LIMITE
+    qs = Aluno.objects.order_by('nome')
+    if request.GET.get('status'):
+        qs = qs.filter(status=request.GET['status'])
+    if termo:
+        qs = qs.filter(pk__in=busca.alunos(termo))
+    return JsonResponse({'resultados': [{'id': a.pk, 'texto': str(a)} for a in qs.only('pk', 'nome', 'matricula')[:limite]]})
+
+
 @login_required
 @role_required('Admin','Diretor','Secretaria')
 def fatura_report(request):
@@ -482,9 +764,7 @@ def fatura_report(request):
         qs = qs.filter(status=status)
     
     if aluno_filter:
-        qs = qs.filter(
-            Q(aluno__nome__icontains=aluno_filter)
-            )
+        qs = qs.filter(aluno_id__in=busca.alunos(aluno_filter))
 
     # Exportação para Excel
     if request.GET.get('format') == 'excel':
@@ -557,10 +837,7 @@ def contacorrente_report(request):
     
     # Filtros
     if aluno_filter:
-        qs = qs.filter(
-            Q(aluno__nome__icontains=aluno_filter) |
-            Q(aluno__sobrenome__icontains=aluno_filter)
-        )
+        qs = qs.filter(aluno_id__in=busca.alunos(aluno_filter))
     
     if status_filter:
         qs = qs.filter(aluno__status=status_filter)
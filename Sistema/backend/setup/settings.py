@@ -105,6 +105,17 @@ DATABASES = {
 }
 
 
+# Cache partilhada por todos os processos (gunicorn): as invalidações feitas
+# pelos sinais num worker valem para os outros. A tabela é criada pela
+# migração core/0005_tabela_cache (createcachetable).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'cache_sistema',
+    }
+}
+
+
 # Expira a sessão após 45 minutos (2.700 segundos)
 SESSION_COOKIE_AGE = 60 * 45
 
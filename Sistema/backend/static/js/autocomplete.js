@@ -0,0 +1,94 @@
+// static/js/autocomplete.js
+// Transforma os <select data-autocomplete-url> (core/widgets.py) numa caixa de
+// pesquisa: as opções vêm do endpoint JSON à medida que se escreve.
+(function () {
+  const MIN_CARACTERES = 2;
+  const ESPERA_MS = 250;
+
+  function iniciar(select) {
+    if (select.dataset.autocompleteIniciado) return;
+    select.dataset.autocompleteIniciado = '1';
+
+    const caixa = document.createElement('div');
+    caixa.className = 'relative';
+    const entrada = document.createElement('input');
+    entrada.type = 'text';
+    entrada.autocomplete = 'off';
+    entrada.placeholder = 'Escreva para pesquisar…';
+    entrada.className = select.className || 'w-full px-3 py-2 border border-gray-300 rounded-lg';
+    entrada.classList.add('w-full');
+    const escolhida = select.selectedOptions[0];
+    entrada.value = escolhida && escolhida.value ? escolhida.textContent.trim() : '';
+    const lista = document.createElement('ul');
+    lista.className = 'absolute z-20 mt-1 w-full bg-white border border-gray-200 rounded-lg shadow-lg max-h-60 overflow-auto hidden';
+
+    select.parentNode.insertBefore(caixa, select);
+    caixa.appendChild(entrada);
+    caixa.appendChild(lista);
+    caixa.appendChild(select);
+    select.classList.add('hidden');
+
+    function escolher(id, texto) {
+      let opcao = Array.from(select.options).find(o => o.value === String(id));
+      if (!opcao) {
+        opcao = new Option(texto, id);
+        select.add(opcao);
+      }
+      select.value = String(id);
+      entrada.value = texto;
+      lista.classList.add('hidden');
+      select.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+
+    function mostrar(resultados) {
+      lista.innerHTML = '';
+      if (!resultados.length) {
+        const vazio = document.createElement('li');
+        vazio.className = 'px-3 py-2 text-sm text-gray-500';
+        vazio.textContent = 'Nenhum resultado.';
+        lista.appendChild(vazio);
+      }
+      resultados.forEach(r => {
+        const item = document.createElement('li');
+        item.className = 'px-3 py-2 text-sm cursor-pointer hover:bg-gray-100';
+        item.textContent = r.texto;
+        item.addEventListener('mousedown', e => {
+          e.preventDefault();
+          escolher(r.id, r.texto);
+        });
+        lista.appendChild(item);
+      });
+      lista.classList.remove('hidden');
+    }
+
+    let temporizador = null;
+    let pedido = null;
+    entrada.addEventListener('input', () => {
+      clearTimeout(temporizador);
+      const termo = entrada.value.trim();
+      if (!termo) {
+        select.value = '';
+        select.dispatchEvent(new Event('change', { bubbles: true }));
+      }
+      if (termo.length < MIN_CARACTERES) {
+        lista.classList.add('hidden');
+        return;
+      }
+      temporizador = setTimeout(() => {
+        if (pedido) pedido.abort();
+        pedido = new AbortController();
+        const url = new URL(select.dataset.autocompleteUrl, window.location.origin);
+        url.searchParams.set('q', termo);
+        fetch(url, { signal: pedido.signal, headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+          .then(r => r.json())
+          .then(dados => mostrar(dados.resultados || []))
+          .catch(() => {});
+      }, ESPERA_MS);
+    });
+    entrada.addEventListener('blur', () => lista.classList.add('hidden'));
+  }
+
+  document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('select[data-autocomplete-url]').forEach(iniciar);
+  });
+})();